@@ -3,7 +3,26 @@ import pandas as pd
 import numpy as np
 import joblib
 import os
-import re
+import atexit
+import threading
+import time
+
+from recrutamento.busca_reversa import construir_armazem_vagas, top_k_vagas_para_candidato
+from recrutamento.cache_scores import carimbo_arquivo, chave_busca, obter_resultados, salvar_resultados, versao_artefatos
+from recrutamento.carregamento import arquivos_versao_scores, ler_dados_processados, mapas_engenharia
+from recrutamento.floresta import (
+    anexar_modelo_sklearn, caminho_floresta_compilada, carregar_floresta_compilada, compilar_floresta,
+    eh_floresta_compilada, salvar_floresta_compilada
+)
+from recrutamento.inicializacao import carregar_metadados_app, marcar, opcoes_filtro_vagas, salvar_metadados_app, tempos_inicializacao
+from recrutamento.instrumentacao import caminho_log_tempos, finalizar_registro, gravar_registro, marcar_origem, novo_registro, registrar_etapa
+from recrutamento.memoria import candidatos_para_exibicao
+from recrutamento.paralelo import criar_pool_scoring, fechar_pool_scoring, processos_configurados, top_k_paralelo
+from recrutamento.scoring import construir_armazem_candidatos, linhas_pre_filtradas_para_vaga, top_k_armazem, top_k_armazem_progressivo
+from recrutamento.tabela_topk import carregar_tabela_topk, top_k_da_tabela
+
+# Início da inicialização do processo (só a primeira execução do script conta)
+marcar('inicio')
 
 #  Configuração da Página 
 st.set_page_config(layout="wide", page_title="Painel de Otimização de Recrutamento")
@@ -21,16 +40,49 @@ def carregar_modelo(caminho_modelo):
         st.error(f"Erro ao carregar o modelo: {e}")
         return None
 
+@st.cache_resource
+def compilar_modelo_para_busca(caminho_modelo):
+    # Floresta em arrays NumPy para os blocos pequenos; sem estrutura de floresta, usa o próprio modelo.
+    # A floresta já compilada é aberta por memory-map (páginas compartilhadas entre processos) e o
+    # modelo sklearn é anexado depois, pela carga em segundo plano
+    caminho_floresta = caminho_floresta_compilada(caminho_modelo)
+    carimbo_modelo = carimbo_arquivo(caminho_modelo)
+    try:
+        floresta = carregar_floresta_compilada(caminho_floresta, carimbo_modelo)
+    except Exception as e:
+        print(f"Aviso: não foi possível abrir a floresta compilada em '{caminho_floresta}': {e}")
+        floresta = None
+    if floresta is not None:
+        return floresta
+
+    modelo = carregar_modelo(caminho_modelo)
+    if modelo is None:
+        return None
+    try:
+        floresta = compilar_floresta(modelo)
+    except ValueError as e:
+        print(f"Aviso: modelo não compilado para inferência em NumPy ({e}); usando predict_proba.")
+        return modelo
+    try:
+        salvar_floresta_compilada(floresta, caminho_floresta, carimbo_modelo)
+    except OSError as e:
+        print(f"Aviso: não foi possível gravar a floresta compilada em '{caminho_floresta}': {e}")
+    return floresta
+
+def garantir_modelo_sklearn(modelo_obj, caminho_modelo):
+    # Floresta aberta do disco ainda sem o estimador sklearn: carrega (ou espera a carga em andamento)
+    if eh_floresta_compilada(modelo_obj) and modelo_obj['modelo'] is None:
+        modelo = carregar_modelo(caminho_modelo)
+        if modelo is not None:
+            anexar_modelo_sklearn(modelo_obj, modelo)
+    return modelo_obj
+
 @st.cache_data
 def carregar_dados_csv(caminho_arquivo, nome_arquivo):
     caminho_completo = os.path.join(caminho_arquivo, nome_arquivo)
     try:
-        df = pd.read_csv(caminho_completo)
-        if 'id_vaga' in df.columns:
-            df['id_vaga'] = df['id_vaga'].astype(str)
-        if 'id_candidato' in df.columns:
-            df['id_candidato'] = df['id_candidato'].astype(str)
-        return df
+        # Usa o .feather gerado pelo notebook (seção 12) quando disponível
+        return ler_dados_processados(caminho_completo)
     except FileNotFoundError:
         st.error(f"Erro: Arquivo de dados '{nome_arquivo}' não encontrado em '{caminho_completo}'. Verifique o caminho.")
         return pd.DataFrame()
@@ -51,196 +103,104 @@ def carregar_artefatos_joblib(caminho_artefatos, nome_artefato):
         st.error(f"Erro ao carregar o artefato '{nome_artefato}': {e}")
         return None
 
-#  Caminhos para os Arquivos 
-PATH_DATA = 'data/'
-PATH_ARTIFACTS = 'artifacts/'
+@st.cache_resource
+def carregar_base_candidatos(caminho_arquivo, nome_arquivo, colunas_modelo, mapas_eng):
+    # Lidos uma única vez e compartilhados entre sessões: flags e categorias vão para o armazém
+    # compacto e o DataFrame mantido em memória fica só com as colunas exibidas
+    caminho_completo = os.path.join(caminho_arquivo, nome_arquivo)
+    try:
+        df_candidatos = ler_dados_processados(caminho_completo)
+    except FileNotFoundError:
+        st.error(f"Erro: Arquivo de dados '{nome_arquivo}' não encontrado em '{caminho_completo}'. Verifique o caminho.")
+        return pd.DataFrame(), None
+    except Exception as e:
+        st.error(f"Erro ao carregar o arquivo '{nome_arquivo}': {e}")
+        return pd.DataFrame(), None
+    if df_candidatos.empty or colunas_modelo is None or mapas_eng is None:
+        return candidatos_para_exibicao(df_candidatos), None
+    try:
+        armazem = construir_armazem_candidatos(df_candidatos, colunas_modelo, mapas_eng)
+    except Exception as e:
+        st.error(f"Erro ao montar o armazém de features dos candidatos: {e}")
+        armazem = None
+    return candidatos_para_exibicao(df_candidatos), armazem
 
-#  Funções de Engenharia de Features (Definidas Globalmente) 
-def extrair_modalidade(texto):
-    texto_lower = str(texto).lower()
-    if re.search(r"100% remoto|totalmente remoto|home office|trabalho remoto|remoto", texto_lower):
-        if re.search(r"h[íi]brido", texto_lower): return "Híbrido"
-        return "Remoto"
-    elif re.search(r"h[íi]brido", texto_lower): return "Híbrido"
-    elif re.search(r"presencial|no escrit[óo]rio|na planta|loca[çl][ãa]o", texto_lower) and not re.search(r"remoto|h[íi]brido", texto_lower): return "Presencial"
-    return "Não Informado"
-
-def codificar_idioma(nivel, mapa_nivel_idioma_local):
-    return mapa_nivel_idioma_local.get(str(nivel).lower(), 0)
-
-def generalizar_titulo_vaga(titulo):
-    titulo_lower = str(titulo).lower()
-    if titulo_lower == "não informado": return "Outros/Não Especificado"
-    if "consultor sap" in titulo_lower or "consultora sap" in titulo_lower or ("sap" in titulo_lower and ("consultant" in titulo_lower or "especialista" in titulo_lower or "consultor(a)" in titulo_lower)): return "Consultoria SAP"
-    if "arquiteto sap" in titulo_lower or "architect sap" in titulo_lower: return "Arquitetura SAP"
-    if "architect" in titulo_lower or "arquiteto" in titulo_lower or "tech lead" in titulo_lower or "líder técnico" in titulo_lower or "lider técnico" in titulo_lower: return "Liderança Técnica & Arquitetura"
-    dev_keywords = ["desenvolvedor", "developer", "programador", "software engineer", "dev", "desenvolvimento", "development", "fullstack", "frontend", "backend", "mobile", "abap"]
-    if any(keyword in titulo_lower for keyword in dev_keywords): return "Desenvolvimento de Software"
-    data_keywords = ["dados", "data", "bi", "business intelligence", "analytics", "cientista", "scientist", "engenheiro de dados", "data engineer", "analista de dados"]
-    if any(keyword in titulo_lower for keyword in data_keywords): return "Dados & BI"
-    infra_keywords = ["infraestrutura", "infrastructure", "cloud", "aws", "azure", "gcp", "devops", "sysadmin", "rede", "network", "segurança", "security", "sre"]
-    if any(keyword in titulo_lower for keyword in infra_keywords): return "Infra, Cloud & DevOps"
-    pm_po_keywords = ["gerente de projetos", "project manager", "pm", "gpm", "product owner", "po", "product manager", "coordenador de projetos", "project coordinator", "scrum master", "agile coach"]
-    if any(keyword in titulo_lower for keyword in pm_po_keywords): return "Gestão de Projetos & Produtos"
-    qa_keywords = ["qa", "quality assurance", "testes", "tester", "analista de testes", "automação de testes"]
-    if any(keyword in titulo_lower for keyword in qa_keywords): return "Qualidade & Testes"
-    support_keywords = ["suporte", "support", "analista de suporte", "service desk", "operações", "operations", "sustentação"]
-    if any(keyword in titulo_lower for keyword in support_keywords): return "Suporte & Operações"
-    design_keywords = ["design", "designer", "ux", "ui", "product designer"]
-    if any(keyword in titulo_lower for keyword in design_keywords): return "Design (UX/UI)"
-    analyst_keywords = ["analista", "analyst", "especialista", "specialist"]
-    if any(keyword in titulo_lower for keyword in analyst_keywords):
-        if "negócios" in titulo_lower or "business" in titulo_lower: return "Funcional & Negócios"
-        if "sistemas" in titulo_lower or "systems" in titulo_lower: return "Análise de Sistemas"
-        if "processos" in titulo_lower: return "Análise de Processos"
-        if "requisitos" in titulo_lower: return "Análise de Requisitos"
-        if "financeiro" in titulo_lower or "contábil" in titulo_lower or "fiscal" in titulo_lower : return "Financeiro & Contábil"
-        return "Analista (Genérico)"
-    lead_coord_keywords = ["líder de equipe", "team lead", "coordenador", "supervisor", "gerente", "manager"]
-    if any(keyword in titulo_lower for keyword in lead_coord_keywords): return "Liderança & Coordenação (Não Técnica)"
-    return "Outros/Não Especificado"
-
-def generalizar_titulo_profissional_candidato(titulo, mapa_nivel_profissional_cand_local):
-    if not isinstance(titulo, str): titulo = str(titulo)
-    titulo_lower = titulo.lower()
-    if titulo_lower == "não informado": return "Outros/Não Especificado"
-    if "consultor sap" in titulo_lower or "consultora sap" in titulo_lower or ("sap" in titulo_lower and ("consultant" in titulo_lower or "especialista" in titulo_lower or "consultor(a)" in titulo_lower)): return "Consultoria SAP"
-    if "arquiteto sap" in titulo_lower or "architect sap" in titulo_lower: return "Arquitetura SAP"
-    if "architect" in titulo_lower or "arquiteto" in titulo_lower or "tech lead" in titulo_lower or "líder técnico" in titulo_lower or "lider técnico" in titulo_lower: return "Liderança Técnica & Arquitetura"
-    dev_keywords = ["desenvolvedor", "developer", "programador", "software engineer", "dev", "desenvolvimento", "development", "fullstack", "frontend", "backend", "mobile", "abap", "programadora"]
-    if any(keyword in titulo_lower for keyword in dev_keywords): return "Desenvolvimento de Software"
-    data_keywords = ["dados", "data", "bi", "business intelligence", "analytics", "cientista", "scientist", "engenheiro de dados", "data engineer", "analista de dados"]
-    if any(keyword in titulo_lower for keyword in data_keywords): return "Dados & BI"
-    infra_keywords = ["infraestrutura", "infrastructure", "cloud", "aws", "azure", "gcp", "devops", "sysadmin", "rede", "network", "segurança", "security", "sre", "suporte ti", "analista de infraestrutura"]
-    if any(keyword in titulo_lower for keyword in infra_keywords): return "Infra, Cloud & DevOps"
-    pm_po_keywords = ["gerente de projetos", "project manager", "pm", "gpm", "product owner", "po", "product manager", "coordenador de projetos", "project coordinator", "scrum master", "agile coach", "gestor de projetos", "analista de projetos"]
-    if any(keyword in titulo_lower for keyword in pm_po_keywords): return "Gestão de Projetos & Produtos"
-    qa_keywords = ["qa", "quality assurance", "testes", "tester", "analista de testes", "automação de testes"]
-    if any(keyword in titulo_lower for keyword in qa_keywords): return "Qualidade & Testes"
-    support_keywords = ["suporte", "support", "analista de suporte", "service desk", "operações", "operations", "sustentação", "atendimento ao cliente", "help desk"]
-    if any(keyword in titulo_lower for keyword in support_keywords): return "Suporte & Operações"
-    design_keywords = ["design", "designer", "ux", "ui", "product designer", "web designer"]
-    if any(keyword in titulo_lower for keyword in design_keywords): return "Design (UX/UI)"
-    analyst_keywords = ["analista", "analyst", "especialista", "specialist"]
-    if any(keyword in titulo_lower for keyword in analyst_keywords):
-        if "negócios" in titulo_lower or "business" in titulo_lower: return "Funcional & Negócios"
-        if "sistemas" in titulo_lower or "systems" in titulo_lower: return "Análise de Sistemas"
-        if "processos" in titulo_lower: return "Análise de Processos"
-        if "requisitos" in titulo_lower: return "Análise de Requisitos"
-        if "financeiro" in titulo_lower or "contábil" in titulo_lower or "fiscal" in titulo_lower : return "Financeiro & Contábil"
-        if "rh" in titulo_lower or "recursos humanos" in titulo_lower or "recrutamento" in titulo_lower : return "Recursos Humanos"
-        if "marketing" in titulo_lower or "comunicação" in titulo_lower : return "Marketing & Comunicação"
-        return "Analista (Genérico)"
-    lead_coord_keywords = ["líder", "lider", "coordenador", "supervisor", "gerente", "manager", "diretor", "director", "head", "gestor", "gestora"]
-    if any(keyword in titulo_lower for keyword in lead_coord_keywords): return "Liderança & Gestão"
-    return "Outros/Não Especificado"
-
-def padronizar_nivel_academico_candidato(nivel, mapa_nivel_academico_cand_local):
-    nivel_str = str(nivel).lower()
-    if nivel_str == "não informado": return "Não Informado"
-    for key, value in mapa_nivel_academico_cand_local.items():
-        if key in nivel_str: return value
-    return "Outros/Não Especificado"
-
-def padronizar_nivel_profissional_candidato(nivel, mapa_nivel_prof_cand_local):
-    nivel_str = str(nivel).lower()
-    if nivel_str == "não informado": return "Não Informado"
-    for key, value in mapa_nivel_prof_cand_local.items():
-        if key in nivel_str: return value
-    if 'analista' in nivel_str and not any(k in nivel_str for k in ['júnior', 'pleno', 'sênior', 'jr', 'pl', 'sr', 'junior', 'senior']):
-        return "Analista (Nível não especificado)"
-    return "Outros/Não Especificado"
-
-def limpar_pcd_candidato(valor_pcd):
-    valor_lower = str(valor_pcd).lower().strip()
-    if valor_lower in ["sim", "s", "yes", "y", "1", "true", "true", "SIM", "S"]: return "Sim"
-    if valor_lower in ["não", "nao", "n", "no", "0", "false", "false", "NAO", "NÃO"]: return "Não"
-    return "Não Informado"
-
-def safe_to_numeric_scalar(value, default=0):
-    num_val = pd.to_numeric(value, errors='coerce')
-    return default if pd.isna(num_val) else num_val
-
-def preparar_features_para_predicao(vaga_selecionada_serie, candidato_serie, colunas_modelo_esperadas_lista, mapas_locais):
-    input_data = {}
-    mapa_nivel_idioma_local = mapas_locais['mapa_nivel_idioma']
-    
-    input_data['nivel_ingles_ordinal_vaga'] = codificar_idioma(vaga_selecionada_serie.get('nivel_ingles', "Não Informado"), mapa_nivel_idioma_local)
-    input_data['nivel_espanhol_ordinal_vaga'] = codificar_idioma(vaga_selecionada_serie.get('nivel_espanhol', "Não Informado"), mapa_nivel_idioma_local)
-    input_data['vaga_sap_bool'] = 1 if str(vaga_selecionada_serie.get('vaga_sap', "Não")).lower() == "sim" else 0
-    input_data['nivel_ingles_ordinal_candidato'] = codificar_idioma(candidato_serie.get('nivel_ingles', "Não Informado"), mapa_nivel_idioma_local)
-    input_data['nivel_espanhol_ordinal_candidato'] = codificar_idioma(candidato_serie.get('nivel_espanhol', "Não Informado"), mapa_nivel_idioma_local)
-    input_data['compat_ingles'] = 1 if input_data['nivel_ingles_ordinal_candidato'] >= input_data['nivel_ingles_ordinal_vaga'] else 0
-    input_data['compat_espanhol'] = 1 if input_data['nivel_espanhol_ordinal_candidato'] >= input_data['nivel_espanhol_ordinal_vaga'] else 0
-    
-    tech_cols_vaga = [col for col in vaga_selecionada_serie.index if col.startswith('tech_')]
-    skill_cols_candidato = [col for col in candidato_serie.index if col.startswith('skill_')]
-    
-    total_techs_vaga_val = 0
-    if tech_cols_vaga:
-        tech_values_series = vaga_selecionada_serie[tech_cols_vaga]
-        total_techs_vaga_val = pd.to_numeric(tech_values_series, errors='coerce').fillna(0).sum()
-    input_data['total_techs_vaga'] = total_techs_vaga_val
-    
-    skills_match_count = 0
-    if tech_cols_vaga and skill_cols_candidato:
-        mapa_skills_cand_temp = {s.replace('skill_', ''): s for s in skill_cols_candidato}
-        for t_col_v in tech_cols_vaga:
-            nome_base_t = t_col_v.replace('tech_', '')
-            if nome_base_t in mapa_skills_cand_temp:
-                s_col_c = mapa_skills_cand_temp[nome_base_t]
-                vaga_tech_val = safe_to_numeric_scalar(vaga_selecionada_serie.get(t_col_v, 0))
-                cand_skill_val = safe_to_numeric_scalar(candidato_serie.get(s_col_c, 0))
-                if vaga_tech_val == 1 and cand_skill_val == 1:
-                    skills_match_count += 1
-    input_data['skills_match_count'] = skills_match_count
-    input_data['skills_faltantes_vaga'] = max(0, input_data['total_techs_vaga'] - skills_match_count)
-    input_data['comentario_tem_valor_monetario'] = 0
-
-    input_data['nivel_profissional_vaga'] = str(vaga_selecionada_serie.get('nivel_profissional_vaga', "Não Informado"))
-    input_data['nivel_academico_vaga'] = str(vaga_selecionada_serie.get('nivel_academico', "Não Informado"))
-    input_data['modalidade_trabalho'] = str(vaga_selecionada_serie.get('modalidade_trabalho', "Não Informado"))
-    input_data['categoria_vaga'] = str(vaga_selecionada_serie.get('categoria_vaga', "Não Informado"))
-    input_data['vaga_sap'] = str(vaga_selecionada_serie.get('vaga_sap', "Não Informado"))
-    input_data['nivel_academico_padronizado_candidato'] = str(candidato_serie.get('nivel_academico_padronizado', "Não Informado"))
-    input_data['categoria_profissional_candidato'] = str(candidato_serie.get('categoria_profissional', "Não Informado"))
-    input_data['pcd_padronizado_candidato'] = str(candidato_serie.get('pcd_padronizado', "Não Informado"))
-    input_data['nivel_profissional_padronizado_candidato'] = str(candidato_serie.get('nivel_profissional_padronizado_candidato', "Não Informado"))
-    
-    features_categoricas_para_onehot = [
-        'nivel_profissional_vaga', 'nivel_academico_vaga', 'modalidade_trabalho',
-        'categoria_vaga', 'vaga_sap',
-        'nivel_academico_padronizado_candidato', 'categoria_profissional_candidato',
-        'pcd_padronizado_candidato', 'nivel_profissional_padronizado_candidato'
-    ]
-    for col_cat_check in features_categoricas_para_onehot:
-        if col_cat_check not in input_data: input_data[col_cat_check] = "Não Informado"
-    
-    df_input_predict = pd.DataFrame([input_data])
+@st.cache_resource
+def carregar_tabela_topk_cache(pasta_tabela, versao_scores):
+    # Tabela top-N gerada offline (python -m recrutamento.tabela_topk); None se ausente ou desatualizada
     try:
-        df_input_encoded = pd.get_dummies(df_input_predict, columns=features_categoricas_para_onehot, dummy_na=False)
+        return carregar_tabela_topk(pasta_tabela, versao_scores)
     except Exception as e:
-        print(f"DEBUG: Erro one-hot encoding: {e} para dados {input_data}")
+        print(f"Aviso: não foi possível abrir a tabela top-N em '{pasta_tabela}': {e}")
         return None
 
-    for tech_col in tech_cols_vaga:
-        df_input_encoded[tech_col] = safe_to_numeric_scalar(vaga_selecionada_serie.get(tech_col, 0))
-    for skill_col in skill_cols_candidato:
-        df_input_encoded[skill_col] = safe_to_numeric_scalar(candidato_serie.get(skill_col, 0))
-        
-    if colunas_modelo_esperadas_lista is None: return None
+@st.cache_resource
+def carregar_armazem_vagas(caminho_arquivo, nome_arquivo_vagas, versao_scores, mapas_eng, _armazem_candidatos):
+    # Features do lado da vaga para a busca reversa, montadas uma vez no layout do armazém de candidatos;
+    # versao_scores (dados processados + artefatos) só entra na chave do cache, para remontar quando mudarem
+    df_vagas = carregar_dados_csv(caminho_arquivo, nome_arquivo_vagas)
+    if df_vagas.empty or _armazem_candidatos is None:
+        return None
     try:
-        df_final_predict = df_input_encoded.reindex(columns=colunas_modelo_esperadas_lista, fill_value=0)
-        for col in df_final_predict.columns:
-            if not pd.api.types.is_numeric_dtype(df_final_predict[col]):
-                df_final_predict[col] = pd.to_numeric(df_final_predict[col], errors='coerce').fillna(0)
-            else:
-                df_final_predict[col] = df_final_predict[col].fillna(0)
-        return df_final_predict
+        return construir_armazem_vagas(df_vagas, _armazem_candidatos, mapas_eng)
     except Exception as e:
-        print(f"DEBUG: Erro ao alinhar colunas: {e}. Colunas codificadas: {df_input_encoded.columns.tolist()}")
+        st.error(f"Erro ao montar o armazém de features das vagas: {e}")
         return None
 
+@st.cache_resource
+def criar_pool_scoring_cache(n_processos, versao_scores, _armazem, _modelo, _mapas_eng):
+    # Pool de processos com o armazém de candidatos em memória compartilhada; None = scoring no próprio processo.
+    # versao_scores só entra na chave do cache: com outros dados ou outro modelo, o pool é recriado
+    if n_processos <= 1 or _armazem is None or _modelo is None:
+        return None
+    # Os workers recebem uma cópia do modelo: sem o sklearn anexado, pontuariam tudo em NumPy
+    garantir_modelo_sklearn(_modelo, CAMINHO_MODELO)
+    try:
+        pool = criar_pool_scoring(_armazem, _modelo, _mapas_eng, n_processos)
+    except Exception as e:
+        print(f"Aviso: não foi possível criar o pool de scoring com {n_processos} processos: {e}")
+        return None
+    atexit.register(fechar_pool_scoring, pool)
+    return pool
+
+@st.cache_resource
+def iniciar_carga_em_segundo_plano():
+    # Uma vez por processo: aquece os caches de modelo, artefatos e candidatos numa thread enquanto a
+    # primeira página é renderizada. O main() chama as mesmas funções e, se a carga ainda estiver em
+    # andamento, espera por ela (trava por chave do cache) em vez de repeti-la
+    thread = threading.Thread(target=_carregar_recursos_em_segundo_plano, name="carga-recursos-app", daemon=True)
+    thread.start()
+    return thread
+
+def _carregar_recursos_em_segundo_plano():
+    try:
+        modelo_obj = compilar_modelo_para_busca(CAMINHO_MODELO)
+        colunas_modelo_obj = carregar_artefatos_joblib(PATH_ARTIFACTS, 'colunas_modelo.joblib')
+        artefatos_eng_obj = carregar_artefatos_joblib(PATH_ARTIFACTS, 'artefatos_engenharia.joblib')
+        if colunas_modelo_obj is not None and artefatos_eng_obj is not None:
+            carregar_base_candidatos(PATH_DATA, 'candidatos_processados.csv', colunas_modelo_obj, mapas_engenharia(artefatos_eng_obj))
+        # Por último: a busca já funciona só com a floresta compilada
+        garantir_modelo_sklearn(modelo_obj, CAMINHO_MODELO)
+        marcar('modelo_sklearn')
+    except Exception as e:
+        print(f"Aviso: falha na carga em segundo plano: {e}")
+
+#  Caminhos para os Arquivos 
+PATH_DATA = 'data/'
+PATH_ARTIFACTS = 'artifacts/'
+CAMINHO_MODELO = os.path.join(PATH_ARTIFACTS, 'modelo_recrutamento_rf.joblib')
+CAMINHO_CACHE_SCORES = os.path.join(PATH_DATA, 'cache_scores.sqlite')
+PASTA_TABELA_TOPK = os.path.join(PATH_DATA, 'topk')
+CAMINHO_LOG_TEMPOS = caminho_log_tempos(PATH_DATA)
+NUM_PROCESSOS_SCORING = processos_configurados()
+
+# Primeiro bloco da busca progressiva (os seguintes dobram de tamanho)
+TAMANHO_PRIMEIRO_LOTE_PROGRESSIVO = 1000
+
+MODO_BUSCA_CANDIDATOS = "Candidatos para uma vaga"
+MODO_BUSCA_REVERSA = "Vagas para um candidato"
+ARQUIVOS_VERSAO_SCORES = arquivos_versao_scores(PATH_DATA, PATH_ARTIFACTS)
+
 def calcular_scores_para_vaga_com_pre_filtro(
     _vaga_id,
     _df_vagas_completo_cache,
@@ -249,8 +209,12 @@ def calcular_scores_para_vaga_com_pre_filtro(
     _modelo_obj_cache,
     _mapas_eng_cache,
     _num_min_tech_match=1,
-    _max_candidatos_para_score_completo=500,
-    _randomize_subset=True 
+    _armazem_candidatos_cache=None,
+    _top_k=5,
+    _tabela_topk_cache=None,
+    _pool_scoring_cache=None,
+    _ao_progredir=None,
+    _registro_tempos=None
     ):
     
     if _modelo_obj_cache is None or _colunas_modelo_cache is None or _mapas_eng_cache is None:
@@ -263,99 +227,244 @@ def calcular_scores_para_vaga_com_pre_filtro(
         return []
     vaga_serie_cache = vaga_serie_df_cache.iloc[0]
 
-    df_candidatos_filtrados_cache = _df_candidatos_completo_cache.copy()
-    
-    # Filtro 1: Categoria Profissional
-    categoria_vaga_cache = vaga_serie_cache.get('categoria_vaga', "Não Informado")
-    if categoria_vaga_cache != "Não Informado" and 'categoria_profissional_candidato' in df_candidatos_filtrados_cache.columns:
-        df_candidatos_filtrados_cache = df_candidatos_filtrados_cache[
-            df_candidatos_filtrados_cache['categoria_profissional_candidato'] == categoria_vaga_cache
+    if _armazem_candidatos_cache is None:
+        _armazem_candidatos_cache = construir_armazem_candidatos(_df_candidatos_completo_cache, _colunas_modelo_cache, _mapas_eng_cache)
+
+    # Filtros 1, 2 (índices invertidos) e 3 (índice de skills em bitset), sem copiar o DataFrame
+    linhas_filtradas_cache = linhas_pre_filtradas_para_vaga(vaga_serie_cache, _armazem_candidatos_cache, _num_min_tech_match, _registro_tempos)
+
+    if len(linhas_filtradas_cache) == 0: return []
+
+    # Tabela top-N pré-calculada; só pontua ao vivo se a vaga não estiver nela
+    top_da_tabela_cache = None
+    if _tabela_topk_cache is not None:
+        inicio_tabela = time.perf_counter()
+        top_da_tabela_cache = top_k_da_tabela(_tabela_topk_cache, _armazem_candidatos_cache, _vaga_id, linhas_filtradas_cache, _top_k)
+        registrar_etapa(_registro_tempos, 'tabela_topk', time.perf_counter() - inicio_tabela, len(linhas_filtradas_cache),
+                        None if top_da_tabela_cache is None else len(top_da_tabela_cache[0]))
+
+    def _montar_resultados(linhas_top_cache, probabilidades_cache):
+        inicio_montagem = time.perf_counter()
+        resultados = _montar_resultados_sem_medir(linhas_top_cache, probabilidades_cache)
+        registrar_etapa(_registro_tempos, 'montagem_resultados', time.perf_counter() - inicio_montagem)
+        return resultados
+
+    def _montar_resultados_sem_medir(linhas_top_cache, probabilidades_cache):
+        def _coluna_ou_padrao(nome_coluna):
+            if nome_coluna in _df_candidatos_completo_cache.columns:
+                return _df_candidatos_completo_cache[nome_coluna].to_numpy()[linhas_top_cache].tolist()
+            return ['N/A'] * len(linhas_top_cache)
+
+        return [
+            {
+                'ID Candidato': id_cand,
+                'Nome': nome_cand,
+                'Título Profissional': titulo_cand, # Mantido caso precise em outro lugar, mas não será exibido na tabela principal
+                'Pontuação de Match': prob_match_cache
+            }
+            for id_cand, nome_cand, titulo_cand, prob_match_cache in zip(
+                _coluna_ou_padrao('id_candidato'), _coluna_ou_padrao('nome'), _coluna_ou_padrao('titulo_profissional'), probabilidades_cache
+            )
         ]
-    
-    # Filtro 2: Nível Profissional
-    nivel_vaga_str_cache = str(vaga_serie_cache.get('nivel_profissional_vaga', "Não Informado")).lower()
-    if nivel_vaga_str_cache != "não informado" and 'nivel_profissional_padronizado_candidato' in df_candidatos_filtrados_cache.columns:
-        niveis_compativeis_cache = []
-        if "sênior" in nivel_vaga_str_cache or "senior" in nivel_vaga_str_cache: niveis_compativeis_cache = ["Sênior", "Especialista", "Liderança/Coordenação", "Gerência/Diretoria"]
-        elif "pleno" in nivel_vaga_str_cache: niveis_compativeis_cache = ["Pleno", "Sênior", "Especialista", "Liderança/Coordenação", "Gerência/Diretoria"]
-        elif "júnior" in nivel_vaga_str_cache or "jr" in nivel_vaga_str_cache: niveis_compativeis_cache = ["Júnior", "Pleno", "Sênior", "Especialista"]
-        if niveis_compativeis_cache:
-            df_candidatos_filtrados_cache = df_candidatos_filtrados_cache[
-                df_candidatos_filtrados_cache['nivel_profissional_padronizado_candidato'].isin(niveis_compativeis_cache)
-            ]
-    
-    # Filtro 3: Mínimo de Tecnologias em Comum
-    techs_requeridas_pela_vaga = [col.replace('tech_', '') for col in vaga_serie_cache.index if col.startswith('tech_') and safe_to_numeric_scalar(vaga_serie_cache.get(col, 0)) == 1]
-    
-    if techs_requeridas_pela_vaga and _num_min_tech_match > 0:
-        indices_filtrados = []
-        for idx, cand_row in df_candidatos_filtrados_cache.iterrows():
-            count = sum(1 for tech in techs_requeridas_pela_vaga if f"skill_{tech}" in cand_row and safe_to_numeric_scalar(cand_row.get(f"skill_{tech}", 0)) == 1)
-            if count >= _num_min_tech_match: indices_filtrados.append(idx)
-        df_candidatos_filtrados_cache = df_candidatos_filtrados_cache.loc[indices_filtrados]
-
-    num_candidatos_apos_filtro = len(df_candidatos_filtrados_cache)
-    if df_candidatos_filtrados_cache.empty: return []
-
-    # Aplicar limite e randomização
-    if num_candidatos_apos_filtro > _max_candidatos_para_score_completo:
-        print(f"INFO: Vaga {_vaga_id}: {num_candidatos_apos_filtro} candidatos pós-filtro. ")
-        if _randomize_subset:
-            print(f"Selecionando aleatoriamente {_max_candidatos_para_score_completo} candidatos.")
-            df_candidatos_para_scoring = df_candidatos_filtrados_cache.sample(n=_max_candidatos_para_score_completo, random_state=None) 
+
+    if top_da_tabela_cache is not None:
+        marcar_origem(_registro_tempos, 'tabela')
+        return _montar_resultados(*top_da_tabela_cache)
+
+    # Scoring em blocos de todos os candidatos pós-filtro, mantendo apenas o top-k.
+    # Com _ao_progredir, o top-k parcial é repassado após cada bloco (o resultado final não muda).
+    total_filtrados_cache = len(linhas_filtradas_cache)
+    def _repassar_parcial(linhas_parciais, probabilidades_parciais, processados):
+        if _ao_progredir is not None:
+            # Exibição do ranking parcial fica fora dos tempos das etapas
+            _ao_progredir(_montar_resultados_sem_medir(linhas_parciais, probabilidades_parciais), processados, total_filtrados_cache)
+
+    try:
+        if _pool_scoring_cache is not None:
+            marcar_origem(_registro_tempos, 'paralelo')
+            inicio_paralelo = time.perf_counter()
+            linhas_top_cache, probabilidades_cache = top_k_paralelo(_pool_scoring_cache, vaga_serie_cache, linhas_filtradas_cache, k=_top_k, ao_progredir=_repassar_parcial)
+            registrar_etapa(_registro_tempos, 'scoring_paralelo', time.perf_counter() - inicio_paralelo, linhas=total_filtrados_cache)
+        elif _ao_progredir is not None:
+            marcar_origem(_registro_tempos, 'armazem')
+            linhas_top_cache, probabilidades_cache = linhas_filtradas_cache[:0], np.empty(0)
+            for linhas_top_cache, probabilidades_cache, processados_cache in top_k_armazem_progressivo(
+                vaga_serie_cache, _armazem_candidatos_cache, linhas_filtradas_cache, _modelo_obj_cache, _mapas_eng_cache,
+                k=_top_k, tamanho_primeiro_lote=TAMANHO_PRIMEIRO_LOTE_PROGRESSIVO, registro=_registro_tempos
+            ):
+                _repassar_parcial(linhas_top_cache, probabilidades_cache, processados_cache)
         else:
-            print(f"Selecionando os primeiros {_max_candidatos_para_score_completo} candidatos.")
-            df_candidatos_para_scoring = df_candidatos_filtrados_cache.head(_max_candidatos_para_score_completo)
-    else:
-        df_candidatos_para_scoring = df_candidatos_filtrados_cache
-    
-    resultados_candidatos_internos_cache = []
-    for _, candidato_serie_atual_cache in df_candidatos_para_scoring.iterrows():
-        df_features_predicao_cache = preparar_features_para_predicao(vaga_serie_cache, candidato_serie_atual_cache, _colunas_modelo_cache, _mapas_eng_cache)
-        if df_features_predicao_cache is not None and not df_features_predicao_cache.empty:
-            try:
-                prob_match_cache = _modelo_obj_cache.predict_proba(df_features_predicao_cache)[0, 1]
-                resultados_candidatos_internos_cache.append({
-                    'ID Candidato': candidato_serie_atual_cache.get('id_candidato', 'N/A'),
-                    'Nome': candidato_serie_atual_cache.get('nome', 'N/A'),
-                    'Título Profissional': candidato_serie_atual_cache.get('titulo_profissional', 'N/A'), # Mantido caso precise em outro lugar, mas não será exibido na tabela principal
-                    'Pontuação de Match': prob_match_cache
-                })
-            except Exception as e_pred_cache_loop: print(f"Erro ao prever (sem cache) cand {candidato_serie_atual_cache.get('id_candidato', '')} vaga {_vaga_id}: {e_pred_cache_loop}")
-    return resultados_candidatos_internos_cache
+            marcar_origem(_registro_tempos, 'armazem')
+            linhas_top_cache, probabilidades_cache = top_k_armazem(vaga_serie_cache, _armazem_candidatos_cache, linhas_filtradas_cache, _modelo_obj_cache, _mapas_eng_cache, k=_top_k, registro=_registro_tempos)
+    except Exception as e_pred_lote:
+        print(f"Erro ao prever candidatos da vaga {_vaga_id} em lote: {e_pred_lote}")
+        return []
+
+    return _montar_resultados(linhas_top_cache, probabilidades_cache)
+
+def registrar_tempos_busca(registro_tempos):
+    # Último registro para o painel de debug e uma linha no log de tempos
+    registro_final = finalizar_registro(registro_tempos)
+    st.session_state.ultimos_tempos_busca = registro_final
+    try:
+        gravar_registro(CAMINHO_LOG_TEMPOS, registro_final)
+    except OSError as e:
+        print(f"Aviso: não foi possível gravar o log de tempos da busca: {e}")
+    return registro_final
+
+def exibir_painel_tempos(registro_final):
+    with st.sidebar.expander("⏱️ Tempos da última busca", expanded=True):
+        if registro_final is None:
+            st.caption("Nenhuma busca feita nesta sessão.")
+            return
+        st.caption(f"Vaga {registro_final['vaga_id']} | origem: {registro_final['origem']} | total {registro_final['total_ms']:.1f} ms")
+        if registro_final['linhas_pontuadas_por_s']:
+            st.caption(f"{registro_final['linhas_pontuadas']:,} candidatos pontuados ({registro_final['linhas_pontuadas_por_s']:,.0f} por segundo)")
+        df_tempos = pd.DataFrame([
+            {
+                'Etapa': nome,
+                'ms': round(etapa['ms'], 2),
+                'Entrada': etapa.get('entrada'),
+                'Saída': etapa.get('saida'),
+                'Linhas/s': round(etapa['linhas_por_s']) if 'linhas_por_s' in etapa else None,
+            }
+            for nome, etapa in registro_final['etapas'].items()
+        ])
+        st.dataframe(df_tempos, hide_index=True, use_container_width=True)
+
+def calcular_vagas_para_candidato(_id_candidato, _df_vagas_completo_cache, _armazem_candidatos_cache, _armazem_vagas_cache, _modelo_obj_cache, _linhas_vagas=None, _top_k=5):
+    if _modelo_obj_cache is None or _armazem_candidatos_cache is None or _armazem_vagas_cache is None:
+        print("Modelo ou armazéns de features não carregados.")
+        return []
+
+    linha_candidato = _armazem_candidatos_cache['indice_por_id'].get(str(_id_candidato))
+    if linha_candidato is None:
+        print(f"Candidato com ID {_id_candidato} não encontrado.")
+        return []
+
+    try:
+        linhas_top, probabilidades = top_k_vagas_para_candidato(_armazem_vagas_cache, _armazem_candidatos_cache, linha_candidato, _modelo_obj_cache, k=_top_k, linhas_vagas=_linhas_vagas)
+    except Exception as e_pred_reversa:
+        print(f"Erro ao prever vagas para o candidato {_id_candidato}: {e_pred_reversa}")
+        return []
+
+    def _coluna_ou_padrao(nome_coluna):
+        if nome_coluna in _df_vagas_completo_cache.columns:
+            return _df_vagas_completo_cache[nome_coluna].to_numpy()[linhas_top].tolist()
+        return ['N/A'] * len(linhas_top)
+
+    return [
+        {
+            'ID Vaga': id_vaga,
+            'Título da Vaga': titulo,
+            'Cliente': cliente,
+            'Pontuação de Match': float(prob)
+        }
+        for id_vaga, titulo, cliente, prob in zip(
+            _armazem_vagas_cache['ids'][linhas_top].tolist(),
+            _coluna_ou_padrao('titulo_vaga'),
+            _coluna_ou_padrao('cliente'),
+            probabilidades
+        )
+    ]
+
+def exibir_busca_reversa(df_vagas, df_vagas_filtrado_display, df_candidatos, armazem_candidatos, armazem_vagas, modelo_obj):
+    st.header("Vagas para um Candidato")
+    if armazem_vagas is None or armazem_candidatos is None:
+        st.error("Os armazéns de features não puderam ser montados; a busca reversa está indisponível.")
+        return
+
+    id_candidato_busca = st.text_input("ID do Candidato:", key="id_candidato_busca_reversa").strip()
+    top_k_vagas_param = st.sidebar.number_input("Quantidade de Vagas no Ranking (Top-k):", min_value=1, max_value=100, value=5, step=1, key="top_k_vagas_reversa")
+
+    if id_candidato_busca and id_candidato_busca in armazem_candidatos['indice_por_id']:
+        candidato_serie = df_candidatos.iloc[armazem_candidatos['indice_por_id'][id_candidato_busca]]
+        st.caption(f"{candidato_serie.get('nome', 'N/A')} — {candidato_serie.get('titulo_profissional', 'N/A')}")
+    elif id_candidato_busca:
+        st.warning(f"Candidato com ID '{id_candidato_busca}' não encontrado.")
+
+    if 'last_reverse_candidate_id' not in st.session_state:
+        st.session_state.last_reverse_candidate_id = None
+    if 'last_reverse_results' not in st.session_state:
+        st.session_state.last_reverse_results = None
+
+    # Os filtros de vaga da barra lateral restringem as vagas ranqueadas
+    linhas_vagas_filtradas = df_vagas.index.get_indexer(df_vagas_filtrado_display.index)
+    if st.button("🔎 Buscar Vagas para o Candidato", key="search_button_reversa", disabled=not id_candidato_busca):
+        with st.spinner(f"Calculando compatibilidade do candidato {id_candidato_busca} com {len(linhas_vagas_filtradas)} vagas..."):
+            st.session_state.last_reverse_results = calcular_vagas_para_candidato(
+                id_candidato_busca,
+                df_vagas,
+                armazem_candidatos,
+                armazem_vagas,
+                modelo_obj,
+                _linhas_vagas=linhas_vagas_filtradas,
+                _top_k=int(top_k_vagas_param)
+            )
+        st.session_state.last_reverse_candidate_id = id_candidato_busca
+
+    if st.session_state.last_reverse_candidate_id == id_candidato_busca and st.session_state.last_reverse_results is not None:
+        resultados_reversos = st.session_state.last_reverse_results
+        st.subheader(f"Top {len(resultados_reversos)} Vagas para o Candidato {id_candidato_busca}")
+        if resultados_reversos:
+            df_vagas_top_k = pd.DataFrame(resultados_reversos)
+            df_vagas_top_k['Pontuação de Match'] = df_vagas_top_k['Pontuação de Match'].apply(lambda x: f"{x:.2%}")
+            st.dataframe(df_vagas_top_k, use_container_width=True)
+        else:
+            st.info("Nenhuma vaga retornada para este candidato (verifique o ID e os filtros de vaga).")
 
 #  Lógica Principal da Aplicação 
 def main():
     st.title("🎯 Painel de Otimização de Recrutamento")
-    
-    modelo_obj = carregar_modelo(os.path.join(PATH_ARTIFACTS, 'modelo_recrutamento_rf.joblib'))
-    colunas_modelo_obj = carregar_artefatos_joblib(PATH_ARTIFACTS, 'colunas_modelo.joblib')
-    artefatos_eng_obj = carregar_artefatos_joblib(PATH_ARTIFACTS, 'artefatos_engenharia.joblib')
-    df_vagas = carregar_dados_csv(PATH_DATA, 'vagas_processadas.csv')
-    df_candidatos = carregar_dados_csv(PATH_DATA, 'candidatos_processados.csv')
+    iniciar_carga_em_segundo_plano()
 
-    if modelo_obj is None or colunas_modelo_obj is None or artefatos_eng_obj is None or df_vagas.empty or df_candidatos.empty:
+    # Barra lateral primeiro, a partir dos metadados; sem eles (ou desatualizados), a partir das vagas
+    df_vagas = None
+    metadados_app = carregar_metadados_app(PATH_DATA)
+    if metadados_app is not None:
+        opcoes_filtro = metadados_app['filtros']
+    else:
+        df_vagas = carregar_dados_csv(PATH_DATA, 'vagas_processadas.csv')
+        opcoes_filtro = opcoes_filtro_vagas(df_vagas)
+        if not df_vagas.empty:
+            try:
+                salvar_metadados_app(PATH_DATA, df_vagas)
+            except OSError as e:
+                print(f"Aviso: não foi possível gravar os metadados do app: {e}")
+
+    modo_busca = st.sidebar.radio("Modo de Busca:", [MODO_BUSCA_CANDIDATOS, MODO_BUSCA_REVERSA], key="modo_busca_main")
+    if modo_busca == MODO_BUSCA_REVERSA:
+        st.markdown("Informe o ID de um candidato e clique em 'Buscar Vagas' para ranquear as vagas (os filtros de vaga se aplicam).")
+    else:
+        st.markdown("Selecione filtros para vagas, escolha uma vaga e clique em 'Buscar Candidatos'.")
+    st.sidebar.header("Filtrar Vagas")
+
+    cat_selecionada = st.sidebar.multiselect("Categoria da Vaga:", options=opcoes_filtro.get('categoria_vaga', []), default=[])
+    mod_selecionada = st.sidebar.multiselect("Modalidade de Trabalho:", options=opcoes_filtro.get('modalidade_trabalho', []), default=[])
+    nivel_vaga_selecionado = st.sidebar.multiselect("Nível Profissional da Vaga:", options=opcoes_filtro.get('nivel_profissional_vaga', []), default=[])
+    marcar('primeira_renderizacao')
+
+    with st.spinner("Carregando modelo e dados dos candidatos..."):
+        modelo_obj = compilar_modelo_para_busca(CAMINHO_MODELO)
+        colunas_modelo_obj = carregar_artefatos_joblib(PATH_ARTIFACTS, 'colunas_modelo.joblib')
+        artefatos_eng_obj = carregar_artefatos_joblib(PATH_ARTIFACTS, 'artefatos_engenharia.joblib')
+        if df_vagas is None:
+            df_vagas = carregar_dados_csv(PATH_DATA, 'vagas_processadas.csv')
+        mapas_para_engenharia = mapas_engenharia(artefatos_eng_obj) if artefatos_eng_obj is not None else None
+        df_candidatos, armazem_candidatos = carregar_base_candidatos(PATH_DATA, 'candidatos_processados.csv', colunas_modelo_obj, mapas_para_engenharia)
+
+    if modelo_obj is None or colunas_modelo_obj is None or artefatos_eng_obj is None or df_vagas.empty or df_candidatos.empty or armazem_candidatos is None:
         st.error("Um ou mais arquivos essenciais não puderam ser carregados ou estão vazios. A aplicação não pode continuar.")
         st.stop()
 
-    mapas_para_engenharia = {
-        'mapa_nivel_idioma': artefatos_eng_obj.get('mapa_nivel_idioma', {}),
-        'mapa_nivel_academico_candidato': artefatos_eng_obj.get('mapa_nivel_academico_candidato', {}),
-        'mapa_nivel_profissional_candidato': artefatos_eng_obj.get('mapa_nivel_profissional_candidato', {})
-    }
+    if 'pronto' not in tempos_inicializacao():
+        marcar('pronto')
+        tempos = tempos_inicializacao()
+        print(f"Inicialização: primeira renderização em {tempos['primeira_renderizacao']:.2f}s, pronto em {tempos['pronto']:.2f}s")
 
-    st.markdown("Selecione filtros para vagas, escolha uma vaga e clique em 'Buscar Candidatos'.")
-    st.sidebar.header("Filtrar Vagas")
-    
-    categorias_vaga_unicas = sorted(df_vagas['categoria_vaga'].unique()) if 'categoria_vaga' in df_vagas.columns else []
-    cat_selecionada = st.sidebar.multiselect("Categoria da Vaga:", options=categorias_vaga_unicas, default=[])
-
-    modalidades_unicas = sorted(df_vagas['modalidade_trabalho'].unique()) if 'modalidade_trabalho' in df_vagas.columns else []
-    mod_selecionada = st.sidebar.multiselect("Modalidade de Trabalho:", options=modalidades_unicas, default=[])
+    versao_scores = versao_artefatos(ARQUIVOS_VERSAO_SCORES)
+    pool_scoring = criar_pool_scoring_cache(NUM_PROCESSOS_SCORING, versao_scores, armazem_candidatos, modelo_obj, mapas_para_engenharia)
 
-    niveis_vaga_unicos = sorted(df_vagas['nivel_profissional_vaga'].unique()) if 'nivel_profissional_vaga' in df_vagas.columns else []
-    nivel_vaga_selecionado = st.sidebar.multiselect("Nível Profissional da Vaga:", options=niveis_vaga_unicos, default=[])
-    
     df_vagas_filtrado_display = df_vagas.copy()
     if cat_selecionada and 'categoria_vaga' in df_vagas_filtrado_display.columns:
         df_vagas_filtrado_display = df_vagas_filtrado_display[df_vagas_filtrado_display['categoria_vaga'].isin(cat_selecionada)]
@@ -364,10 +473,14 @@ def main():
     if nivel_vaga_selecionado and 'nivel_profissional_vaga' in df_vagas_filtrado_display.columns:
         df_vagas_filtrado_display = df_vagas_filtrado_display[df_vagas_filtrado_display['nivel_profissional_vaga'].isin(nivel_vaga_selecionado)]
 
-    st.header("Vagas Disponíveis")
-    if df_vagas_filtrado_display.empty:
+    if modo_busca == MODO_BUSCA_REVERSA:
+        armazem_vagas = carregar_armazem_vagas(PATH_DATA, 'vagas_processadas.csv', versao_scores, mapas_para_engenharia, armazem_candidatos)
+        exibir_busca_reversa(df_vagas, df_vagas_filtrado_display, df_candidatos, armazem_candidatos, armazem_vagas, modelo_obj)
+    elif df_vagas_filtrado_display.empty:
+        st.header("Vagas Disponíveis")
         st.info("Nenhuma vaga encontrada com os filtros selecionados.")
     else:
+        st.header("Vagas Disponíveis")
         cols_display_vagas = ['id_vaga', 'titulo_vaga', 'cliente', 'categoria_vaga', 'modalidade_trabalho', 'nivel_profissional_vaga']
         cols_display_vagas_existentes = [col for col in cols_display_vagas if col in df_vagas_filtrado_display.columns]
         st.dataframe(df_vagas_filtrado_display[cols_display_vagas_existentes], height=300, use_container_width=True)
@@ -400,8 +513,9 @@ def main():
                 id_vaga_para_widgets = str(vaga_display_selecionada_selectbox.split(" - ")[0]) if vaga_display_selecionada_selectbox else "default_vaga_key"
 
                 num_min_tech_match_param = st.sidebar.slider("Número Mínimo de Tecnologias em Comum (Pré-filtro):", 0, 5, 1, key=f"slider_tech_match_main_{id_vaga_para_widgets}")
-                max_candidatos_param = st.sidebar.select_slider("Máximo de Candidatos para Score Detalhado:", options=[50, 100, 200, 500, 1000, len(df_candidatos)], value=500, key=f"slider_max_cand_main_{id_vaga_para_widgets}")
-                randomize_subset_param = st.sidebar.checkbox("Randomizar subconjunto de candidatos (se limitado)?", value=True, key=f"cb_random_{id_vaga_para_widgets}")
+                top_k_param = st.sidebar.number_input("Quantidade de Candidatos no Ranking (Top-k):", min_value=1, max_value=100, value=5, step=1, key=f"top_k_main_{id_vaga_para_widgets}")
+                busca_progressiva_param = st.sidebar.checkbox("Mostrar ranking parcial durante a busca", value=True, key="busca_progressiva_main")
+                mostrar_tempos_param = st.sidebar.checkbox("Mostrar tempos da busca (debug)", value=False, key="mostrar_tempos_main")
 
 
                 if 'last_searched_vaga_id' not in st.session_state:
@@ -421,18 +535,49 @@ def main():
                     if vaga_display_selecionada_selectbox:
                         id_vaga_escolhida_atual_btn = str(vaga_display_selecionada_selectbox.split(" - ")[0])
                         
-                        with st.spinner(f"Pré-filtrando e calculando compatibilidade dos candidatos para vaga ID {id_vaga_escolhida_atual_btn}..."):
-                            resultados_candidatos = calcular_scores_para_vaga_com_pre_filtro(
-                                id_vaga_escolhida_atual_btn,
-                                df_vagas,
-                                df_candidatos,
-                                colunas_modelo_obj,
-                                modelo_obj,
-                                mapas_para_engenharia,
-                                _num_min_tech_match=num_min_tech_match_param,
-                                _max_candidatos_para_score_completo=max_candidatos_param,
-                                _randomize_subset=randomize_subset_param
-                            )
+                        tabela_topk = carregar_tabela_topk_cache(PASTA_TABELA_TOPK, versao_scores)
+                        parametros_busca = {'num_min_tech_match': num_min_tech_match_param, 'top_k': int(top_k_param)}
+                        chave_scores = chave_busca(id_vaga_escolhida_atual_btn, parametros_busca, versao_scores)
+                        registro_tempos = novo_registro(id_vaga_escolhida_atual_btn, parametros_busca)
+                        inicio_cache = time.perf_counter()
+                        resultados_candidatos = obter_resultados(CAMINHO_CACHE_SCORES, chave_scores)
+                        registrar_etapa(registro_tempos, 'cache_scores', time.perf_counter() - inicio_cache)
+                        if resultados_candidatos is None:
+                            barra_progresso = st.empty()
+                            tabela_parcial = st.empty()
+
+                            def _exibir_parcial(resultados_parciais, processados, total):
+                                barra_progresso.progress(processados / total, text=f"{processados:,} de {total:,} candidatos pré-filtrados pontuados")
+                                df_parcial = pd.DataFrame(resultados_parciais)
+                                if not df_parcial.empty:
+                                    df_parcial['Pontuação de Match'] = df_parcial['Pontuação de Match'].apply(lambda x: f"{x:.2%}")
+                                    tabela_parcial.dataframe(df_parcial[['ID Candidato', 'Nome', 'Pontuação de Match']], use_container_width=True)
+
+                            with st.spinner(f"Pré-filtrando e calculando compatibilidade dos candidatos para vaga ID {id_vaga_escolhida_atual_btn}..."):
+                                resultados_candidatos = calcular_scores_para_vaga_com_pre_filtro(
+                                    id_vaga_escolhida_atual_btn,
+                                    df_vagas,
+                                    df_candidatos,
+                                    colunas_modelo_obj,
+                                    modelo_obj,
+                                    mapas_para_engenharia,
+                                    _num_min_tech_match=num_min_tech_match_param,
+                                    _armazem_candidatos_cache=armazem_candidatos,
+                                    _top_k=int(top_k_param),
+                                    _tabela_topk_cache=tabela_topk,
+                                    _pool_scoring_cache=pool_scoring,
+                                    _ao_progredir=_exibir_parcial if busca_progressiva_param else None,
+                                    _registro_tempos=registro_tempos
+                                )
+                            # O ranking final é exibido abaixo; os elementos parciais saem da tela
+                            barra_progresso.empty()
+                            tabela_parcial.empty()
+                            if resultados_candidatos:
+                                salvar_resultados(CAMINHO_CACHE_SCORES, chave_scores, id_vaga_escolhida_atual_btn, versao_scores, resultados_candidatos)
+                        else:
+                            marcar_origem(registro_tempos, 'cache')
+                            st.caption("Resultado recuperado do cache de scores.")
+                        registrar_tempos_busca(registro_tempos)
                         st.session_state.last_searched_vaga_id = id_vaga_escolhida_atual_btn
                         st.session_state.last_search_results = resultados_candidatos
                     else:
@@ -447,16 +592,17 @@ def main():
                         vaga_original_serie_df_disp = df_vagas[df_vagas['id_vaga'] == st.session_state.last_searched_vaga_id]
                         if not vaga_original_serie_df_disp.empty:
                             titulo_vaga_display_res = vaga_original_serie_df_disp.iloc[0].get('titulo_vaga', 'Vaga Desconhecida')
-                            st.subheader(f"Top 5 Candidatos para: {titulo_vaga_display_res}")
+                            st.subheader(f"Top {len(st.session_state.last_search_results or [])} Candidatos para: {titulo_vaga_display_res}")
                             
                             resultados_para_display = st.session_state.last_search_results
                             if resultados_para_display:
                                 df_scores_candidatos_disp = pd.DataFrame(resultados_para_display)
                                 if not df_scores_candidatos_disp.empty:
-                                    df_top_5_candidatos_disp = df_scores_candidatos_disp.sort_values(by='Pontuação de Match', ascending=False).head(5)
-                                    df_top_5_candidatos_disp['Pontuação de Match'] = df_top_5_candidatos_disp['Pontuação de Match'].apply(lambda x: f"{x:.2%}")
+                                    # Resultados já chegam ordenados e limitados ao top-k
+                                    df_top_k_candidatos_disp = df_scores_candidatos_disp.copy()
+                                    df_top_k_candidatos_disp['Pontuação de Match'] = df_top_k_candidatos_disp['Pontuação de Match'].apply(lambda x: f"{x:.2%}")
                                     
-                                    st.dataframe(df_top_5_candidatos_disp[['ID Candidato', 'Nome', 'Pontuação de Match']], use_container_width=True)
+                                    st.dataframe(df_top_k_candidatos_disp[['ID Candidato', 'Nome', 'Pontuação de Match']], use_container_width=True)
 
                                 else:
                                     st.info(f"Nenhum candidato retornado pela função de score para a vaga '{titulo_vaga_display_res}'.")
@@ -464,6 +610,8 @@ def main():
                                 st.info(f"Nenhum candidato passou na pré-filtragem ou não há candidatos compatíveis para a vaga '{titulo_vaga_display_res}'.")
                         else:
                              st.error(f"Vaga com ID '{st.session_state.last_searched_vaga_id}' não encontrada para exibir resultados.")
+                if mostrar_tempos_param:
+                    exibir_painel_tempos(st.session_state.get('ultimos_tempos_busca'))
         else:
             st.info("Nenhuma vaga para selecionar (verifique filtros e dados).")
 
@@ -0,0 +1,3 @@
+"""
+Módulos de apoio ao Painel de Otimização de Recrutamento (scoring em lote e utilitários).
+"""
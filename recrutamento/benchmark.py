@@ -0,0 +1,427 @@
+"""
+Benchmark da busca de candidatos por vaga (o caminho de calcular_scores_para_vaga_com_pre_filtro)
+em bases sintéticas com 1x, 10x, 100x... o volume atual de candidatos.
+
+O gerador monta tabelas no formato de vagas_processadas / candidatos_processados com o esquema
+de colunas_modelo.joblib: tech_* e skill_* do modelo, valores categóricos tirados dos nomes das
+colunas one-hot e níveis de idioma do mapa_nivel_idioma. As flags seguem popularidade desigual
+(poucas tecnologias muito frequentes, cauda longa de raras); com --perfil-dos-dados as densidades
+de cada flag e as frequências das categorias são medidas nos arquivos processados reais.
+
+Cada etapa é cronometrada por vaga: pré-filtro, montagem das features, predição e ranking.
+O resultado sai em JSON para comparar commits:
+    python -m recrutamento.benchmark executar --escalas 1 10 100 --saida bench_antes.json
+    python -m recrutamento.benchmark comparar bench_antes.json bench_depois.json
+    python -m recrutamento.benchmark gerar --escala 10 --saida-dados /tmp/dados_x10
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from recrutamento.colunar import PREFIXOS_FLAGS, caminho_colunar, salvar_colunar
+from recrutamento.instrumentacao import novo_registro
+from recrutamento.scoring import (
+    TAMANHO_LOTE_PREDICAO, construir_armazem_candidatos, linhas_pre_filtradas_para_vaga,
+    matriz_features_do_armazem, n_candidatos, preparar_vetor_vaga, top_k_armazem
+)
+
+# Volume atual (escala 1) quando não há dados processados para medir
+VAGAS_ESCALA_1 = 14000
+CANDIDATOS_ESCALA_1 = 42000
+
+# Densidade média das flags por linha: ~3-4 tecnologias por vaga e por candidato
+DENSIDADE_TECH_VAGA = 0.06
+DENSIDADE_SKILL_CANDIDATO = 0.06
+# Expoente da popularidade das flags (peso da j-ésima mais popular ~ 1 / (j + 1) ** expoente)
+EXPOENTE_POPULARIDADE = 1.0
+DENSIDADE_MAXIMA_FLAG = 0.6
+
+ETAPAS = ('pre_filtro', 'features', 'predicao', 'ranking')
+VERSAO_FORMATO = 1
+
+# Coluna categórica -> prefixo das colunas one-hot do modelo de onde saem os valores, e valores
+# que existem nos dados mas não viraram coluna (categoria de referência ou descartada)
+CATEGORICAS_VAGA = {
+    'categoria_vaga': ('categoria_vaga_', ['Não Informado']),
+    'nivel_profissional_vaga': ('nivel_profissional_vaga_', ['Analista', 'Não Informado']),
+    'nivel_academico': ('nivel_academico_vaga_', ['Não Informado']),
+    'modalidade_trabalho': ('modalidade_trabalho_', ['Híbrido']),
+    'vaga_sap': ('vaga_sap_', ['Não']),
+}
+CATEGORICAS_CANDIDATO = {
+    # Os pré-filtros casam a categoria do candidato com a categoria da vaga
+    'categoria_profissional_candidato': ('categoria_vaga_', []),
+    'categoria_profissional': ('categoria_profissional_', ['Consultoria SAP']),
+    'nivel_profissional_padronizado_candidato': ('nivel_profissional_padronizado_', ['Gerência/Diretoria']),
+    'nivel_academico_padronizado': ('nivel_academico_padronizado_', ['Outros/Não Especificado']),
+    'pcd_padronizado': ('pcd_padronizado_', ['Não']),
+}
+
+
+#  Perfil das bases (densidades das flags e frequências das categorias)
+def _pesos_popularidade(n, expoente=EXPOENTE_POPULARIDADE):
+    pesos = 1.0 / (np.arange(n) + 1.0) ** expoente
+    return pesos / pesos.mean()
+
+
+def _densidades_flags(colunas, densidade_media, gerador):
+    # Ordem de popularidade sorteada: qualquer coluna pode ser a mais frequente
+    densidades = np.minimum(densidade_media * _pesos_popularidade(len(colunas)), DENSIDADE_MAXIMA_FLAG)
+    return dict(zip(colunas, gerador.permutation(densidades).tolist()))
+
+
+def _frequencias_categoria(valores, gerador):
+    pesos = gerador.permutation(_pesos_popularidade(len(valores)))
+    return dict(zip(valores, (pesos / pesos.sum()).tolist()))
+
+
+def _valores_categoricos(colunas_modelo, prefixo, extras):
+    valores = [col[len(prefixo):] for col in colunas_modelo if col.startswith(prefixo)]
+    return valores + [valor for valor in extras if valor not in valores]
+
+
+def perfil_padrao(colunas_modelo, mapas, semente=0):
+    gerador = np.random.default_rng(semente)
+    niveis_idioma = sorted(mapas['mapa_nivel_idioma'], key=lambda nivel: mapas['mapa_nivel_idioma'][nivel])
+    idiomas = {col: _frequencias_categoria(niveis_idioma, gerador) for col in ('nivel_ingles', 'nivel_espanhol')}
+    return {
+        'origem': 'padrao',
+        'vagas': {
+            'flags': _densidades_flags([col for col in colunas_modelo if col.startswith('tech_')], DENSIDADE_TECH_VAGA, gerador),
+            'categoricas': dict(idiomas, **{
+                col: _frequencias_categoria(_valores_categoricos(colunas_modelo, prefixo, extras), gerador)
+                for col, (prefixo, extras) in CATEGORICAS_VAGA.items()
+            }),
+        },
+        'candidatos': {
+            'flags': _densidades_flags([col for col in colunas_modelo if col.startswith('skill_')], DENSIDADE_SKILL_CANDIDATO, gerador),
+            'categoricas': dict(idiomas, **{
+                col: _frequencias_categoria(_valores_categoricos(colunas_modelo, prefixo, extras), gerador)
+                for col, (prefixo, extras) in CATEGORICAS_CANDIDATO.items()
+            }),
+        },
+    }
+
+
+def _perfil_tabela(df, colunas_categoricas):
+    flags = {
+        col: float((pd.to_numeric(df[col], errors='coerce').fillna(0) == 1).mean())
+        for col in df.columns if col.startswith(PREFIXOS_FLAGS)
+    }
+    categoricas = {
+        col: {str(valor): float(freq) for valor, freq in df[col].astype(object).fillna('Não Informado').value_counts(normalize=True).items()}
+        for col in colunas_categoricas if col in df.columns
+    }
+    return {'flags': flags, 'categoricas': categoricas}
+
+
+def perfil_das_bases(df_vagas, df_candidatos):
+    """Densidade de cada flag e frequência de cada valor categórico medidas nas bases reais."""
+    return {
+        'origem': 'dados',
+        'vagas': _perfil_tabela(df_vagas, list(CATEGORICAS_VAGA) + ['nivel_ingles', 'nivel_espanhol']),
+        'candidatos': _perfil_tabela(df_candidatos, list(CATEGORICAS_CANDIDATO) + ['nivel_ingles', 'nivel_espanhol']),
+    }
+
+
+#  Gerador de bases sintéticas
+def _coluna_categorica(frequencias, n, gerador):
+    valores = list(frequencias)
+    probabilidades = np.array([frequencias[valor] for valor in valores], dtype=np.float64)
+    codigos = gerador.choice(len(valores), size=n, p=probabilidades / probabilidades.sum())
+    return pd.Categorical.from_codes(codigos, categories=valores)
+
+
+def _gerar_tabela(perfil_tabela, n, coluna_id, gerador, colunas_texto):
+    dados = {coluna_id: np.arange(1, n + 1).astype(str)}
+    for col, texto in colunas_texto.items():
+        dados[col] = pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), categories=[texto])
+    for col, frequencias in perfil_tabela['categoricas'].items():
+        dados[col] = _coluna_categorica(frequencias, n, gerador)
+    for col, densidade in perfil_tabela['flags'].items():
+        dados[col] = (gerador.random(n, dtype=np.float32) < densidade).astype(np.uint8)
+    return pd.DataFrame(dados)
+
+
+def gerar_bases_sinteticas(perfil, total_vagas, total_candidatos, semente=0):
+    """
+    (df_vagas, df_candidatos) no formato dos arquivos processados, já com os dtypes do formato
+    colunar (flags uint8, categóricas como category) para que 100x a base caiba em memória.
+    """
+    gerador = np.random.default_rng(semente)
+    df_vagas = _gerar_tabela(perfil['vagas'], total_vagas, 'id_vaga', gerador, {'titulo_vaga': 'Vaga sintética', 'cliente': 'Cliente sintético'})
+    df_candidatos = _gerar_tabela(perfil['candidatos'], total_candidatos, 'id_candidato', gerador, {'nome': 'Candidato sintético', 'titulo_profissional': 'Profissional'})
+    # nivel_profissional_padronizado também é lido pelo caminho linha a linha do app
+    if 'nivel_profissional_padronizado_candidato' in df_candidatos.columns:
+        df_candidatos['nivel_profissional_padronizado'] = df_candidatos['nivel_profissional_padronizado_candidato']
+    return df_vagas, df_candidatos
+
+
+def salvar_bases_sinteticas(df_vagas, df_candidatos, pasta):
+    # CSV + Feather, como converter_csvs deixaria a pasta data/
+    os.makedirs(pasta, exist_ok=True)
+    for df, nome in ((df_vagas, 'vagas_processadas.csv'), (df_candidatos, 'candidatos_processados.csv')):
+        caminho_csv = os.path.join(pasta, nome)
+        df.to_csv(caminho_csv, index=False)
+        salvar_colunar(df, caminho_colunar(caminho_csv))
+    return pasta
+
+
+#  Modelo para o benchmark
+def treinar_modelo_sintetico(colunas_modelo, mapas, perfil, n_linhas=20000, semente=0):
+    """
+    Floresta com os hiperparâmetros do notebook treinada em pares sintéticos, para quando o
+    modelo real não está disponível. O rótulo depende de skills em comum, idioma e categoria,
+    então as árvores têm profundidade parecida com a do modelo real.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+
+    gerador = np.random.default_rng(semente)
+    df_vagas, df_candidatos = gerar_bases_sinteticas(perfil, max(1, n_linhas // 200), 200, semente + 1)
+    armazem = construir_armazem_candidatos(df_candidatos, colunas_modelo, mapas)
+    blocos = [
+        matriz_features_do_armazem(armazem, preparar_vetor_vaga(df_vagas.iloc[i], colunas_modelo, mapas))
+        for i in range(len(df_vagas))
+    ]
+    X = np.concatenate(blocos)
+    indice_colunas = armazem['indice_colunas']
+    latente = 1.5 * X[:, indice_colunas['skills_match_count']] + X[:, indice_colunas['compat_ingles']] + gerador.normal(0, 1, len(X))
+    y = (latente > np.quantile(latente, 0.8)).astype(int)
+    modelo = RandomForestClassifier(
+        n_estimators=100, class_weight='balanced', random_state=42, n_jobs=-1, min_samples_split=10, min_samples_leaf=5
+    )
+    return modelo.fit(pd.DataFrame(X, columns=colunas_modelo), y)
+
+
+#  Execução cronometrada
+def _estatisticas(tempos_s, linhas):
+    tempos = np.asarray(tempos_s, dtype=np.float64)
+    total_linhas = int(np.sum(linhas))
+    return {
+        'media_ms': float(tempos.mean() * 1000),
+        'p50_ms': float(np.percentile(tempos, 50) * 1000),
+        'p90_ms': float(np.percentile(tempos, 90) * 1000),
+        'p99_ms': float(np.percentile(tempos, 99) * 1000),
+        'max_ms': float(tempos.max() * 1000),
+        'total_s': float(tempos.sum()),
+        'linhas_por_s': float(total_linhas / tempos.sum()) if tempos.sum() > 0 else None,
+    }
+
+
+def medir_vaga(vaga_serie, armazem, modelo, mapas, num_min_tech_match=1, k=5, tamanho_lote=TAMANHO_LOTE_PREDICAO):
+    """
+    Tempos (s) de cada etapa da busca de uma vaga: o pré-filtro inteiro e, do registro de
+    top_k_armazem (recrutamento.instrumentacao), montagem das features, predição e ranking.
+    """
+    registro = novo_registro(vaga_serie.get('id_vaga'))
+    inicio = time.perf_counter()
+    linhas = linhas_pre_filtradas_para_vaga(vaga_serie, armazem, num_min_tech_match)
+    tempo_pre_filtro = time.perf_counter() - inicio
+    melhores = top_k_armazem(vaga_serie, armazem, linhas, modelo, mapas, k, tamanho_lote, registro=registro)
+    tempos = {etapa: registro['etapas'].get(etapa, {}).get('segundos', 0.0) for etapa in ETAPAS}
+    tempos['pre_filtro'] = tempo_pre_filtro
+    return tempos, n_candidatos(armazem), len(linhas), melhores
+
+
+def medir_escala(df_vagas, df_candidatos, colunas_modelo, modelo, mapas, n_vagas_medidas=20, num_min_tech_match=1, k=5, semente=0):
+    inicio = time.perf_counter()
+    armazem = construir_armazem_candidatos(df_candidatos, colunas_modelo, mapas)
+    tempo_armazem = time.perf_counter() - inicio
+
+    gerador = np.random.default_rng(semente)
+    posicoes_vagas = gerador.choice(len(df_vagas), size=min(n_vagas_medidas, len(df_vagas)), replace=False)
+    # Uma vaga fora da medição para aquecer caches do modelo e do NumPy
+    medir_vaga(df_vagas.iloc[posicoes_vagas[0]], armazem, modelo, mapas, num_min_tech_match, k)
+
+    tempos_por_etapa = {etapa: [] for etapa in ETAPAS}
+    linhas_entrada, linhas_saida = [], []
+    for posicao in posicoes_vagas:
+        tempos, n_entrada, n_saida, _ = medir_vaga(df_vagas.iloc[posicao], armazem, modelo, mapas, num_min_tech_match, k)
+        for etapa in ETAPAS:
+            tempos_por_etapa[etapa].append(tempos[etapa])
+        linhas_entrada.append(n_entrada)
+        linhas_saida.append(n_saida)
+
+    linhas_por_etapa = {'pre_filtro': linhas_entrada, 'features': linhas_saida, 'predicao': linhas_saida, 'ranking': linhas_saida}
+    total_por_vaga = np.sum([tempos_por_etapa[etapa] for etapa in ETAPAS], axis=0)
+    return {
+        'n_vagas': len(df_vagas),
+        'n_candidatos': len(df_candidatos),
+        'vagas_medidas': len(posicoes_vagas),
+        'construcao_armazem_s': tempo_armazem,
+        'candidatos_pos_filtro': {
+            'media': float(np.mean(linhas_saida)),
+            'p50': float(np.percentile(linhas_saida, 50)),
+            'max': int(np.max(linhas_saida)),
+        },
+        'etapas': {etapa: _estatisticas(tempos_por_etapa[etapa], linhas_por_etapa[etapa]) for etapa in ETAPAS},
+        'total': _estatisticas(total_por_vaga, linhas_entrada),
+    }
+
+
+def _commit_atual():
+    try:
+        saida = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+        sujo = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return saida.stdout.strip() + ('-modificado' if sujo else '')
+
+
+def _ambiente():
+    import sklearn
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'cpus': os.cpu_count(),
+        'plataforma': platform.platform(),
+    }
+
+
+def executar_benchmark(colunas_modelo, mapas, modelo, perfil, escalas=(1, 10, 100), vagas_escala_1=VAGAS_ESCALA_1,
+                       candidatos_escala_1=CANDIDATOS_ESCALA_1, n_vagas_medidas=20, num_min_tech_match=1, k=5, semente=0,
+                       origem_modelo=None):
+    resultado = {
+        'formato': VERSAO_FORMATO,
+        'commit': _commit_atual(),
+        'data': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'ambiente': _ambiente(),
+        'parametros': {
+            'vagas_escala_1': vagas_escala_1, 'candidatos_escala_1': candidatos_escala_1, 'vagas_medidas': n_vagas_medidas,
+            'num_min_tech_match': num_min_tech_match, 'k': k, 'semente': semente,
+            'perfil': perfil['origem'], 'modelo': origem_modelo,
+        },
+        'escalas': {},
+    }
+    for escala in escalas:
+        # Só os candidatos crescem com a escala: o custo da busca é por vaga, e só n_vagas_medidas são medidas
+        total_candidatos = int(round(candidatos_escala_1 * escala))
+        df_vagas, df_candidatos = gerar_bases_sinteticas(perfil, max(n_vagas_medidas, min(vagas_escala_1, 1000)), total_candidatos, semente)
+        medicao = medir_escala(df_vagas, df_candidatos, colunas_modelo, modelo, mapas, n_vagas_medidas, num_min_tech_match, k, semente)
+        del df_vagas, df_candidatos
+        resultado['escalas'][f"{escala:g}"] = medicao
+        print(f"x{escala:g}: {medicao['n_candidatos']:,} candidatos | {medicao['candidatos_pos_filtro']['media']:,.0f} pós-filtro (média) | "
+              + " | ".join(f"{etapa} {medicao['etapas'][etapa]['p50_ms']:.1f}ms" for etapa in ETAPAS)
+              + f" | total p50 {medicao['total']['p50_ms']:.1f}ms", file=sys.stderr)
+    return resultado
+
+
+def comparar_resultados(antes, depois, limiar=1.10):
+    """Razão depois/antes do p50 de cada etapa; marca como regressão o que passar do limiar."""
+    regressoes = []
+    print(f"{'escala':>8}  {'etapa':<12}{'antes p50 (ms)':>16}{'depois p50 (ms)':>17}{'razão':>8}")
+    for escala, medicao_depois in depois['escalas'].items():
+        medicao_antes = antes['escalas'].get(escala)
+        if medicao_antes is None:
+            continue
+        for etapa in ETAPAS + ('total',):
+            estat_antes = medicao_antes['total'] if etapa == 'total' else medicao_antes['etapas'][etapa]
+            estat_depois = medicao_depois['total'] if etapa == 'total' else medicao_depois['etapas'][etapa]
+            razao = estat_depois['p50_ms'] / estat_antes['p50_ms'] if estat_antes['p50_ms'] > 0 else float('inf')
+            marcador = '  <- regressão' if razao > limiar else ''
+            if razao > limiar:
+                regressoes.append((escala, etapa, razao))
+            print(f"{'x' + escala:>8}  {etapa:<12}{estat_antes['p50_ms']:>16.2f}{estat_depois['p50_ms']:>17.2f}{razao:>8.2f}{marcador}")
+    return regressoes
+
+
+def _carregar_contexto(args):
+    import joblib
+
+    from recrutamento.carregamento import ler_dados_processados, mapas_engenharia
+
+    colunas_modelo = joblib.load(os.path.join(args.artefatos, 'colunas_modelo.joblib'))
+    mapas = mapas_engenharia(joblib.load(os.path.join(args.artefatos, 'artefatos_engenharia.joblib')))
+    caminho_vagas = os.path.join(args.dados, 'vagas_processadas.csv')
+    caminho_candidatos = os.path.join(args.dados, 'candidatos_processados.csv')
+    tamanhos = (VAGAS_ESCALA_1, CANDIDATOS_ESCALA_1)
+    perfil = perfil_padrao(colunas_modelo, mapas, args.semente)
+    if os.path.exists(caminho_vagas) and os.path.exists(caminho_candidatos):
+        df_vagas = ler_dados_processados(caminho_vagas)
+        df_candidatos = ler_dados_processados(caminho_candidatos)
+        # Escala 1 = volume atual dos dados processados
+        tamanhos = (len(df_vagas), len(df_candidatos))
+        if args.perfil_dos_dados:
+            perfil = perfil_das_bases(df_vagas, df_candidatos)
+    elif args.perfil_dos_dados:
+        print(f"Dados processados não encontrados em {args.dados}; usando o perfil padrão.", file=sys.stderr)
+    return colunas_modelo, mapas, perfil, tamanhos
+
+
+def main():
+    from recrutamento.carregamento import PATH_ARTIFACTS, PATH_DATA
+
+    parser = argparse.ArgumentParser(description="Benchmark das etapas da busca de candidatos em bases sintéticas.")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+    for nome, ajuda in (('executar', "Mede as etapas em cada escala e grava o JSON"), ('gerar', "Grava bases sintéticas (CSV + Feather)")):
+        sub = subcomandos.add_parser(nome, help=ajuda)
+        sub.add_argument('--dados', default=PATH_DATA, help="Dados processados reais (volume da escala 1 e --perfil-dos-dados)")
+        sub.add_argument('--artefatos', default=PATH_ARTIFACTS)
+        sub.add_argument('--perfil-dos-dados', action='store_true', help="Densidades das flags e categorias medidas nos dados reais")
+        sub.add_argument('--semente', type=int, default=0)
+    executar = subcomandos.choices['executar']
+    executar.add_argument('--escalas', type=float, nargs='+', default=[1, 10, 100])
+    executar.add_argument('--vagas-medidas', type=int, default=20)
+    executar.add_argument('--num-min-tech-match', type=int, default=1)
+    executar.add_argument('--k', type=int, default=5)
+    executar.add_argument('--modelo', default=None, help="Modelo joblib (padrão: artefatos/modelo_recrutamento_rf.joblib, ou treinado em dados sintéticos)")
+    executar.add_argument('--saida', default=None, help="Arquivo JSON do resultado (padrão: stdout)")
+    gerar = subcomandos.choices['gerar']
+    gerar.add_argument('--escala', type=float, default=1)
+    gerar.add_argument('--saida-dados', required=True)
+    comparar = subcomandos.add_parser('comparar', help="Compara dois JSONs de benchmark (p50 por etapa)")
+    comparar.add_argument('antes')
+    comparar.add_argument('depois')
+    comparar.add_argument('--limiar', type=float, default=1.10, help="Razão depois/antes acima da qual a etapa é regressão")
+    args = parser.parse_args()
+
+    if args.comando == 'comparar':
+        with open(args.antes, encoding='utf-8') as f:
+            antes = json.load(f)
+        with open(args.depois, encoding='utf-8') as f:
+            depois = json.load(f)
+        sys.exit(1 if comparar_resultados(antes, depois, args.limiar) else 0)
+
+    colunas_modelo, mapas, perfil, (vagas_escala_1, candidatos_escala_1) = _carregar_contexto(args)
+    if args.comando == 'gerar':
+        df_vagas, df_candidatos = gerar_bases_sinteticas(
+            perfil, int(round(vagas_escala_1 * args.escala)), int(round(candidatos_escala_1 * args.escala)), args.semente
+        )
+        print(salvar_bases_sinteticas(df_vagas, df_candidatos, args.saida_dados))
+        return
+
+    import joblib
+
+    caminho_modelo = args.modelo or os.path.join(args.artefatos, 'modelo_recrutamento_rf.joblib')
+    if os.path.exists(caminho_modelo):
+        modelo, origem_modelo = joblib.load(caminho_modelo), caminho_modelo
+    else:
+        print(f"Modelo não encontrado em {caminho_modelo}; treinando floresta em dados sintéticos.", file=sys.stderr)
+        modelo, origem_modelo = treinar_modelo_sintetico(colunas_modelo, mapas, perfil, semente=args.semente), 'sintetico'
+
+    resultado = executar_benchmark(
+        colunas_modelo, mapas, modelo, perfil, args.escalas, vagas_escala_1, candidatos_escala_1,
+        args.vagas_medidas, args.num_min_tech_match, args.k, args.semente, origem_modelo
+    )
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            f.write(texto + '\n')
+    else:
+        print(texto)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Busca reversa: dado um candidato, ranqueia as vagas. As features do lado da vaga são montadas uma
+vez por carga de dados (armazém de vagas), reproduzindo preparar_vetor_vaga coluna a coluna; a
+cada busca só entram a linha do candidato, vinda do armazém de candidatos, e as colunas que cruzam
+vaga e candidato. Todas as vagas são pontuadas num único lote. A mesma montagem serve para pares
+(vaga, candidato) arbitrários (matriz_features_pares).
+"""
+import numpy as np
+
+from recrutamento.codificador import codificador_para_colunas, posicoes_one_hot
+from recrutamento.features import marcar_vaga_sap, nome_base_tech
+from recrutamento.indices import contar_bits_em_comum, empacotar_bits
+from recrutamento.scoring import (
+    FEATURES_CATEGORICAS_VAGA, TAMANHO_LOTE_PREDICAO, coluna_idioma_ordinal, coluna_numerica, coluna_texto,
+    matriz_candidatos_do_armazem, prever_probabilidades_lote, selecionar_top_k
+)
+
+
+def construir_armazem_vagas(df_vagas, armazem_candidatos, mapas):
+    """
+    Matriz (n_vagas x colunas_modelo) com os valores de vaga e a máscara de quais colunas cada vaga
+    define (os mesmos de preparar_vetor_vaga, calculados por coluna), mais idiomas, total de techs e
+    as techs da vaga já empacotadas no layout do índice de skills dos candidatos.
+    """
+    indice_colunas = armazem_candidatos['indice_colunas']
+    indice_skills = armazem_candidatos['indice_skills']
+    n_vagas = len(df_vagas)
+    linhas = np.arange(n_vagas)
+
+    valores = np.zeros((n_vagas, len(indice_colunas)), dtype=np.float32)
+    definidas = np.zeros((n_vagas, len(indice_colunas)), dtype=bool)
+
+    def definir(col, valores_col):
+        if col in indice_colunas:
+            valores[:, indice_colunas[col]] = valores_col
+            definidas[:, indice_colunas[col]] = True
+
+    mapa_nivel_idioma = mapas['mapa_nivel_idioma']
+    ingles = coluna_idioma_ordinal(df_vagas, 'nivel_ingles', mapa_nivel_idioma)
+    espanhol = coluna_idioma_ordinal(df_vagas, 'nivel_espanhol', mapa_nivel_idioma)
+    definir('nivel_ingles_ordinal_vaga', ingles)
+    definir('nivel_espanhol_ordinal_vaga', espanhol)
+    definir('vaga_sap_bool', marcar_vaga_sap(coluna_texto(df_vagas, 'vaga_sap', "Não")).to_numpy(dtype=np.float32))
+    definir('comentario_tem_valor_monetario', 0)
+
+    tech_cols_vaga = [col for col in df_vagas.columns if col.startswith('tech_')]
+    techs = np.zeros((n_vagas, len(tech_cols_vaga)), dtype=np.float32)
+    for j, col in enumerate(tech_cols_vaga):
+        techs[:, j] = coluna_numerica(df_vagas, col)
+        definir(col, techs[:, j])
+    total_techs = techs.sum(axis=1, dtype=np.float32)
+    definir('total_techs_vaga', total_techs)
+
+    codificador = codificador_para_colunas(armazem_candidatos['colunas_modelo'])
+    for feature, coluna_origem in FEATURES_CATEGORICAS_VAGA.items():
+        posicoes = posicoes_one_hot(codificador, feature, df_vagas, coluna_origem)
+        ativas = posicoes >= 0
+        valores[linhas[ativas], posicoes[ativas]] = 1
+        definidas[linhas[ativas], posicoes[ativas]] = True
+
+    # techs_ativas da vaga no layout de bits das skills dos candidatos (mesmo nome base)
+    posicao_por_nome_base = indice_skills['posicao_por_nome_base']
+    techs_no_layout_skills = np.zeros((n_vagas, len(indice_skills['colunas'])), dtype=bool)
+    for j, col in enumerate(tech_cols_vaga):
+        nome_base = nome_base_tech(col)
+        if nome_base in posicao_por_nome_base:
+            techs_no_layout_skills[:, posicao_por_nome_base[nome_base]] |= techs[:, j] == 1
+
+    if 'id_vaga' in df_vagas.columns:
+        ids = df_vagas['id_vaga'].astype(str).to_numpy()
+    else:
+        ids = np.array([str(i) for i in df_vagas.index], dtype=object)
+
+    return {
+        'valores': valores,
+        'definidas': definidas,
+        'ingles': ingles,
+        'espanhol': espanhol,
+        'total_techs': total_techs,
+        'mascaras_techs': empacotar_bits(techs_no_layout_skills),
+        'ids': ids,
+    }
+
+
+def matriz_features_pares(armazem_vagas, armazem_candidatos, linhas_vagas, linhas_candidatos):
+    """
+    Matriz de features de pares (vaga, candidato) arbitrários: linha i = vaga linhas_vagas[i] x
+    candidato linhas_candidatos[i]. Mesma ordem de matriz_features_do_armazem: candidato, depois
+    valores da vaga, depois colunas pareadas.
+    """
+    linhas_vagas = np.asarray(linhas_vagas, dtype=np.int64)
+    linhas_candidatos = np.asarray(linhas_candidatos, dtype=np.int64)
+    # Cada candidato é remontado uma vez, mesmo que apareça em vários pares
+    candidatos_unicos, posicao_candidato = np.unique(linhas_candidatos, return_inverse=True)
+    linhas_cand = matriz_candidatos_do_armazem(armazem_candidatos, candidatos_unicos)[posicao_candidato]
+    matriz = np.where(armazem_vagas['definidas'][linhas_vagas], armazem_vagas['valores'][linhas_vagas], linhas_cand)
+
+    bits_cand = armazem_candidatos['indice_skills']['bits'][linhas_candidatos]
+    skills_match_count = contar_bits_em_comum(armazem_vagas['mascaras_techs'][linhas_vagas], bits_cand).astype(np.float32)
+    total_techs = armazem_vagas['total_techs'][linhas_vagas]
+
+    pareadas = {
+        'compat_ingles': (armazem_candidatos['ingles'][linhas_candidatos] >= armazem_vagas['ingles'][linhas_vagas]).astype(np.float32),
+        'compat_espanhol': (armazem_candidatos['espanhol'][linhas_candidatos] >= armazem_vagas['espanhol'][linhas_vagas]).astype(np.float32),
+        'skills_match_count': skills_match_count,
+        'skills_faltantes_vaga': np.maximum(0, total_techs - skills_match_count),
+    }
+    indice_colunas = armazem_candidatos['indice_colunas']
+    for col, valores_col in pareadas.items():
+        if col in indice_colunas:
+            matriz[:, indice_colunas[col]] = valores_col
+    return matriz
+
+
+def matriz_features_para_candidato(armazem_vagas, armazem_candidatos, linha_candidato, linhas_vagas=None):
+    if linhas_vagas is None:
+        linhas_vagas = np.arange(len(armazem_vagas['valores']))
+    return matriz_features_pares(armazem_vagas, armazem_candidatos, linhas_vagas, np.full(len(linhas_vagas), linha_candidato))
+
+
+def top_k_vagas_para_candidato(armazem_vagas, armazem_candidatos, linha_candidato, modelo, k=5, linhas_vagas=None, tamanho_lote=TAMANHO_LOTE_PREDICAO):
+    """
+    Top-k vagas para o candidato na linha `linha_candidato` do armazém de candidatos.
+    Retorna (linhas de vaga, scores) em ordem decrescente; empates pela ordem original das vagas.
+    """
+    if linhas_vagas is None:
+        linhas_vagas = np.arange(len(armazem_vagas['valores']), dtype=np.int64)
+    linhas_vagas = np.asarray(linhas_vagas, dtype=np.int64)
+    if len(linhas_vagas) == 0 or k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    matriz = matriz_features_para_candidato(armazem_vagas, armazem_candidatos, linha_candidato, linhas_vagas)
+    scores = prever_probabilidades_lote(modelo, matriz, armazem_candidatos['colunas_modelo'], tamanho_lote)
+    return selecionar_top_k(linhas_vagas, scores, k)
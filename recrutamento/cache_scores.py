@@ -0,0 +1,105 @@
+"""
+Cache persistente de resultados de busca (SQLite), compartilhado entre sessões, processos do
+Streamlit e reinícios da aplicação. A chave inclui a vaga, os parâmetros de pré-filtro e a
+impressão digital do modelo e dos CSVs processados, então qualquer artefato novo invalida as
+entradas antigas automaticamente.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+MAX_ENTRADAS_CACHE = 2000
+
+_impressoes_por_arquivo = {}
+
+
+def impressao_digital_arquivo(caminho):
+    # SHA-256 do conteúdo, recalculado só quando tamanho ou mtime do arquivo mudam
+    try:
+        estado = os.stat(caminho)
+    except OSError:
+        return "ausente"
+    chave_estado = (os.path.abspath(caminho), estado.st_size, estado.st_mtime_ns)
+    if chave_estado not in _impressoes_por_arquivo:
+        sha = hashlib.sha256()
+        with open(caminho, 'rb') as f:
+            for bloco in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(bloco)
+        _impressoes_por_arquivo[chave_estado] = sha.hexdigest()
+    return _impressoes_por_arquivo[chave_estado]
+
+
+def carimbo_arquivo(caminho):
+    # Tamanho + mtime, sem ler o conteúdo: barato o bastante para checar a cada inicialização
+    try:
+        estado = os.stat(caminho)
+    except OSError:
+        return "ausente"
+    return f"{estado.st_size}-{estado.st_mtime_ns}"
+
+
+def versao_artefatos(caminhos_arquivos):
+    sha = hashlib.sha256()
+    for caminho in caminhos_arquivos:
+        sha.update(os.path.basename(caminho).encode('utf-8'))
+        sha.update(impressao_digital_arquivo(caminho).encode('utf-8'))
+    return sha.hexdigest()
+
+
+def chave_busca(vaga_id, parametros_busca, versao):
+    parametros_ordenados = json.dumps(parametros_busca, sort_keys=True, default=str)
+    return hashlib.sha256(f"{vaga_id}|{parametros_ordenados}|{versao}".encode('utf-8')).hexdigest()
+
+
+def _conectar(caminho_db):
+    pasta = os.path.dirname(caminho_db)
+    if pasta and not os.path.exists(pasta):
+        os.makedirs(pasta)
+    conexao = sqlite3.connect(caminho_db, timeout=30)
+    conexao.execute("PRAGMA journal_mode=WAL")
+    conexao.execute(
+        "CREATE TABLE IF NOT EXISTS scores_busca ("
+        " chave TEXT PRIMARY KEY,"
+        " vaga_id TEXT NOT NULL,"
+        " versao TEXT NOT NULL,"
+        " resultados TEXT NOT NULL,"
+        " criado_em REAL NOT NULL,"
+        " ultimo_acesso REAL NOT NULL)"
+    )
+    conexao.execute("CREATE INDEX IF NOT EXISTS idx_scores_busca_acesso ON scores_busca (ultimo_acesso)")
+    return conexao
+
+
+def obter_resultados(caminho_db, chave):
+    try:
+        with closing(_conectar(caminho_db)) as conexao, conexao:
+            linha = conexao.execute("SELECT resultados FROM scores_busca WHERE chave = ?", (chave,)).fetchone()
+            if linha is None:
+                return None
+            conexao.execute("UPDATE scores_busca SET ultimo_acesso = ? WHERE chave = ?", (time.time(), chave))
+        return json.loads(linha[0])
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Aviso: falha ao ler o cache de scores '{caminho_db}': {e}")
+        return None
+
+
+def salvar_resultados(caminho_db, chave, vaga_id, versao, resultados, max_entradas=MAX_ENTRADAS_CACHE):
+    agora = time.time()
+    try:
+        with closing(_conectar(caminho_db)) as conexao, conexao:
+            # Entradas de outra versão do modelo/dados nunca mais serão lidas: remove já
+            conexao.execute("DELETE FROM scores_busca WHERE versao != ?", (versao,))
+            conexao.execute(
+                "INSERT OR REPLACE INTO scores_busca (chave, vaga_id, versao, resultados, criado_em, ultimo_acesso) VALUES (?, ?, ?, ?, ?, ?)",
+                (chave, str(vaga_id), versao, json.dumps(resultados, default=float), agora, agora)
+            )
+            # LRU: mantém apenas as max_entradas acessadas mais recentemente
+            conexao.execute(
+                "DELETE FROM scores_busca WHERE chave NOT IN (SELECT chave FROM scores_busca ORDER BY ultimo_acesso DESC LIMIT ?)",
+                (max_entradas,)
+            )
+    except sqlite3.Error as e:
+        print(f"Aviso: falha ao gravar no cache de scores '{caminho_db}': {e}")
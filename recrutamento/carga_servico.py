@@ -0,0 +1,126 @@
+"""
+Teste de carga do serviço de scoring (recrutamento.servico): dispara requisições concorrentes com
+ids reais dos dados processados e reporta latência p50/p90/p99 e vazão. Compara também quantas
+chamadas de predição o micro-lote fez para atender as requisições.
+
+Com o serviço rodando:
+    python -m recrutamento.carga_servico --endpoint score --requisicoes 2000 --concorrencia 16
+"""
+import argparse
+import http.client
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import numpy as np
+
+ENDPOINTS = ('score', 'top_k', 'score_pairs')
+
+
+def _conexao(url, locais):
+    # Uma conexão keep-alive por thread do cliente
+    if not hasattr(locais, 'conexao'):
+        alvo = urlparse(url)
+        locais.conexao = http.client.HTTPConnection(alvo.hostname, alvo.port or 80, timeout=60)
+    return locais.conexao
+
+
+def _requisitar(url, locais, metodo, rota, corpo=None):
+    conexao = _conexao(url, locais)
+    dados = None if corpo is None else json.dumps(corpo).encode('utf-8')
+    try:
+        conexao.request(metodo, rota, body=dados, headers={'Content-Type': 'application/json'})
+        resposta = conexao.getresponse()
+        conteudo = resposta.read()
+    except (http.client.HTTPException, OSError):
+        # Conexão derrubada: a próxima requisição abre outra
+        conexao.close()
+        del locais.conexao
+        raise
+    return resposta.status, json.loads(conteudo)
+
+
+def gerar_corpos(ids_vagas, ids_candidatos, endpoint, n_requisicoes, candidatos_por_requisicao, semente=0):
+    gerador = np.random.default_rng(semente)
+    corpos = []
+    for _ in range(n_requisicoes):
+        vaga_id = str(gerador.choice(ids_vagas))
+        candidatos = [str(c) for c in gerador.choice(ids_candidatos, size=candidatos_por_requisicao)]
+        if endpoint == 'score':
+            corpos.append({'vaga_id': vaga_id, 'candidate_ids': candidatos})
+        elif endpoint == 'top_k':
+            corpos.append({'vaga_id': vaga_id, 'k': 5})
+        else:
+            vagas = [str(v) for v in gerador.choice(ids_vagas, size=candidatos_por_requisicao)]
+            corpos.append({'pairs': [{'vaga_id': v, 'candidate_id': c} for v, c in zip(vagas, candidatos)]})
+    return corpos
+
+
+def executar_carga(url, endpoint, corpos, concorrencia):
+    locais = threading.local()
+    rota = '/' + endpoint
+
+    def _uma(corpo):
+        inicio = time.perf_counter()
+        try:
+            status, _ = _requisitar(url, locais, 'POST', rota, corpo)
+        except (http.client.HTTPException, OSError):
+            status = None
+        return time.perf_counter() - inicio, status
+
+    saude_antes = _requisitar(url, threading.local(), 'GET', '/saude')[1]
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+        resultados = list(executor.map(_uma, corpos))
+    duracao = time.perf_counter() - inicio
+    saude_depois = _requisitar(url, threading.local(), 'GET', '/saude')[1]
+
+    latencias = np.array([latencia for latencia, _ in resultados])
+    erros = sum(1 for _, status in resultados if status != 200)
+    chamadas = saude_depois['micro_lote']['chamadas'] - saude_antes['micro_lote']['chamadas']
+    return {
+        'requisicoes': len(corpos),
+        'erros': erros,
+        'duracao_s': duracao,
+        'requisicoes_por_s': len(corpos) / duracao,
+        'p50_ms': float(np.percentile(latencias, 50) * 1000),
+        'p90_ms': float(np.percentile(latencias, 90) * 1000),
+        'p99_ms': float(np.percentile(latencias, 99) * 1000),
+        'max_ms': float(latencias.max() * 1000),
+        'chamadas_predicao': chamadas,
+    }
+
+
+def main():
+    from recrutamento.carregamento import PATH_DATA, ler_dados_processados
+
+    parser = argparse.ArgumentParser(description="Teste de carga do serviço HTTP de scoring.")
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--endpoint', choices=ENDPOINTS, default='score')
+    parser.add_argument('--requisicoes', type=int, default=2000)
+    parser.add_argument('--concorrencia', type=int, default=16)
+    parser.add_argument('--candidatos-por-requisicao', type=int, default=20, help="Candidatos (ou pares) por requisição de score/score_pairs")
+    parser.add_argument('--dados', default=PATH_DATA, help="Pasta dos dados processados (de onde saem os ids)")
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    ids_vagas = ler_dados_processados(os.path.join(args.dados, 'vagas_processadas.csv'))['id_vaga'].to_numpy()
+    ids_candidatos = ler_dados_processados(os.path.join(args.dados, 'candidatos_processados.csv'))['id_candidato'].to_numpy()
+    corpos = gerar_corpos(ids_vagas, ids_candidatos, args.endpoint, args.requisicoes, args.candidatos_por_requisicao, args.semente)
+
+    # Aquece conexões e caches do serviço fora da medição
+    executar_carga(args.url, args.endpoint, corpos[:args.concorrencia], args.concorrencia)
+    resultado = executar_carga(args.url, args.endpoint, corpos, args.concorrencia)
+
+    print(f"{args.endpoint} | {resultado['requisicoes']} requisições, concorrência {args.concorrencia}, {resultado['erros']} erros")
+    print(f"vazão: {resultado['requisicoes_por_s']:,.1f} req/s em {resultado['duracao_s']:.2f}s")
+    print(f"latência (ms): p50 {resultado['p50_ms']:.1f} | p90 {resultado['p90_ms']:.1f} | p99 {resultado['p99_ms']:.1f} | máx {resultado['max_ms']:.1f}")
+    if args.endpoint != 'top_k':
+        print(f"chamadas de predição: {resultado['chamadas_predicao']} ({resultado['requisicoes'] / max(resultado['chamadas_predicao'], 1):.1f} requisições por chamada)")
+
+
+if __name__ == '__main__':
+    main()
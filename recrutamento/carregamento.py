@@ -0,0 +1,97 @@
+"""
+Leitura dos artefatos e dados processados fora do Streamlit (jobs, serviços e benchmarks).
+O app usa as mesmas funções por trás dos seus wrappers com cache.
+"""
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from recrutamento.colunar import (
+    COLUNAS_APP_CANDIDATOS, COLUNAS_APP_VAGAS, PREFIXOS_FLAGS, caminho_colunar, ler_colunar, tipar_para_colunar
+)
+
+PATH_DATA = 'data/'
+PATH_ARTIFACTS = 'artifacts/'
+
+# Colunas que o app lê de cada arquivo processado quando há versão colunar (.feather)
+COLUNAS_APP_POR_ARQUIVO = {
+    'vagas_processadas.csv': COLUNAS_APP_VAGAS,
+    'candidatos_processados.csv': COLUNAS_APP_CANDIDATOS,
+}
+
+
+def ler_csv_processado(caminho_completo, colunas_fixas=None):
+    """
+    Lê o CSV processado. Com colunas_fixas, lê só essas colunas mais as flags tech_*/skill_* (os
+    textos livres ficam no disco) e aplica os mesmos dtypes compactos do formato colunar.
+    """
+    if colunas_fixas is not None:
+        cabecalho = pd.read_csv(caminho_completo, nrows=0).columns
+        flags = [col for col in cabecalho if col.startswith(PREFIXOS_FLAGS)]
+        # Flags em float32 já no parse: o int64/float64 padrão dobraria o pico de memória da leitura
+        df = pd.read_csv(
+            caminho_completo,
+            usecols=[col for col in cabecalho if col in colunas_fixas or col in flags],
+            dtype={col: np.float32 for col in flags}
+        )
+        return tipar_para_colunar(df)
+    df = pd.read_csv(caminho_completo)
+    if 'id_vaga' in df.columns:
+        df['id_vaga'] = df['id_vaga'].astype(str)
+    if 'id_candidato' in df.columns:
+        df['id_candidato'] = df['id_candidato'].astype(str)
+    return df
+
+
+def usa_versao_colunar(caminho_csv):
+    # O .feather vale quando existe e não é mais antigo que o CSV
+    caminho_feather = caminho_colunar(caminho_csv)
+    return os.path.exists(caminho_feather) and (
+        not os.path.exists(caminho_csv) or os.path.getmtime(caminho_feather) >= os.path.getmtime(caminho_csv)
+    )
+
+
+def ler_dados_processados(caminho_csv):
+    """
+    Prefere o .feather ao lado do CSV (memory-map) quando ele existe e não é mais antigo que o CSV;
+    senão lê o CSV. Nos dois casos, só as colunas do app e com dtypes compactos.
+    """
+    colunas_app = COLUNAS_APP_POR_ARQUIVO.get(os.path.basename(caminho_csv))
+    if usa_versao_colunar(caminho_csv):
+        return ler_colunar(caminho_colunar(caminho_csv), colunas_app)
+    return ler_csv_processado(caminho_csv, colunas_app)
+
+
+def mapas_engenharia(artefatos_eng):
+    return {
+        'mapa_nivel_idioma': artefatos_eng.get('mapa_nivel_idioma', {}),
+        'mapa_nivel_academico_candidato': artefatos_eng.get('mapa_nivel_academico_candidato', {}),
+        'mapa_nivel_profissional_candidato': artefatos_eng.get('mapa_nivel_profissional_candidato', {})
+    }
+
+
+def carregar_tudo(path_data=PATH_DATA, path_artifacts=PATH_ARTIFACTS):
+    # Mesmos arquivos que o main() do app carrega
+    artefatos_eng = joblib.load(os.path.join(path_artifacts, 'artefatos_engenharia.joblib'))
+    return {
+        'modelo': joblib.load(os.path.join(path_artifacts, 'modelo_recrutamento_rf.joblib')),
+        'colunas_modelo': joblib.load(os.path.join(path_artifacts, 'colunas_modelo.joblib')),
+        'mapas': mapas_engenharia(artefatos_eng),
+        'df_vagas': ler_dados_processados(os.path.join(path_data, 'vagas_processadas.csv')),
+        'df_candidatos': ler_dados_processados(os.path.join(path_data, 'candidatos_processados.csv')),
+    }
+
+
+def arquivos_versao_scores(path_data=PATH_DATA, path_artifacts=PATH_ARTIFACTS):
+    # Qualquer mudança nestes arquivos muda os scores (e invalida caches/tabelas de scores)
+    return [
+        os.path.join(path_artifacts, 'modelo_recrutamento_rf.joblib'),
+        os.path.join(path_artifacts, 'colunas_modelo.joblib'),
+        os.path.join(path_artifacts, 'artefatos_engenharia.joblib'),
+        os.path.join(path_data, 'vagas_processadas.csv'),
+        os.path.join(path_data, 'candidatos_processados.csv'),
+        caminho_colunar(os.path.join(path_data, 'vagas_processadas.csv')),
+        caminho_colunar(os.path.join(path_data, 'candidatos_processados.csv')),
+    ]
@@ -0,0 +1,113 @@
+"""
+Codificador one-hot pré-compilado a partir de colunas_modelo.joblib: para cada feature categórica,
+o mapa valor -> índice da coluna one-hot no modelo. Faz o papel do pd.get_dummies + reindex a
+colunas_modelo da seção 8 do notebook: o índice da coluna ativa é consultado direto e escrito na
+linha (ou matriz) float32 pré-alocada.
+
+Equivalência com o get_dummies: a coluna f"{feature}_{str(valor)}" existe em colunas_modelo
+exatamente quando str(valor) está no mapa da feature; valores fora do modelo não ativam nenhuma
+coluna, como no reindex(fill_value=0). Valores ausentes valem CATEGORIA_AUSENTE ("Não Informado"),
+como no One-Hot Encoding do treino (features.texto_categorico).
+
+No treino, as colunas categóricas do candidato não colidem com as da vaga no merge e ficam sem o
+sufixo _candidato (nivel_academico_padronizado_Mestrado, ...): quando colunas_modelo não tem a
+feature com sufixo, vale o prefixo sem ele, e o mesmo para a coluna de origem na base de candidatos.
+"""
+import numpy as np
+import pandas as pd
+
+from recrutamento.features import CATEGORIA_AUSENTE, texto, texto_categorico, texto_categorico_valor
+
+# Feature categórica do modelo -> coluna de origem no DataFrame de vagas
+FEATURES_CATEGORICAS_VAGA = {
+    'nivel_profissional_vaga': 'nivel_profissional_vaga',
+    'nivel_academico_vaga': 'nivel_academico',
+    'modalidade_trabalho': 'modalidade_trabalho',
+    'categoria_vaga': 'categoria_vaga',
+    'vaga_sap': 'vaga_sap',
+}
+
+# Feature categórica do modelo -> coluna de origem no DataFrame de candidatos
+FEATURES_CATEGORICAS_CANDIDATO = {
+    'nivel_academico_padronizado_candidato': 'nivel_academico_padronizado',
+    'categoria_profissional_candidato': 'categoria_profissional',
+    'pcd_padronizado_candidato': 'pcd_padronizado',
+    'nivel_profissional_padronizado_candidato': 'nivel_profissional_padronizado_candidato',
+}
+
+SEM_COLUNA = -1
+SUFIXO_CANDIDATO = '_candidato'
+
+_codificadores = {}
+
+
+def coluna_texto(df, coluna, default="Não Informado"):
+    # Mesmo resultado de str(serie.get(coluna, default)) linha a linha (NaN vira 'nan')
+    if coluna not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    return texto(df[coluna])
+
+
+def sem_sufixo_candidato(nome):
+    return nome[:-len(SUFIXO_CANDIDATO)] if nome.endswith(SUFIXO_CANDIDATO) else nome
+
+
+def coluna_de_origem(colunas, coluna_origem):
+    # Base de candidatos gerada pelo notebook: nivel_profissional_padronizado, sem o sufixo
+    if coluna_origem not in colunas and sem_sufixo_candidato(coluna_origem) in colunas:
+        return sem_sufixo_candidato(coluna_origem)
+    return coluna_origem
+
+
+def _mapa_one_hot(indice_colunas, prefixo):
+    return {col[len(prefixo):]: i for col, i in indice_colunas.items() if col.startswith(prefixo)}
+
+
+def compilar_codificador(colunas_modelo):
+    indice_colunas = {col: i for i, col in enumerate(colunas_modelo)}
+    one_hot = {}
+    for feature in FEATURES_CATEGORICAS_VAGA:
+        one_hot[feature] = _mapa_one_hot(indice_colunas, feature + '_')
+    for feature in FEATURES_CATEGORICAS_CANDIDATO:
+        one_hot[feature] = _mapa_one_hot(indice_colunas, feature + '_') or _mapa_one_hot(indice_colunas, sem_sufixo_candidato(feature) + '_')
+    return {
+        'colunas_modelo': list(colunas_modelo),
+        'indice_colunas': indice_colunas,
+        'one_hot': one_hot,
+    }
+
+
+def codificador_para_colunas(colunas_modelo):
+    # Compilado uma vez por lista de colunas (por processo, inclusive nos workers de scoring)
+    chave = tuple(colunas_modelo)
+    codificador = _codificadores.get(chave)
+    if codificador is None:
+        codificador = _codificadores[chave] = compilar_codificador(colunas_modelo)
+    return codificador
+
+
+def posicao_one_hot(codificador, feature, valor):
+    return codificador['one_hot'][feature].get(texto_categorico_valor(valor), SEM_COLUNA)
+
+
+def posicoes_one_hot(codificador, feature, df, coluna_origem, default="Não Informado"):
+    """
+    Índice da coluna one-hot ativa de cada linha de df (SEM_COLUNA se nenhuma), consultando o mapa
+    uma vez por valor distinto em vez de montar o nome da dummy linha a linha.
+    """
+    mapa = codificador['one_hot'][feature]
+    coluna_origem = coluna_de_origem(df.columns, coluna_origem)
+    if coluna_origem not in df.columns:
+        return np.full(len(df), mapa.get(str(default), SEM_COLUNA), dtype=np.int64)
+    serie = df[coluna_origem]
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        # Código -1 (ausente) cai na última posição da tabela, a de CATEGORIA_AUSENTE
+        tabela = np.array([mapa.get(str(valor), SEM_COLUNA) for valor in serie.cat.categories] + [mapa.get(CATEGORIA_AUSENTE, SEM_COLUNA)], dtype=np.int64)
+        return tabela[serie.cat.codes.to_numpy()]
+    if pd.api.types.infer_dtype(serie, skipna=True) not in ('string', 'empty'):
+        # Tipos misturados (1 e 1.0 são iguais no factorize, mas str() difere): nome por linha
+        return np.array([mapa.get(valor, SEM_COLUNA) for valor in texto_categorico(serie)], dtype=np.int64)
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+    # Código -1 (ausente) cai na última posição da tabela, a de CATEGORIA_AUSENTE
+    tabela = np.array([mapa.get(str(valor), SEM_COLUNA) for valor in unicos] + [mapa.get(CATEGORIA_AUSENTE, SEM_COLUNA)], dtype=np.int64)
+    return tabela[codigos]
@@ -0,0 +1,178 @@
+"""
+Armazenamento colunar (Arrow IPC / Feather, sem compressão) dos DataFrames processados de vagas e
+candidatos, com dtypes explícitos: ids como texto, flags tech_*/skill_* em uint8 e colunas
+categóricas como category. O arquivo é lido por memory-map e só com as colunas que o app usa,
+sem reparsear texto nem inferir dtypes das centenas de colunas de flags.
+
+Converter os CSVs já existentes e comparar com a leitura do CSV:
+    python -m recrutamento.colunar converter
+    python -m recrutamento.colunar benchmark
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+EXTENSAO_COLUNAR = '.feather'
+
+COLUNAS_ID = ('id_vaga', 'id_candidato')
+PREFIXOS_FLAGS = ('tech_', 'skill_')
+
+# Colunas de baixa cardinalidade guardadas como category
+COLUNAS_CATEGORICAS = (
+    'categoria_vaga', 'modalidade_trabalho', 'nivel_profissional_vaga', 'nivel_academico',
+    'nivel_ingles', 'nivel_espanhol', 'vaga_sap', 'cliente',
+    'nivel_academico_padronizado', 'categoria_profissional', 'pcd_padronizado',
+    'nivel_profissional_padronizado', 'nivel_profissional_padronizado_candidato',
+    'categoria_profissional_candidato',
+)
+
+# Colunas lidas pelo app (exibição, pré-filtros e features do modelo), além das flags
+COLUNAS_APP_VAGAS = (
+    'id_vaga', 'titulo_vaga', 'cliente', 'categoria_vaga', 'modalidade_trabalho', 'nivel_profissional_vaga',
+    'nivel_ingles', 'nivel_espanhol', 'vaga_sap', 'nivel_academico',
+)
+COLUNAS_APP_CANDIDATOS = (
+    'id_candidato', 'nome', 'titulo_profissional', 'nivel_ingles', 'nivel_espanhol',
+    'nivel_academico_padronizado', 'categoria_profissional', 'pcd_padronizado', 'nivel_profissional_padronizado',
+    'nivel_profissional_padronizado_candidato', 'categoria_profissional_candidato',
+)
+
+
+def caminho_colunar(caminho_csv):
+    return os.path.splitext(caminho_csv)[0] + EXTENSAO_COLUNAR
+
+
+def _flag_cabe_em_uint8(valores):
+    numericos = pd.to_numeric(valores, errors='coerce').fillna(0)
+    return bool(((numericos >= 0) & (numericos <= 255) & (numericos == np.floor(numericos))).all()), numericos
+
+
+def tipar_para_colunar(df):
+    """Cópia do DataFrame com os dtypes explícitos do formato colunar."""
+    df_tipado = df.reset_index(drop=True).copy()
+    for col in df_tipado.columns:
+        if col in COLUNAS_ID:
+            df_tipado[col] = df_tipado[col].astype(str)
+        elif col.startswith(PREFIXOS_FLAGS):
+            # NaN vira 0, como em coluna_numerica / safe_to_numeric_scalar; valores fora de 0..255 ficam em float32
+            cabe, numericos = _flag_cabe_em_uint8(df_tipado[col])
+            df_tipado[col] = numericos.astype(np.uint8 if cabe else np.float32)
+        elif col in COLUNAS_CATEGORICAS:
+            df_tipado[col] = df_tipado[col].astype('category')
+    return df_tipado
+
+
+def salvar_colunar(df, caminho):
+    # Sem compressão para que a leitura possa mapear o arquivo direto da página de cache do SO
+    tipar_para_colunar(df).to_feather(caminho, compression='uncompressed')
+    return caminho
+
+
+def colunas_do_arquivo(caminho):
+    import pyarrow.ipc
+
+    with pyarrow.memory_map(caminho, 'r') as fonte:
+        return pyarrow.ipc.open_file(fonte).schema.names
+
+
+def colunas_necessarias(nomes_disponiveis, colunas_fixas):
+    return [col for col in nomes_disponiveis if col in colunas_fixas or col.startswith(PREFIXOS_FLAGS)]
+
+
+def ler_colunar(caminho, colunas_fixas=None):
+    """
+    Lê o arquivo Feather por memory-map. Com colunas_fixas, carrega só essas colunas mais as flags
+    tech_*/skill_* (textos longos, como os campos para NLP, ficam no disco).
+    """
+    import pyarrow.feather
+
+    colunas = None
+    if colunas_fixas is not None:
+        colunas = colunas_necessarias(colunas_do_arquivo(caminho), colunas_fixas)
+    tabela = pyarrow.feather.read_table(caminho, columns=colunas, memory_map=True)
+    df = tabela.to_pandas(split_blocks=True)
+    for col in COLUNAS_ID:
+        if col in df.columns:
+            df[col] = df[col].astype(str)
+    return df
+
+
+def converter_csvs(path_data, nomes_csv=('vagas_processadas.csv', 'candidatos_processados.csv')):
+    from recrutamento.carregamento import ler_csv_processado
+
+    for nome_csv in nomes_csv:
+        caminho_csv = os.path.join(path_data, nome_csv)
+        inicio = time.perf_counter()
+        salvar_colunar(ler_csv_processado(caminho_csv), caminho_colunar(caminho_csv))
+        print(f"{caminho_csv} -> {caminho_colunar(caminho_csv)} ({time.perf_counter() - inicio:.1f}s)")
+
+
+def _medir_leitura(formato, caminho, colunas_fixas):
+    # Roda num processo novo: mede leitura a frio do processo (sem caches do Python) e o pico de RSS
+    import resource
+
+    from recrutamento.carregamento import ler_csv_processado
+
+    rss_antes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    inicio = time.perf_counter()
+    if formato == 'csv':
+        df = ler_csv_processado(caminho)
+    else:
+        df = ler_colunar(caminho, colunas_fixas)
+    segundos = time.perf_counter() - inicio
+    rss_depois = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({
+        'segundos': segundos,
+        'pico_rss_mb': (rss_depois - rss_antes) / 1024,
+        'memoria_df_mb': df.memory_usage(deep=True).sum() / 2 ** 20,
+        'colunas': len(df.columns),
+    }))
+
+
+def benchmark_leitura(path_data):
+    arquivos = (('vagas_processadas.csv', COLUNAS_APP_VAGAS), ('candidatos_processados.csv', COLUNAS_APP_CANDIDATOS))
+    print(f"{'arquivo':<28}{'formato':<16}{'tempo (s)':>10}{'pico RSS (MB)':>15}{'DataFrame (MB)':>16}{'colunas':>9}")
+    for nome_csv, colunas_app in arquivos:
+        caminho_csv = os.path.join(path_data, nome_csv)
+        variantes = [('csv', caminho_csv, None)]
+        if os.path.exists(caminho_colunar(caminho_csv)):
+            variantes += [('feather', caminho_colunar(caminho_csv), None), ('feather-app', caminho_colunar(caminho_csv), colunas_app)]
+        for formato, caminho, colunas_fixas in variantes:
+            saida = subprocess.run(
+                [sys.executable, '-m', 'recrutamento.colunar', '_medir', formato, caminho, json.dumps(colunas_fixas)],
+                capture_output=True, text=True, check=True
+            )
+            medida = json.loads(saida.stdout.strip().splitlines()[-1])
+            print(f"{nome_csv:<28}{formato:<16}{medida['segundos']:>10.2f}{medida['pico_rss_mb']:>15.1f}{medida['memoria_df_mb']:>16.1f}{medida['colunas']:>9}")
+
+
+def main():
+    from recrutamento.carregamento import PATH_DATA
+
+    parser = argparse.ArgumentParser(description="Armazenamento colunar (Feather) dos dados processados.")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+    for nome, ajuda in (('converter', "Gera os .feather a partir dos CSVs processados"), ('benchmark', "Compara a leitura CSV x Feather")):
+        sub = subcomandos.add_parser(nome, help=ajuda)
+        sub.add_argument('--dados', default=PATH_DATA)
+    medir = subcomandos.add_parser('_medir')
+    medir.add_argument('formato')
+    medir.add_argument('caminho')
+    medir.add_argument('colunas_fixas')
+    args = parser.parse_args()
+
+    if args.comando == 'converter':
+        converter_csvs(args.dados)
+    elif args.comando == 'benchmark':
+        benchmark_leitura(args.dados)
+    else:
+        _medir_leitura(args.formato, args.caminho, json.loads(args.colunas_fixas))
+
+
+if __name__ == '__main__':
+    main()
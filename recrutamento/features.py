@@ -0,0 +1,292 @@
+"""
+Engenharia de features compartilhada entre o treino (notebook/desenvolvimento do modelo.py) e o
+app/scoring: as regras de texto das tabelas processadas de vagas e candidatos e as features de
+compatibilidade vaga x candidato (seção 7 do notebook), numa única implementação.
+
+As funções recebem Series inteiras. Cada regra de texto roda uma vez por valor distinto (níveis,
+PCD, títulos e idiomas se repetem muito) e o resultado volta às linhas pelo código do factorize;
+as versões escalares (nivel_idioma, vaga_sap_do_texto, ...) são as mesmas regras para um único
+valor, usadas no scoring de uma vaga.
+
+Paridade entre as features de treino e as do app: python -m recrutamento.paridade_features
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+MAPA_NIVEL_IDIOMA = { "não informado": 0, "nenhum": 0, "básico": 1, "técnico": 2, "intermediário": 2, "avançado": 3, "fluente": 4, "nativo": 5 }
+
+MAPA_NIVEL_ACADEMICO_CANDIDATO = {
+    'ensino fundamental': 'Ensino Fundamental', 'médio': 'Ensino Médio', '2º grau': 'Ensino Médio', 'segundo grau': 'Ensino Médio',
+    'técnico': 'Ensino Técnico', 'profissionalizante': 'Ensino Técnico',
+    'superior incompleto': 'Superior Incompleto', 'cursando superior': 'Superior Incompleto', 'graduação em curso': 'Superior Incompleto', 'superior cursando': 'Superior Incompleto',
+    'superior completo': 'Superior Completo', 'graduação': 'Superior Completo', 'bacharelado': 'Superior Completo', 'tecnólogo': 'Superior Completo',
+    'pós-graduação - especialização': 'Pós-graduação', 'pós-graduação': 'Pós-graduação', 'especialização': 'Pós-graduação', 'pós graduação completo': 'Pós-graduação', 'pós graduação cursando':'Pós-graduação', 'pós graduação incompleto':'Pós-graduação',
+    'mba': 'MBA', 'mestrado': 'Mestrado', 'mestrado completo':'Mestrado', 'mestrado incompleto':'Mestrado', 'mestrado cursando':'Mestrado',
+    'doutorado': 'Doutorado', 'phd': 'Doutorado', 'doutorado completo':'Doutorado', 'doutorado incompleto':'Doutorado', 'doutorado cursando':'Doutorado'
+}
+
+MAPA_NIVEL_PROFISSIONAL_CANDIDATO = {
+    'estagiário': 'Estagiário/Trainee', 'estágio': 'Estagiário/Trainee', 'trainee': 'Estagiário/Trainee',
+    'júnior': 'Júnior', 'jr': 'Júnior',
+    'pleno': 'Pleno', 'pl': 'Pleno',
+    'sênior': 'Sênior', 'sr': 'Sênior', 'senior': 'Sênior',
+    'especialista': 'Especialista',
+    'coordenador': 'Liderança/Coordenação', 'supervisor': 'Liderança/Coordenação', 'líder': 'Liderança/Coordenação', 'lider': 'Liderança/Coordenação',
+    'gerente': 'Gerência/Diretoria', 'diretor': 'Gerência/Diretoria', 'head': 'Gerência/Diretoria', 'gestor': 'Gerência/Diretoria'
+}
+
+
+#  Categorias de título (vaga e candidato)
+# Regras em ordem de prioridade, a primeira que casa define a categoria: (categoria, alternativas).
+# Uma alternativa casa quando cada grupo dela tem ao menos uma palavra contida no título em minúsculas.
+TITULO_NAO_INFORMADO = "não informado"
+CATEGORIA_TITULO_PADRAO = "Outros/Não Especificado"
+
+REGRA_CONSULTORIA_SAP = ("Consultoria SAP", [
+    [["consultor sap", "consultora sap"]],
+    [["sap"], ["consultant", "especialista", "consultor(a)"]],
+])
+PALAVRAS_ANALISTA = ["analista", "analyst", "especialista", "specialist"]
+
+REGRAS_TITULO_VAGA = [
+    REGRA_CONSULTORIA_SAP,
+    ("Arquitetura SAP", [[["arquiteto sap", "architect sap"]]]),
+    ("Liderança Técnica & Arquitetura", [[["architect", "arquiteto", "tech lead", "líder técnico", "lider técnico"]]]),
+    ("Desenvolvimento de Software", [[["desenvolvedor", "developer", "programador", "software engineer", "dev", "desenvolvimento", "development", "fullstack", "frontend", "backend", "mobile", "abap"]]]),
+    ("Dados & BI", [[["dados", "data", "bi", "business intelligence", "analytics", "cientista", "scientist", "engenheiro de dados", "data engineer", "analista de dados"]]]),
+    ("Infra, Cloud & DevOps", [[["infraestrutura", "infrastructure", "cloud", "aws", "azure", "gcp", "devops", "sysadmin", "rede", "network", "segurança", "security", "sre"]]]),
+    ("Gestão de Projetos & Produtos", [[["gerente de projetos", "project manager", "pm", "gpm", "product owner", "po", "product manager", "coordenador de projetos", "project coordinator", "scrum master", "agile coach"]]]),
+    ("Qualidade & Testes", [[["qa", "quality assurance", "testes", "tester", "analista de testes", "automação de testes"]]]),
+    ("Suporte & Operações", [[["suporte", "support", "analista de suporte", "service desk", "operações", "operations", "sustentação"]]]),
+    ("Design (UX/UI)", [[["design", "designer", "ux", "ui", "product designer"]]]),
+    # Analistas: sub-ramos por área, senão genérico (nunca chegam à liderança não técnica)
+    ("Funcional & Negócios", [[PALAVRAS_ANALISTA, ["negócios", "business"]]]),
+    ("Análise de Sistemas", [[PALAVRAS_ANALISTA, ["sistemas", "systems"]]]),
+    ("Análise de Processos", [[PALAVRAS_ANALISTA, ["processos"]]]),
+    ("Análise de Requisitos", [[PALAVRAS_ANALISTA, ["requisitos"]]]),
+    ("Financeiro & Contábil", [[PALAVRAS_ANALISTA, ["financeiro", "contábil", "fiscal"]]]),
+    ("Analista (Genérico)", [[PALAVRAS_ANALISTA]]),
+    ("Liderança & Coordenação (Não Técnica)", [[["líder de equipe", "team lead", "coordenador", "supervisor", "gerente", "manager"]]]),
+]
+
+REGRAS_TITULO_CANDIDATO = [REGRA_CONSULTORIA_SAP]
+
+
+#  Aplicação por valor distinto
+def texto(serie):
+    # str(valor) de cada linha, como no .apply das regras (NaN vira 'nan'); category vira object antes
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        serie = serie.astype(object)
+    if isinstance(serie.dtype, pd.StringDtype):
+        # Só str ou ausente: str(valor) é o próprio valor, sem passar linha a linha pelo Python
+        return serie.fillna('nan')
+    return serie.map(str)
+
+
+def aplicar_por_valor(serie, funcao, dtype=object):
+    """funcao(str(valor)) uma vez por valor distinto de serie, devolvida alinhada às linhas."""
+    codigos, unicos = pd.factorize(texto(serie))
+    resultados = np.array([funcao(valor) for valor in unicos], dtype=dtype)
+    return pd.Series(resultados[codigos], index=serie.index, dtype=dtype)
+
+
+#  Regras escalares (um valor)
+def modalidade_do_texto(texto_obs):
+    texto_lower = str(texto_obs).lower()
+    if re.search(r"100% remoto|totalmente remoto|home office|trabalho remoto|remoto", texto_lower):
+        if re.search(r"h[íi]brido", texto_lower): return "Híbrido"
+        return "Remoto"
+    elif re.search(r"h[íi]brido", texto_lower): return "Híbrido"
+    elif re.search(r"presencial|no escrit[óo]rio|na planta|loca[çl][ãa]o", texto_lower) and not re.search(r"remoto|h[íi]brido", texto_lower): return "Presencial"
+    return "Não Informado"
+
+
+def vaga_sap_do_texto(valor):
+    return 1 if str(valor).lower() == "sim" else 0
+
+
+def nivel_idioma(nivel, mapa_nivel_idioma=MAPA_NIVEL_IDIOMA):
+    return mapa_nivel_idioma.get(str(nivel).lower(), 0)
+
+
+def categoria_titulo(titulo, regras_titulo):
+    titulo_lower = str(titulo).lower()
+    if titulo_lower == TITULO_NAO_INFORMADO: return CATEGORIA_TITULO_PADRAO
+    for categoria, alternativas in regras_titulo:
+        if any(all(any(palavra in titulo_lower for palavra in grupo) for grupo in alternativa) for alternativa in alternativas):
+            return categoria
+    return CATEGORIA_TITULO_PADRAO
+
+
+def nivel_academico_do_texto(nivel, mapa_nivel_academico=MAPA_NIVEL_ACADEMICO_CANDIDATO):
+    nivel_str = str(nivel).lower()
+    if nivel_str == "não informado": return "Não Informado"
+    for key, value in mapa_nivel_academico.items():
+        if key in nivel_str: return value
+    return "Outros/Não Especificado"
+
+
+def nivel_profissional_do_texto(nivel, mapa_nivel_profissional=MAPA_NIVEL_PROFISSIONAL_CANDIDATO):
+    nivel_str = str(nivel).lower()
+    if nivel_str == "não informado": return "Não Informado"
+    for key, value in mapa_nivel_profissional.items():
+        if key in nivel_str: return value
+    if 'analista' in nivel_str and not any(k in nivel_str for k in ['júnior', 'pleno', 'sênior', 'jr', 'pl', 'sr', 'junior', 'senior']):
+        return "Analista (Nível não especificado)"
+    return "Outros/Não Especificado"
+
+
+def pcd_do_texto(valor_pcd):
+    valor_lower = str(valor_pcd).lower().strip()
+    if valor_lower in ["sim", "s", "yes", "y", "1", "true"]: return "Sim"
+    if valor_lower in ["não", "nao", "n", "no", "0", "false"]: return "Não"
+    return "Não Informado"
+
+
+#  Colunas das tabelas processadas (Series inteiras)
+def extrair_modalidade(serie):
+    return aplicar_por_valor(serie, modalidade_do_texto)
+
+
+def marcar_vaga_sap(serie):
+    return aplicar_por_valor(serie, vaga_sap_do_texto, dtype=np.int64)
+
+
+def codificar_idioma(serie, mapa_nivel_idioma=MAPA_NIVEL_IDIOMA):
+    return aplicar_por_valor(serie, lambda nivel: nivel_idioma(nivel, mapa_nivel_idioma), dtype=np.int64)
+
+
+def categorizar_titulos(serie, regras_titulo):
+    """
+    categoria_titulo(valor, regras_titulo) para a Series inteira: cada grupo de palavras vira uma
+    alternância regex testada de uma vez nos títulos distintos, e as regras marcam, na ordem, os
+    títulos que ainda não têm categoria.
+    """
+    codigos, unicos = pd.factorize(texto(serie))
+    # lower() do Python (o mesmo das regras escalares); o dtype str usa o contains do pyarrow quando disponível
+    titulos = pd.Series([titulo.lower() for titulo in unicos], dtype='str')
+    categorias = np.full(len(titulos), CATEGORIA_TITULO_PADRAO, dtype=object)
+    pendentes = (titulos != TITULO_NAO_INFORMADO).to_numpy(dtype=bool, copy=True)
+    contem_grupo = {}
+    for categoria, alternativas in regras_titulo:
+        casa = np.zeros(len(titulos), dtype=bool)
+        for alternativa in alternativas:
+            casa_alternativa = pendentes.copy()
+            for grupo in alternativa:
+                chave = tuple(grupo)
+                if chave not in contem_grupo:
+                    # Alternância de literais sem flags: o mesmo que any(palavra in titulo)
+                    contem_grupo[chave] = titulos.str.contains('|'.join(map(re.escape, grupo)), regex=True).to_numpy(dtype=bool)
+                casa_alternativa &= contem_grupo[chave]
+            casa |= casa_alternativa
+        categorias[casa] = categoria
+        pendentes &= ~casa
+    return pd.Series(categorias[codigos], index=serie.index, dtype=object)
+
+
+def generalizar_titulo_vaga(serie):
+    return categorizar_titulos(serie, REGRAS_TITULO_VAGA)
+
+
+def generalizar_titulo_profissional_candidato(serie):
+    return categorizar_titulos(serie, REGRAS_TITULO_CANDIDATO)
+
+
+def padronizar_nivel_academico_candidato(serie, mapa_nivel_academico=MAPA_NIVEL_ACADEMICO_CANDIDATO):
+    return aplicar_por_valor(serie, lambda nivel: nivel_academico_do_texto(nivel, mapa_nivel_academico))
+
+
+def padronizar_nivel_profissional_candidato(serie, mapa_nivel_profissional=MAPA_NIVEL_PROFISSIONAL_CANDIDATO):
+    return aplicar_por_valor(serie, lambda nivel: nivel_profissional_do_texto(nivel, mapa_nivel_profissional))
+
+
+def limpar_pcd_candidato(serie):
+    return aplicar_por_valor(serie, pcd_do_texto)
+
+
+#  Compatibilidade vaga x candidato (seção 7 do notebook)
+def nome_base_tech(coluna):
+    return coluna.replace('tech_', '').strip('_')
+
+
+def nome_base_skill(coluna):
+    return coluna.replace('skill_', '').strip('_')
+
+
+def pares_tech_skill(colunas_tech, colunas_skill):
+    """(tech_*, skill_*) com o mesmo nome base; skills com nome base repetido: vale a última."""
+    skill_por_nome_base = {nome_base_skill(col): col for col in colunas_skill}
+    return [(col, skill_por_nome_base[nome_base_tech(col)]) for col in colunas_tech if nome_base_tech(col) in skill_por_nome_base]
+
+
+def compatibilidade_idioma(nivel_candidato, nivel_vaga):
+    # 1 se o nível do candidato atende o da vaga (níveis já ordinais, ausentes como 0)
+    return (np.asarray(nivel_candidato) >= np.asarray(nivel_vaga)).astype(int)
+
+
+def contar_total_techs(df, colunas_tech):
+    if not colunas_tech:
+        return pd.Series(0, index=df.index)
+    return df[colunas_tech].apply(pd.to_numeric, errors='coerce').fillna(0).sum(axis=1)
+
+
+def contar_skills_match(df, colunas_tech, colunas_skill):
+    """Techs da vaga que o candidato também tem: soma de tech * skill (inteiros) nos pares de mesmo nome base."""
+    pares = pares_tech_skill(colunas_tech, colunas_skill)
+    contagem = np.zeros(len(df), dtype=np.int64)
+    for col_tech, col_skill in pares:
+        tech = pd.to_numeric(df[col_tech], errors='coerce').fillna(0).to_numpy().astype(int)
+        skill = pd.to_numeric(df[col_skill], errors='coerce').fillna(0).to_numpy().astype(int)
+        contagem += skill * tech
+    return pd.Series(contagem, index=df.index)
+
+
+def contar_skills_faltantes(total_techs_vaga, skills_match_count):
+    return (total_techs_vaga - skills_match_count).clip(lower=0)
+
+
+#  Colunas categóricas da tabela de modelagem (seção 8 do notebook)
+# Nome base -> sufixos tentados, na ordem, depois dos merges prospecções x vagas x candidatos
+SUFIXOS_MODELAGEM_VAGA = ['_vaga', '_vaga_merged', '']
+SUFIXOS_MODELAGEM_CANDIDATO = ['_candidato', '']
+CATEGORICAS_MODELAGEM_VAGA = ['nivel_profissional_vaga', 'nivel_academico', 'modalidade_trabalho', 'categoria_vaga', 'vaga_sap']
+CATEGORICAS_MODELAGEM_CANDIDATO = ['nivel_academico_padronizado', 'categoria_profissional', 'pcd_padronizado', 'nivel_profissional_padronizado']
+
+
+def nome_coluna_modelagem(df, nome_base, sufixos):
+    for sufixo in sufixos:
+        if nome_base + sufixo in df.columns:
+            return nome_base + sufixo
+    return None
+
+
+def eh_coluna_texto(serie):
+    # object (pandas < 3) ou o dtype str do pandas 3, em que colunas de texto deixam de ser object
+    return pd.api.types.is_object_dtype(serie.dtype) or pd.api.types.is_string_dtype(serie.dtype)
+
+
+def colunas_categoricas_modelagem(df):
+    """Colunas de texto da vaga e do candidato que entram no One-Hot Encoding, na ordem da seção 8."""
+    colunas = []
+    for nomes_base, sufixos in ((CATEGORICAS_MODELAGEM_VAGA, SUFIXOS_MODELAGEM_VAGA), (CATEGORICAS_MODELAGEM_CANDIDATO, SUFIXOS_MODELAGEM_CANDIDATO)):
+        for nome_base in nomes_base:
+            coluna = nome_coluna_modelagem(df, nome_base, sufixos)
+            if coluna and eh_coluna_texto(df[coluna]):
+                colunas.append(coluna)
+    return colunas
+
+
+# Valor das categóricas ausentes no One-Hot Encoding (treino e app)
+CATEGORIA_AUSENTE = "Não Informado"
+
+
+def texto_categorico_valor(valor):
+    # str(valor), com o ausente (None, NaN, pd.NA) em CATEGORIA_AUSENTE
+    return CATEGORIA_AUSENTE if pd.api.types.is_scalar(valor) and pd.isna(valor) else str(valor)
+
+
+def texto_categorico(serie):
+    """Valores de uma categórica como entram no One-Hot Encoding da seção 8 e no codificador do app."""
+    return texto(serie).mask(serie.isna().to_numpy(), CATEGORIA_AUSENTE)
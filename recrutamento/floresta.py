@@ -0,0 +1,212 @@
+"""
+Inferência da RandomForest em NumPy puro: as árvores do modelo treinado viram arrays planos e
+contíguos de nós (feature, limiar, filho esquerdo, filho direito, probabilidade da folha) e todas
+as árvores são percorridas juntas, nível a nível, sobre o lote inteiro. Evita o overhead por
+chamada do predict_proba do sklearn (validação do DataFrame, despacho por árvore), que domina em
+lotes pequenos. Em lotes grandes o código C do sklearn volta a ser mais rápido, então o scoring
+usa a floresta compilada só até LIMITE_LINHAS_FLORESTA_NUMPY linhas por bloco.
+
+As probabilidades são idênticas às do sklearn: mesma comparação (X em float32 <= limiar em
+float64), mesma normalização das folhas e mesma ordem de soma das árvores.
+
+A floresta compilada é gravada sem compressão ao lado do modelo e lida com memory-map: cada
+processo do Streamlit abre o mesmo arquivo e compartilha as páginas do cache do SO, e a busca já
+responde antes de o modelo sklearn (usado só nos lotes grandes) terminar de carregar.
+
+Benchmark contra o sklearn:
+    python -m recrutamento.floresta --tamanhos 1 100 10000 1000000
+"""
+import argparse
+import os
+import time
+
+import joblib
+
+import numpy as np
+import pandas as pd
+
+# Pares (linha, árvore) percorridos por vez; limita a memória dos arrays de travessia
+ELEMENTOS_POR_BLOCO = 1 << 20
+# Coluna de predict_proba usada como score de match (mesma de modelo.predict_proba(X)[:, 1])
+COLUNA_CLASSE_POSITIVA = 1
+# Até este tamanho de bloco a travessia em NumPy vence o predict_proba; acima dele o código C do
+# sklearn é mais rápido por linha e o overhead fixo por chamada deixa de pesar
+LIMITE_LINHAS_FLORESTA_NUMPY = 512
+
+ARQUIVO_FLORESTA_COMPILADA = 'floresta_compilada.joblib'
+
+
+def compilar_floresta(modelo, coluna_classe=COLUNA_CLASSE_POSITIVA):
+    """
+    Converte uma RandomForestClassifier treinada (sklearn) na floresta compilada (dict de arrays).
+    O modelo original fica em 'modelo' para os lotes grandes. Levanta ValueError se o modelo não
+    tiver a estrutura esperada.
+    """
+    arvores = getattr(modelo, 'estimators_', None)
+    if not arvores or getattr(modelo, 'n_outputs_', 1) != 1:
+        raise ValueError("Modelo sem estimators_ de árvore de saída única; não é possível compilar.")
+
+    esquerda, direita, feature, limiar, valor_folha, folha, raizes = [], [], [], [], [], [], []
+    deslocamento = 0
+    for arvore in arvores:
+        estrutura = arvore.tree_
+        n_nos = estrutura.node_count
+        eh_folha = estrutura.children_left == -1
+        nos = np.arange(n_nos)
+
+        # Folhas apontam para si mesmas; nunca são visitadas de novo na travessia
+        esquerda.append(np.where(eh_folha, nos, estrutura.children_left) + deslocamento)
+        direita.append(np.where(eh_folha, nos, estrutura.children_right) + deslocamento)
+        feature.append(np.where(eh_folha, 0, estrutura.feature))
+        limiar.append(np.where(eh_folha, np.inf, estrutura.threshold))
+
+        # Mesma normalização de DecisionTreeClassifier.predict_proba
+        valores = estrutura.value[:, 0, :arvore.n_classes_].astype(np.float64)
+        normalizador = valores.sum(axis=1)
+        normalizador[normalizador == 0.0] = 1.0
+        valor_folha.append((valores / normalizador[:, np.newaxis])[:, coluna_classe])
+
+        folha.append(eh_folha)
+        raizes.append(deslocamento)
+        deslocamento += n_nos
+
+    return {
+        'esquerda': np.ascontiguousarray(np.concatenate(esquerda), dtype=np.int64),
+        'direita': np.ascontiguousarray(np.concatenate(direita), dtype=np.int64),
+        'feature': np.ascontiguousarray(np.concatenate(feature), dtype=np.int64),
+        'limiar': np.ascontiguousarray(np.concatenate(limiar), dtype=np.float64),
+        'valor_folha': np.ascontiguousarray(np.concatenate(valor_folha), dtype=np.float64),
+        'folha': np.concatenate(folha),
+        'raizes': np.array(raizes, dtype=np.int64),
+        'n_features': int(getattr(modelo, 'n_features_in_', 0)),
+        'modelo': modelo,
+    }
+
+
+def caminho_floresta_compilada(caminho_modelo):
+    return os.path.join(os.path.dirname(caminho_modelo), ARQUIVO_FLORESTA_COMPILADA)
+
+
+def salvar_floresta_compilada(floresta, caminho, carimbo_modelo):
+    # Só os arrays (sem o estimador sklearn), crus: joblib só mapeia em memória arrays sem compressão
+    conteudo = {chave: valor for chave, valor in floresta.items() if chave != 'modelo'}
+    conteudo['carimbo_modelo'] = carimbo_modelo
+    caminho_temporario = f"{caminho}.{os.getpid()}.tmp"
+    joblib.dump(conteudo, caminho_temporario)
+    # Troca atômica: outro processo nunca lê um arquivo pela metade
+    os.replace(caminho_temporario, caminho)
+    return caminho
+
+
+def carregar_floresta_compilada(caminho, carimbo_modelo):
+    """
+    Abre a floresta gravada por salvar_floresta_compilada com memory-map. Retorna None se o arquivo
+    não existir ou tiver sido gerado de outro modelo. 'modelo' fica None até anexar_modelo_sklearn.
+    """
+    if not os.path.exists(caminho):
+        return None
+    floresta = joblib.load(caminho, mmap_mode='r')
+    if floresta.pop('carimbo_modelo', None) != carimbo_modelo:
+        return None
+    floresta['modelo'] = None
+    return floresta
+
+
+def anexar_modelo_sklearn(floresta, modelo):
+    # Até aqui os blocos grandes também passam pela travessia em NumPy (mesmo resultado, mais lento)
+    floresta['modelo'] = modelo
+    return floresta
+
+
+def eh_floresta_compilada(modelo):
+    return isinstance(modelo, dict) and 'valor_folha' in modelo
+
+
+def modelo_sklearn(modelo):
+    # O estimador sklearn por trás de um modelo que pode estar compilado (None se ainda não anexado)
+    return modelo['modelo'] if eh_floresta_compilada(modelo) else modelo
+
+
+def prever_probabilidades_floresta(floresta, X, elementos_por_bloco=ELEMENTOS_POR_BLOCO):
+    """Probabilidade da classe positiva para cada linha de X (array n x n_features)."""
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    n_linhas, n_features = X.shape
+    raizes = floresta['raizes']
+    n_arvores = len(raizes)
+    esquerda, direita = floresta['esquerda'], floresta['direita']
+    feature, limiar, folha = floresta['feature'], floresta['limiar'], floresta['folha']
+
+    probabilidades = np.empty(n_linhas, dtype=np.float64)
+    linhas_por_bloco = max(1, elementos_por_bloco // n_arvores)
+    for inicio in range(0, n_linhas, linhas_por_bloco):
+        X_bloco = X[inicio:inicio + linhas_por_bloco]
+        valores_planos = X_bloco.ravel()
+        n_bloco = len(X_bloco)
+
+        # Um elemento por par (linha, árvore); só os que ainda não chegaram à folha seguem descendo
+        nos = np.tile(raizes, n_bloco)
+        deslocamento_linha = np.repeat(np.arange(n_bloco, dtype=np.int64) * n_features, n_arvores)
+        ativos = np.flatnonzero(~folha[nos])
+        while ativos.size:
+            nos_ativos = nos[ativos]
+            vai_para_esquerda = valores_planos[deslocamento_linha[ativos] + feature[nos_ativos]] <= limiar[nos_ativos]
+            proximos = np.where(vai_para_esquerda, esquerda[nos_ativos], direita[nos_ativos])
+            nos[ativos] = proximos
+            ativos = ativos[~folha[proximos]]
+
+        # Soma árvore a árvore, na mesma ordem do sklearn, para o resultado bater bit a bit
+        valores_folhas = floresta['valor_folha'][nos].reshape(n_bloco, n_arvores)
+        soma = np.zeros(n_bloco, dtype=np.float64)
+        for t in range(n_arvores):
+            soma += valores_folhas[:, t]
+        probabilidades[inicio:inicio + n_bloco] = soma / n_arvores
+    return probabilidades
+
+
+def _medir(funcao, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def benchmark_floresta(modelo, matriz_base, colunas_modelo, tamanhos=(1, 100, 10000, 1000000)):
+    floresta = compilar_floresta(modelo)
+    print(f"{len(floresta['raizes'])} árvores, {len(floresta['valor_folha']):,} nós")
+    print(f"{'lote':>10}{'sklearn (s)':>14}{'numpy (s)':>12}{'speedup':>10}{'dif. máx.':>12}")
+    for tamanho in tamanhos:
+        X = matriz_base[np.resize(np.arange(len(matriz_base)), tamanho)]
+        repeticoes = 20 if tamanho <= 100 else 3 if tamanho <= 10000 else 1
+        tempo_sklearn, proba_sklearn = _medir(lambda: modelo.predict_proba(pd.DataFrame(X, columns=colunas_modelo))[:, COLUNA_CLASSE_POSITIVA], repeticoes)
+        tempo_numpy, proba_numpy = _medir(lambda: prever_probabilidades_floresta(floresta, X), repeticoes)
+        diferenca = float(np.max(np.abs(proba_sklearn - proba_numpy))) if tamanho else 0.0
+        print(f"{tamanho:>10,}{tempo_sklearn:>14.4f}{tempo_numpy:>12.4f}{tempo_sklearn / tempo_numpy:>10.1f}{diferenca:>12.1e}")
+
+
+def main():
+    from recrutamento.carregamento import PATH_ARTIFACTS, PATH_DATA, carregar_tudo
+    from recrutamento.scoring import construir_armazem_candidatos, matriz_features_do_armazem, n_candidatos, preparar_vetor_vaga
+
+    parser = argparse.ArgumentParser(description="Benchmark da floresta compilada em NumPy contra o predict_proba do sklearn.")
+    parser.add_argument('--dados', default=PATH_DATA)
+    parser.add_argument('--artefatos', default=PATH_ARTIFACTS)
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[1, 100, 10000, 1000000])
+    args = parser.parse_args()
+
+    dados = carregar_tudo(args.dados, args.artefatos)
+    armazem = construir_armazem_candidatos(dados['df_candidatos'], dados['colunas_modelo'], dados['mapas'])
+    # Pares reais: cada vaga (em rodízio) contra os candidatos, até o maior lote pedido
+    linhas_por_vaga = max(1, max(args.tamanhos) // max(1, len(dados['df_vagas'])) + 1)
+    blocos = []
+    for i in range(len(dados['df_vagas'])):
+        vetor_vaga = preparar_vetor_vaga(dados['df_vagas'].iloc[i], dados['colunas_modelo'], dados['mapas'])
+        blocos.append(matriz_features_do_armazem(armazem, vetor_vaga, np.arange(min(linhas_por_vaga, n_candidatos(armazem)))))
+        if sum(len(b) for b in blocos) >= max(args.tamanhos):
+            break
+    benchmark_floresta(dados['modelo'], np.concatenate(blocos), dados['colunas_modelo'], args.tamanhos)
+
+
+if __name__ == '__main__':
+    main()
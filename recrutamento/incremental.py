@@ -0,0 +1,294 @@
+"""
+Atualização incremental das tabelas processadas a partir dos JSONs brutos.
+
+Cada registro bruto (vaga, candidato, vaga com suas prospecções) recebe uma impressão digital (hash
+do JSON canônico do registro) e o manifesto em data/manifesto_incremental.json guarda a impressão de
+cada id já processado. Numa atualização, os JSONs são lidos em streaming (recrutamento/ingestao.py)
+e só os ids novos ou alterados passam pela limpeza e engenharia de features
+(recrutamento/processamento.py); as linhas deles substituem as antigas na tabela processada, os ids
+que sumiram do JSON são removidos e a ordem final é a do JSON, a mesma de um processamento completo.
+Se o código do processamento mudar (hash dos módulos no manifesto), a tabela é refeita inteira.
+
+Tabelas mantidas: vagas_processadas e candidatos_processados (CSV + .feather, como na seção 12 do
+notebook) e prospects_processados (.feather, com as datas já convertidas).
+
+    python -m recrutamento.incremental atualizar
+    python -m recrutamento.incremental verificar   # incremental x completo em dados sintéticos
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import pandas as pd
+
+from recrutamento import features, ingestao, processamento, tecnologias
+from recrutamento.carregamento import usa_versao_colunar
+from recrutamento.colunar import caminho_colunar, ler_colunar, salvar_colunar
+from recrutamento.ingestao import entradas_json, registro_candidato, registro_vaga, tabela_prospects
+from recrutamento.processamento import processar_candidatos, processar_prospects, processar_vagas
+
+PATH_DATA = 'data/'
+PATH_DATA_RAW = 'data/raw/'
+NOME_MANIFESTO = 'manifesto_incremental.json'
+
+# Módulos cujo código define as tabelas processadas
+MODULOS_PROCESSAMENTO = (features, tecnologias, ingestao, processamento)
+
+TABELAS = {
+    'vagas': {
+        'json': 'vagas_raw.json', 'processado': 'vagas_processadas.csv', 'csv': True, 'chave': 'id_vaga',
+        'tabela': lambda entradas: pd.DataFrame([registro_vaga(chave, valor) for chave, valor in entradas]), 'processar': processar_vagas,
+    },
+    'candidatos': {
+        'json': 'applicants_raw.json', 'processado': 'candidatos_processados.csv', 'csv': True, 'chave': 'id_candidato',
+        'tabela': lambda entradas: pd.DataFrame([registro_candidato(chave, valor) for chave, valor in entradas]), 'processar': processar_candidatos,
+    },
+    'prospects': {
+        'json': 'prospects_raw.json', 'processado': 'prospects_processados.csv', 'csv': False, 'chave': 'id_vaga_origem',
+        'tabela': tabela_prospects, 'processar': processar_prospects,
+    },
+}
+
+
+#  Impressões digitais e manifesto
+def impressao_digital(valor):
+    canonico = json.dumps(valor, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(canonico.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def versao_codigo():
+    digest = hashlib.blake2b(digest_size=16)
+    for modulo in MODULOS_PROCESSAMENTO:
+        with open(modulo.__file__, 'rb') as arquivo:
+            digest.update(arquivo.read())
+    return digest.hexdigest()
+
+
+def ler_manifesto(path_data=PATH_DATA):
+    caminho = os.path.join(path_data, NOME_MANIFESTO)
+    if not os.path.exists(caminho):
+        return {'versao_codigo': None, 'tabelas': {}}
+    with open(caminho, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+def salvar_manifesto(manifesto, path_data=PATH_DATA):
+    caminho = os.path.join(path_data, NOME_MANIFESTO)
+    with open(caminho + '.tmp', 'w', encoding='utf-8') as arquivo:
+        json.dump(manifesto, arquivo)
+    os.replace(caminho + '.tmp', caminho)
+
+
+#  Atualização de uma tabela
+def _processar_tabela(config, tabela):
+    # As funções de processamento imprimem o progresso das seções do notebook
+    with open(os.devnull, 'w') as nulo:
+        with redirect_stdout(nulo):
+            return config['processar'](tabela)
+
+
+def atualizar_tabela(nome, caminho_json, path_data, impressoes_anteriores):
+    """
+    Reprocessa os ids novos/alterados de uma tabela e devolve (impressões atuais, resumo).
+    impressoes_anteriores vazio refaz a tabela inteira.
+    """
+    config = TABELAS[nome]
+    inicio = time.perf_counter()
+    impressoes, entradas_alteradas = {}, []
+    for chave, valor in entradas_json(caminho_json):
+        impressao = impressao_digital(valor)
+        impressoes[chave] = impressao
+        if impressoes_anteriores.get(chave) != impressao:
+            entradas_alteradas.append((chave, valor))
+    alterados = {chave for chave, impressao in impressoes.items() if impressoes_anteriores.get(chave) != impressao}
+    removidos = set(impressoes_anteriores) - set(impressoes)
+    resumo = {
+        'tabela': nome, 'registros': len(impressoes), 'novos': len(alterados - set(impressoes_anteriores)),
+        'alterados': len(alterados & set(impressoes_anteriores)), 'removidos': len(removidos),
+    }
+    if alterados or removidos or not impressoes_anteriores:
+        caminho_processado = os.path.join(path_data, config['processado'])
+        partes = []
+        if impressoes_anteriores:
+            existente = ler_colunar(caminho_colunar(caminho_processado))
+            partes.append(existente[~existente[config['chave']].astype(str).isin(alterados | removidos)])
+        tabela_alterados = config['tabela'](entradas_alteradas)
+        if not tabela_alterados.empty:
+            partes.append(_processar_tabela(config, tabela_alterados))
+        tabela = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame()
+        if not tabela.empty:
+            # Ordem do JSON (estável dentro de um id, para as várias prospecções de uma vaga)
+            posicao = {chave: i for i, chave in enumerate(impressoes)}
+            ordem = tabela[config['chave']].astype(str).map(posicao)
+            tabela = tabela.iloc[ordem.argsort(kind='stable')].reset_index(drop=True)
+        # CSV antes do .feather: o carregamento só usa o .feather se ele não for mais antigo que o CSV
+        if config['csv']:
+            tabela.to_csv(caminho_processado, index=False)
+        salvar_colunar(tabela, caminho_colunar(caminho_processado))
+    resumo['segundos'] = time.perf_counter() - inicio
+    return impressoes, resumo
+
+
+def atualizar(path_data=PATH_DATA, path_data_raw=PATH_DATA_RAW, tabelas=tuple(TABELAS)):
+    manifesto = ler_manifesto(path_data)
+    versao = versao_codigo()
+    mesma_versao = manifesto.get('versao_codigo') == versao
+    resumos = []
+    for nome in tabelas:
+        config = TABELAS[nome]
+        anteriores = manifesto['tabelas'].get(nome, {}) if mesma_versao else {}
+        if not os.path.exists(caminho_colunar(os.path.join(path_data, config['processado']))):
+            anteriores = {}
+        impressoes, resumo = atualizar_tabela(nome, os.path.join(path_data_raw, config['json']), path_data, anteriores)
+        manifesto['tabelas'][nome] = impressoes
+        resumo['completo'] = not anteriores
+        resumos.append(resumo)
+    if not mesma_versao:
+        # Tabelas fora desta execução ficam sem manifesto: serão refeitas na próxima vez
+        manifesto['tabelas'] = {nome: manifesto['tabelas'][nome] for nome in tabelas}
+    manifesto['versao_codigo'] = versao
+    salvar_manifesto(manifesto, path_data)
+    return resumos
+
+
+def imprimir_resumos(resumos):
+    print(f"{'tabela':<12}{'registros':>10}{'novos':>8}{'alterados':>11}{'removidos':>11}{'modo':>13}{'tempo (s)':>11}")
+    for resumo in resumos:
+        modo = 'completo' if resumo['completo'] else 'incremental'
+        print(f"{resumo['tabela']:<12}{resumo['registros']:>10,}{resumo['novos']:>8,}{resumo['alterados']:>11,}{resumo['removidos']:>11,}{modo:>13}{resumo['segundos']:>11.2f}")
+
+
+#  Verificação em dados sintéticos: incremental x processamento completo
+TITULOS = ['Consultor SAP FI', 'Desenvolvedor Java Sênior', 'Analista de Sistemas', 'Analista de negócios', 'Gerente de Projetos', 'Cientista de Dados', 'QA Tester', '', None]
+TEXTOS = ['python java sql', 'c#, .net e azure', 'sap abap, sap fi', 'power bi e excel', 'node.js react', 'linguagem c e c++', 'remoto', 'híbrido', 'presencial', '-', '', None]
+NIVEIS = ['Júnior', 'Pleno', 'Sênior', 'Especialista', 'Analista', '', None]
+IDIOMAS = ['Básico', 'Intermediário', 'Avançado', 'Fluente', 'Nenhum', '', None]
+SITUACOES = ['Prospect', 'Contratado pela Decision', 'Não Aprovado pelo Cliente', 'Desistiu', 'Proposta Aceita', '', None]
+DATAS = ['01-02-2021', '15-03-2021', '31-12-2020', '', None]
+
+
+def _vaga_sintetica(gerador):
+    return {
+        "informacoes_basicas": {"titulo_vaga": gerador.choice(TITULOS), "vaga_sap": gerador.choice(['Sim', 'Não', None]), "cliente": gerador.choice([' Cliente A ', 'B', None])},
+        "perfil_vaga": {"nivel profissional": gerador.choice(NIVEIS), "nivel_ingles": gerador.choice(IDIOMAS), "nivel_espanhol": gerador.choice(IDIOMAS), "areas_atuacao": gerador.choice(['TI - SAP-', None]),
+                        "principais_atividades": gerador.choice(TEXTOS), "competencia_tecnicas_e_comportamentais": gerador.choice(TEXTOS), "demais_observacoes": gerador.choice(TEXTOS)},
+    }
+
+
+def _candidato_sintetico(gerador):
+    candidato = {
+        "infos_basicas": {"nome": gerador.choice(['Ana', 'Bruno', '']), "local": gerador.choice(['São Paulo', ' RJ ', None]), "objetivo_profissional": gerador.choice(TEXTOS)},
+        "informacoes_pessoais": {"pcd": gerador.choice(['Sim', 'Não', '', None])},
+        "informacoes_profissionais": {"titulo_profissional": gerador.choice(TITULOS), "conhecimentos_tecnicos": gerador.choice(TEXTOS), "nivel_profissional": gerador.choice(NIVEIS)},
+        "formacao_e_idiomas": {"nivel_academico": gerador.choice(['Ensino Superior Completo', 'Mestrado', None]), "nivel_ingles": gerador.choice(IDIOMAS), "nivel_espanhol": gerador.choice(IDIOMAS)},
+    }
+    if gerador.random() < 0.5:
+        candidato["experiencia_profissional"] = [{"titulo_cargo": gerador.choice(TITULOS), "descricao_atividades": gerador.choice(TEXTOS)} for _ in range(gerador.randint(0, 3))]
+    return candidato
+
+
+def _prospect_sintetico(gerador, ids_candidatos):
+    return {
+        "titulo": gerador.choice(TITULOS), "modalidade": gerador.choice(['Remoto', 'Híbrido', 'Presencial', '', None]),
+        "prospects": [
+            {"nome": "Ana", "codigo": codigo, "situacao_candidado": gerador.choice(SITUACOES), "data_candidatura": gerador.choice(DATAS),
+             "ultima_atualizacao": gerador.choice(DATAS), "comentario": gerador.choice(['pretensão R$ 8.000', 'ok', None])}
+            for codigo in gerador.sample(ids_candidatos, gerador.randint(0, 4))
+        ],
+    }
+
+
+def _brutos_sinteticos(gerador, total_vagas, total_candidatos):
+    ids_candidatos = [str(i) for i in range(total_candidatos)]
+    return {
+        'vagas': {str(1000 + i): _vaga_sintetica(gerador) for i in range(total_vagas)},
+        'candidatos': {codigo: _candidato_sintetico(gerador) for codigo in ids_candidatos},
+        'prospects': {str(1000 + i): _prospect_sintetico(gerador, ids_candidatos) for i in range(total_vagas)},
+    }
+
+
+def _alterar_brutos(gerador, brutos, fracao):
+    # Novos, alterados e removidos em cada tabela, como numa atualização diária
+    ids_candidatos = list(brutos['candidatos'])
+    geradores = {'vagas': _vaga_sintetica, 'candidatos': _candidato_sintetico, 'prospects': lambda g: _prospect_sintetico(g, ids_candidatos)}
+    for nome, registros in brutos.items():
+        ids = list(registros)
+        quantidade = max(1, int(len(ids) * fracao))
+        for chave in gerador.sample(ids, quantidade):
+            registros[chave] = geradores[nome](gerador)
+        for chave in gerador.sample(ids, quantidade):
+            del registros[chave]
+        for i in range(quantidade):
+            registros[f"novo{i}"] = geradores[nome](gerador)
+
+
+def _gravar_brutos(brutos, path_data_raw):
+    for nome, registros in brutos.items():
+        with open(os.path.join(path_data_raw, TABELAS[nome]['json']), 'w', encoding='utf-8') as arquivo:
+            json.dump(registros, arquivo, ensure_ascii=False)
+
+
+def verificar_incremental(total_vagas=300, total_candidatos=3000, fracao=0.05, semente=0):
+    gerador = random.Random(semente)
+    pasta = tempfile.mkdtemp(prefix='incremental_')
+    try:
+        path_incremental, path_completo, path_raw = (os.path.join(pasta, nome) for nome in ('incremental', 'completo', 'raw'))
+        for path in (path_incremental, path_completo, path_raw):
+            os.makedirs(path)
+        brutos = _brutos_sinteticos(gerador, total_vagas, total_candidatos)
+        _gravar_brutos(brutos, path_raw)
+        print("Carga inicial:")
+        imprimir_resumos(atualizar(path_incremental, path_raw))
+        _alterar_brutos(gerador, brutos, fracao)
+        _gravar_brutos(brutos, path_raw)
+        print("\nAtualização:")
+        imprimir_resumos(atualizar(path_incremental, path_raw))
+        atualizar(path_completo, path_raw)
+
+        divergencias = 0
+        for nome, config in TABELAS.items():
+            arquivos = [caminho_colunar(config['processado'])] + ([config['processado']] if config['csv'] else [])
+            for arquivo in arquivos:
+                ler = ler_colunar if arquivo.endswith('.feather') else lambda caminho: pd.read_csv(caminho, dtype=str)
+                incremental, completo = ler(os.path.join(path_incremental, arquivo)), ler(os.path.join(path_completo, arquivo))
+                iguais = incremental.equals(completo) and list(incremental.columns) == list(completo.columns)
+                divergencias += not iguais
+                print(f"{arquivo}: {len(incremental):,} linhas, incremental {'idêntico' if iguais else 'DIFERENTE'} ao processamento completo")
+            if config['csv']:
+                # Depois da atualização o app, o serviço e os jobs devem ler o .feather, não o CSV
+                colunar_em_uso = usa_versao_colunar(os.path.join(path_incremental, config['processado']))
+                divergencias += not colunar_em_uso
+                print(f"{config['processado']}: carregamento lê {'o .feather' if colunar_em_uso else 'o CSV (.feather mais antigo que o CSV)'}")
+        return divergencias
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Atualização incremental das tabelas processadas.")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+    atualizar_parser = subcomandos.add_parser('atualizar', help="Reprocessa só os registros novos/alterados dos JSONs brutos")
+    atualizar_parser.add_argument('--dados', default=PATH_DATA)
+    atualizar_parser.add_argument('--brutos', default=PATH_DATA_RAW)
+    atualizar_parser.add_argument('--tabelas', nargs='+', choices=list(TABELAS), default=list(TABELAS))
+    verificar = subcomandos.add_parser('verificar', help="Compara a atualização incremental com o processamento completo em dados sintéticos")
+    verificar.add_argument('--vagas', type=int, default=300)
+    verificar.add_argument('--candidatos', type=int, default=3000)
+    verificar.add_argument('--fracao', type=float, default=0.05, help="Fração de registros novos, alterados e removidos")
+    verificar.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.comando == 'atualizar':
+        imprimir_resumos(atualizar(args.dados, args.brutos, args.tabelas))
+    elif verificar_incremental(args.vagas, args.candidatos, args.fracao, args.semente):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
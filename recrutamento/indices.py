@@ -0,0 +1,132 @@
+"""
+Índices pré-calculados sobre a base de candidatos usados pelos pré-filtros da busca.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from recrutamento.features import nome_base_skill
+from recrutamento.instrumentacao import registrar_etapa
+
+
+#  Índice de skills em bitset
+_TABELA_BITS_POR_BYTE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+def _contar_bits(palavras):
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(palavras)
+    # numpy < 2.0: popcount byte a byte via tabela
+    bytes_palavras = np.ascontiguousarray(palavras).view(np.uint8).reshape(palavras.shape + (8,))
+    return _TABELA_BITS_POR_BYTE[bytes_palavras].sum(axis=-1, dtype=np.uint8)
+
+
+def empacotar_bits(matriz_bool):
+    # (n, k) bool -> (n, ceil(k/64)) uint64, bit j da linha = coluna j
+    n, k = matriz_bool.shape
+    n_palavras = max(1, (k + 63) // 64)
+    bytes_empacotados = np.packbits(matriz_bool, axis=1, bitorder='little')
+    bytes_alinhados = np.zeros((n, n_palavras * 8), dtype=np.uint8)
+    bytes_alinhados[:, :bytes_empacotados.shape[1]] = bytes_empacotados
+    return bytes_alinhados.view('<u8')
+
+
+def construir_indice_skills(df_candidatos, coluna_numerica):
+    skill_cols_candidato = [col for col in df_candidatos.columns if col.startswith('skill_')]
+    skills_ativas = np.zeros((len(df_candidatos), len(skill_cols_candidato)), dtype=bool)
+    for j, col in enumerate(skill_cols_candidato):
+        skills_ativas[:, j] = coluna_numerica(df_candidatos, col) == 1
+    return {
+        'bits': empacotar_bits(skills_ativas),
+        'colunas': skill_cols_candidato,
+        'posicao_por_coluna': {col: j for j, col in enumerate(skill_cols_candidato)},
+        # Mesmo nome base do treino (recrutamento.features.pares_tech_skill)
+        'posicao_por_nome_base': {nome_base_skill(col): j for j, col in enumerate(skill_cols_candidato)},
+    }
+
+
+def mascara_skills(indice_skills, posicoes):
+    mascara = np.zeros(indice_skills['bits'].shape[1], dtype=np.uint64)
+    for posicao in posicoes:
+        mascara[posicao // 64] |= np.uint64(1) << np.uint64(posicao % 64)
+    return mascara
+
+
+def mascara_por_colunas(indice_skills, colunas_skill):
+    posicao_por_coluna = indice_skills['posicao_por_coluna']
+    return mascara_skills(indice_skills, [posicao_por_coluna[col] for col in colunas_skill if col in posicao_por_coluna])
+
+
+def mascara_por_nomes_base(indice_skills, nomes_base):
+    posicao_por_nome_base = indice_skills['posicao_por_nome_base']
+    return mascara_skills(indice_skills, [posicao_por_nome_base[nome] for nome in nomes_base if nome in posicao_por_nome_base])
+
+
+def contar_bits_em_comum(bits_a, bits_b):
+    # Popcount de a AND b por linha (broadcast entre (n, palavras) e (palavras,))
+    return _contar_bits(bits_a & bits_b).sum(axis=-1, dtype=np.int64)
+
+
+def contar_skills_em_comum(indice_skills, mascara, linhas=None):
+    bits = indice_skills['bits'] if linhas is None else indice_skills['bits'][linhas]
+    return contar_bits_em_comum(bits, mascara)
+
+
+#  Índices invertidos para os pré-filtros de categoria e nível
+COLUNA_CATEGORIA_CANDIDATO = 'categoria_profissional_candidato'
+COLUNA_NIVEL_CANDIDATO = 'nivel_profissional_padronizado_candidato'
+
+NIVEIS_COMPATIVEIS_POR_FAIXA = {
+    'senior': ["Sênior", "Especialista", "Liderança/Coordenação", "Gerência/Diretoria"],
+    'pleno': ["Pleno", "Sênior", "Especialista", "Liderança/Coordenação", "Gerência/Diretoria"],
+    'junior': ["Júnior", "Pleno", "Sênior", "Especialista"],
+}
+
+
+def faixa_nivel_vaga(nivel_vaga):
+    nivel_vaga_str = str(nivel_vaga).lower()
+    if nivel_vaga_str == "não informado": return None
+    if "sênior" in nivel_vaga_str or "senior" in nivel_vaga_str: return 'senior'
+    if "pleno" in nivel_vaga_str: return 'pleno'
+    if "júnior" in nivel_vaga_str or "jr" in nivel_vaga_str: return 'junior'
+    return None
+
+
+def construir_indice_invertido(df, coluna):
+    # valor -> linhas (posições) ordenadas; None se a coluna não existir
+    if coluna not in df.columns:
+        return None
+    grupos = pd.Series(np.arange(len(df), dtype=np.int64)).groupby(df[coluna].to_numpy(), sort=False).indices
+    return {valor: np.asarray(linhas, dtype=np.int64) for valor, linhas in grupos.items()}
+
+
+def construir_indices_prefiltro(df_candidatos):
+    indice_categoria = construir_indice_invertido(df_candidatos, COLUNA_CATEGORIA_CANDIDATO)
+    indice_nivel = construir_indice_invertido(df_candidatos, COLUNA_NIVEL_CANDIDATO)
+    indice_faixa_nivel = None
+    if indice_nivel is not None:
+        vazio = np.empty(0, dtype=np.int64)
+        indice_faixa_nivel = {
+            faixa: np.unique(np.concatenate([indice_nivel.get(nivel, vazio) for nivel in niveis]))
+            for faixa, niveis in NIVEIS_COMPATIVEIS_POR_FAIXA.items()
+        }
+    return {'categoria': indice_categoria, 'faixa_nivel': indice_faixa_nivel}
+
+
+def linhas_pre_filtradas(indices_prefiltro, n_candidatos, categoria_vaga, nivel_vaga, registro=None):
+    # Filtros 1 e 2 como interseção de listas de linhas, sem copiar o DataFrame de candidatos
+    linhas = None
+    if categoria_vaga != "Não Informado" and indices_prefiltro['categoria'] is not None:
+        inicio = time.perf_counter()
+        linhas = indices_prefiltro['categoria'].get(categoria_vaga, np.empty(0, dtype=np.int64))
+        registrar_etapa(registro, 'filtro_categoria', time.perf_counter() - inicio, n_candidatos, len(linhas))
+
+    faixa = faixa_nivel_vaga(nivel_vaga)
+    if faixa is not None and indices_prefiltro['faixa_nivel'] is not None:
+        inicio = time.perf_counter()
+        entrada = n_candidatos if linhas is None else len(linhas)
+        linhas_nivel = indices_prefiltro['faixa_nivel'][faixa]
+        linhas = linhas_nivel if linhas is None else np.intersect1d(linhas, linhas_nivel, assume_unique=True)
+        registrar_etapa(registro, 'filtro_nivel', time.perf_counter() - inicio, entrada, len(linhas))
+
+    return np.arange(n_candidatos, dtype=np.int64) if linhas is None else linhas
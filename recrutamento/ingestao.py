@@ -0,0 +1,461 @@
+"""
+Ingestão em streaming dos JSONs brutos (vagas.json, applicants.json e prospects.json).
+
+O dicionário da raiz é lido uma entrada (vaga, candidato ou vaga com suas prospecções) de cada
+vez, sem o json.load do arquivo inteiro. Cada entrada é achatada pelas mesmas regras das seções
+2.2, 3.2 e 4.2 do notebook (registro_vaga, registro_candidato; as prospecções de um lote de vagas
+direto em colunas, por colunas_prospects) e os registros vão em lotes de tamanho fixo para um
+arquivo Arrow IPC (.feather) ao lado do JSON. Só os campos que
+o notebook seleciona (seções 2.3 e 3.3, e os da 4.2 para prospecções) são gravados, como texto
+(None/ausente vira nulo). Valores que não são str (números, booleanos, listas) ficam como JSON na
+coluna COLUNA_NAO_TEXTO e ler_ingestao os devolve com o tipo original, como no json.load. O pico
+de memória depende do tamanho do bloco de leitura e do lote, não do arquivo.
+
+Pico de memória e tempo do json.load x streaming em arquivos sintéticos de candidatos (1x e 10x):
+    python -m recrutamento.ingestao benchmark --candidatos 40000 --escalas 1 10
+"""
+import argparse
+import itertools
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+TAMANHO_BLOCO = 1 << 20  # caracteres lidos do arquivo por vez
+TAMANHO_LOTE = 5000  # registros por lote gravado
+# Por linha, {coluna: valor} dos valores que não são str, em JSON (nulo quando não há)
+COLUNA_NAO_TEXTO = '_valores_nao_texto'
+
+CAMPOS_SELECIONADOS_VAGAS = [
+    "id_vaga", "titulo_vaga", "tipo_contratacao", "vaga_sap", "cliente",
+    "empresa_divisao", "estado", "cidade", "nivel profissional", "nivel_academico",
+    "nivel_ingles", "nivel_espanhol", "areas_atuacao", "principais_atividades",
+    "competencia_tecnicas_e_comportamentais", "demais_observacoes"
+]
+CAMPOS_SELECIONADOS_CANDIDATOS = [
+    'id_candidato', 'nome', 'email', 'local', 'pcd',
+    'titulo_profissional', 'area_atuacao', 'objetivo_profissional',
+    'conhecimentos_tecnicos', 'certificacoes', 'outras_certificacoes', 'qualificacoes',
+    'nivel_profissional', 'nivel_academico', # Note: nivel_profissional aqui é o original do candidato
+    'nivel_ingles', 'nivel_espanhol', 'outro_idioma',
+    'experiencia_descricoes_concatenadas', 'experiencia_titulos_concatenados'
+]
+CAMPOS_PROSPECTS = [
+    "id_vaga_origem", "titulo_vaga_origem_json", "modalidade_vaga_origem_json", "nome_candidato",
+    "id_candidato_origem", "situacao_candidato", "data_candidatura", "data_ultima_atualizacao",
+    "comentario", "recrutador"
+]
+
+_BRANCOS = re.compile(r'[ \t\n\r]*')
+
+
+#  Leitura incremental do dicionário da raiz
+def entradas_json(caminho, tamanho_bloco=TAMANHO_BLOCO):
+    """(chave, valor) de cada entrada do objeto JSON da raiz, decodificadas uma de cada vez."""
+    decodificador = json.JSONDecoder()
+    with open(caminho, 'r', encoding='utf-8') as arquivo:
+        buffer, pos, fim = '', 0, False
+
+        def ler_bloco():
+            nonlocal buffer, pos, fim
+            bloco = arquivo.read(tamanho_bloco)
+            fim = not bloco
+            # Descarta o que já foi decodificado: o buffer guarda no máximo um bloco e a entrada atual
+            buffer, pos = buffer[pos:] + bloco, 0
+
+        def proximo_caractere():
+            nonlocal pos
+            while True:
+                pos = _BRANCOS.match(buffer, pos).end()
+                if pos < len(buffer):
+                    return buffer[pos]
+                if fim:
+                    return None
+                ler_bloco()
+
+        def decodificar():
+            nonlocal pos
+            proximo_caractere()
+            while True:
+                try:
+                    valor, final = decodificador.raw_decode(buffer, pos)
+                    # Um número cortado no fim do bloco também decodifica: só aceita com algo depois dele
+                    if final < len(buffer) or fim:
+                        pos = final
+                        return valor
+                except json.JSONDecodeError:
+                    if fim:
+                        raise
+                ler_bloco()
+
+        def esperar(caracteres):
+            nonlocal pos
+            caractere = proximo_caractere()
+            if caractere is None or caractere not in caracteres:
+                raise ValueError(f"{caminho}: esperado um de {caracteres!r}, encontrado {caractere!r}")
+            pos += 1
+            return caractere
+
+        esperar('{')
+        if proximo_caractere() == '}':
+            return
+        while True:
+            chave = decodificar()
+            if not isinstance(chave, str):
+                raise ValueError(f"{caminho}: chave {chave!r} não é uma string JSON")
+            esperar(':')
+            yield chave, decodificar()
+            if esperar(',}') == '}':
+                return
+
+
+#  Achatamento de uma entrada (mesmas regras das seções 2.2, 3.2 e 4.2)
+def registro_vaga(vaga_id, detalhes_vaga):
+    vaga_info = {"id_vaga": vaga_id}
+    if isinstance(detalhes_vaga, dict):
+        informacoes_basicas = detalhes_vaga.get("informacoes_basicas", {})
+        perfil_vaga = detalhes_vaga.get("perfil_vaga", {})
+        vaga_info.update(informacoes_basicas if isinstance(informacoes_basicas, dict) else {})
+        vaga_info.update(perfil_vaga if isinstance(perfil_vaga, dict) else {})
+    return vaga_info
+
+
+def registro_candidato(candidato_id, detalhes_candidato):
+    candidato_info = {"id_candidato": candidato_id}
+    if isinstance(detalhes_candidato, dict):
+        candidato_info.update(detalhes_candidato.get("infos_basicas", {}))
+        candidato_info.update(detalhes_candidato.get("informacoes_pessoais", {}))
+        candidato_info.update(detalhes_candidato.get("informacoes_profissionais", {}))
+        candidato_info.update(detalhes_candidato.get("formacao_e_idiomas", {}))
+        experiencias = detalhes_candidato.get("experiencia_profissional", [])
+        if isinstance(experiencias, list) and experiencias:
+            descricoes_exp = [exp.get("descricao_atividades", "") for exp in experiencias if isinstance(exp, dict) and exp.get("descricao_atividades")]
+            titulos_exp = [exp.get("titulo_cargo", "") for exp in experiencias if isinstance(exp, dict) and exp.get("titulo_cargo")]
+            candidato_info["experiencia_descricoes_concatenadas"] = " ".join(filter(None, descricoes_exp))
+            candidato_info["experiencia_titulos_concatenados"] = " ".join(filter(None, titulos_exp))
+        else:
+            candidato_info["experiencia_descricoes_concatenadas"] = ""
+            candidato_info["experiencia_titulos_concatenados"] = ""
+    return candidato_info
+
+
+def registros_prospects(id_vaga_origem, info_vaga_prospect):
+    registros = []
+    if isinstance(info_vaga_prospect, dict):
+        titulo_vaga_json = info_vaga_prospect.get("titulo", "Não Informado")
+        modalidade_vaga_json = info_vaga_prospect.get("modalidade", "Não Informado")
+        candidatos_prospectados = info_vaga_prospect.get("prospects", [])
+        if isinstance(candidatos_prospectados, list):
+            for candidato_data in candidatos_prospectados:
+                if isinstance(candidato_data, dict):
+                    registros.append({
+                        "id_vaga_origem": id_vaga_origem,
+                        "titulo_vaga_origem_json": titulo_vaga_json,
+                        "modalidade_vaga_origem_json": modalidade_vaga_json,
+                        "nome_candidato": candidato_data.get("nome", "Não Informado"),
+                        "id_candidato_origem": candidato_data.get("codigo", "Não Informado"),
+                        "situacao_candidato": candidato_data.get("situacao_candidado", "Não Informado"),
+                        "data_candidatura": candidato_data.get("data_candidatura", "Não Informado"),
+                        "data_ultima_atualizacao": candidato_data.get("ultima_atualizacao", "Não Informado"),
+                        "comentario": candidato_data.get("comentario", "Não Informado"),
+                        "recrutador": candidato_data.get("recrutador", "Não Informado")
+                    })
+    return registros
+
+
+# Campos de cada prospecção (coluna, chave no JSON); os da vaga vêm de titulo/modalidade
+CAMPOS_CANDIDATO_PROSPECT = [
+    ("nome_candidato", "nome"), ("id_candidato_origem", "codigo"), ("situacao_candidato", "situacao_candidado"),
+    ("data_candidatura", "data_candidatura"), ("data_ultima_atualizacao", "ultima_atualizacao"),
+    ("comentario", "comentario"), ("recrutador", "recrutador")
+]
+
+
+def colunas_prospects(entradas):
+    """
+    Achatamento colunar das prospecções: record path "prospects" de cada vaga, com id, título e
+    modalidade da vaga repetidos como metadados. Mesmas linhas e valores de registros_prospects,
+    montados coluna a coluna em vez de um dict por prospecção. entradas: pares (id_vaga, info_vaga).
+    """
+    ids_vagas, titulos, modalidades, repeticoes, candidatos = [], [], [], [], []
+    for id_vaga_origem, info_vaga_prospect in entradas:
+        if not isinstance(info_vaga_prospect, dict):
+            continue
+        candidatos_prospectados = info_vaga_prospect.get("prospects", [])
+        if not isinstance(candidatos_prospectados, list):
+            continue
+        candidatos_vaga = [candidato_data for candidato_data in candidatos_prospectados if isinstance(candidato_data, dict)]
+        if candidatos_vaga:
+            ids_vagas.append(id_vaga_origem)
+            titulos.append(info_vaga_prospect.get("titulo", "Não Informado"))
+            modalidades.append(info_vaga_prospect.get("modalidade", "Não Informado"))
+            repeticoes.append(len(candidatos_vaga))
+            candidatos.extend(candidatos_vaga)
+
+    def repetir(valores):
+        return list(itertools.chain.from_iterable(map(itertools.repeat, valores, repeticoes)))
+
+    colunas = {
+        "id_vaga_origem": repetir(ids_vagas), "titulo_vaga_origem_json": repetir(titulos),
+        "modalidade_vaga_origem_json": repetir(modalidades),
+    }
+    for coluna, chave in CAMPOS_CANDIDATO_PROSPECT:
+        colunas[coluna] = [candidato_data.get(chave, "Não Informado") for candidato_data in candidatos]
+    return {coluna: colunas[coluna] for coluna in CAMPOS_PROSPECTS}
+
+
+def tabela_prospects(entradas):
+    """DataFrame das prospecções (seção 4.2) a partir dos pares (id_vaga, info_vaga); vazio e sem colunas se não houver prospecções."""
+    colunas = colunas_prospects(entradas)
+    if not colunas["id_vaga_origem"]:
+        return pd.DataFrame()
+    return pd.DataFrame(colunas)
+
+
+#  Gravação em lotes
+def caminho_ingestao(caminho_json):
+    return os.path.splitext(caminho_json)[0] + '.feather'
+
+
+def _texto_ou_nulo(valor):
+    if valor is None or (isinstance(valor, float) and valor != valor):
+        return None
+    return valor if isinstance(valor, str) else str(valor)
+
+
+def gravar_lotes_colunares(lotes, colunas, caminho):
+    """Grava lotes já em colunas ({coluna: lista de valores}); devolve o total de linhas gravadas."""
+    import pyarrow
+    import pyarrow.ipc
+
+    esquema = pyarrow.schema([(coluna, pyarrow.string()) for coluna in list(colunas) + [COLUNA_NAO_TEXTO]])
+    # Cada lote é liberado logo depois de gravado; o pool padrão (mimalloc) demora a devolver essas
+    # páginas ao sistema e o RSS cresceria com o número de lotes
+    pool = pyarrow.system_memory_pool()
+
+    def coluna_texto(coluna, valores, nao_texto):
+        # Só str/None (o caso comum) vai direto para o Arrow; os outros valores ficam nulos aqui e vão para nao_texto
+        try:
+            return pyarrow.array(valores, pyarrow.string(), memory_pool=pool)
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+            textos = []
+            for i, valor in enumerate(valores):
+                if valor is None or isinstance(valor, str):
+                    textos.append(valor)
+                else:
+                    textos.append(None)
+                    nao_texto.setdefault(i, {})[coluna] = valor
+            return pyarrow.array(textos, pyarrow.string(), memory_pool=pool)
+
+    total = 0
+    caminho_temporario = caminho + '.tmp'
+    # Sem compressão, como o formato colunar dos processados; o arquivo só substitui o anterior quando completo
+    with pyarrow.OSFile(caminho_temporario, 'wb') as destino, pyarrow.ipc.new_file(destino, esquema) as escritor:
+        for lote in lotes:
+            tamanho = len(lote[colunas[0]])
+            if tamanho:
+                nao_texto = {}
+                arrays = [coluna_texto(coluna, lote[coluna], nao_texto) for coluna in colunas]
+                arrays.append(pyarrow.array(
+                    [json.dumps(nao_texto[i], ensure_ascii=False) if i in nao_texto else None for i in range(tamanho)], pyarrow.string(), memory_pool=pool
+                ) if nao_texto else pyarrow.nulls(tamanho, pyarrow.string(), memory_pool=pool))
+                escritor.write_batch(pyarrow.record_batch(arrays, schema=esquema))
+                total += tamanho
+    os.replace(caminho_temporario, caminho)
+    return total
+
+
+def gravar_em_lotes(registros, colunas, caminho, tamanho_lote=TAMANHO_LOTE):
+    """Grava os registros (dicts) em lotes de tamanho_lote; devolve o total de registros gravados."""
+    def lotes():
+        lote = []
+        for registro in registros:
+            lote.append(registro)
+            if len(lote) == tamanho_lote:
+                yield {coluna: [registro.get(coluna) for registro in lote] for coluna in colunas}
+                lote = []
+        if lote:
+            yield {coluna: [registro.get(coluna) for registro in lote] for coluna in colunas}
+
+    return gravar_lotes_colunares(lotes(), colunas, caminho)
+
+
+def ingerir_vagas(caminho_json, caminho_saida=None, tamanho_lote=TAMANHO_LOTE):
+    caminho_saida = caminho_saida or caminho_ingestao(caminho_json)
+    registros = (registro_vaga(vaga_id, detalhes) for vaga_id, detalhes in entradas_json(caminho_json))
+    return gravar_em_lotes(registros, CAMPOS_SELECIONADOS_VAGAS, caminho_saida, tamanho_lote)
+
+
+def ingerir_candidatos(caminho_json, caminho_saida=None, tamanho_lote=TAMANHO_LOTE):
+    caminho_saida = caminho_saida or caminho_ingestao(caminho_json)
+    registros = (registro_candidato(candidato_id, detalhes) for candidato_id, detalhes in entradas_json(caminho_json))
+    return gravar_em_lotes(registros, CAMPOS_SELECIONADOS_CANDIDATOS, caminho_saida, tamanho_lote)
+
+
+def ingerir_prospects(caminho_json, caminho_saida=None, tamanho_lote=TAMANHO_LOTE):
+    caminho_saida = caminho_saida or caminho_ingestao(caminho_json)
+    return gravar_lotes_colunares(lotes_prospects(entradas_json(caminho_json), tamanho_lote), CAMPOS_PROSPECTS, caminho_saida)
+
+
+def lotes_prospects(entradas, tamanho_lote=TAMANHO_LOTE):
+    # Vagas acumuladas até somarem tamanho_lote prospecções e achatadas juntas por colunas_prospects
+    vagas, total_prospects = [], 0
+    for id_vaga, info in entradas:
+        vagas.append((id_vaga, info))
+        if isinstance(info, dict) and isinstance(info.get("prospects"), list):
+            total_prospects += len(info["prospects"])
+        if total_prospects >= tamanho_lote:
+            yield colunas_prospects(vagas)
+            vagas, total_prospects = [], 0
+    if vagas:
+        yield colunas_prospects(vagas)
+
+
+def ler_ingestao(caminho):
+    df = pd.read_feather(caminho)
+    if COLUNA_NAO_TEXTO not in df.columns:
+        return df
+    # Volta os valores que não são str, com o tipo do JSON, às suas colunas (que passam a object)
+    por_coluna = {}
+    for posicao, texto_json in enumerate(df.pop(COLUNA_NAO_TEXTO).to_numpy()):
+        if isinstance(texto_json, str):
+            for coluna, valor in json.loads(texto_json).items():
+                por_coluna.setdefault(coluna, []).append((posicao, valor))
+    for coluna, valores in por_coluna.items():
+        coluna_objeto = df[coluna].to_numpy(dtype=object, copy=True)
+        for posicao, valor in valores:
+            coluna_objeto[posicao] = valor
+        df[coluna] = pd.Series(coluna_objeto, index=df.index, dtype=object)
+    return df
+
+
+#  Benchmark de memória em arquivos sintéticos de candidatos
+def gravar_applicants_sintetico(caminho, total_candidatos, semente=0):
+    # Escrito entrada a entrada: o gerador também não depende do tamanho do arquivo
+    gerador = np.random.default_rng(semente)
+    palavras = (
+        'experiência desenvolvimento sistemas sap abap java python sql análise requisitos projetos suporte '
+        'consultor analista sênior pleno júnior cliente implantação módulo financeiro contábil equipe'
+    ).split()
+
+    def frase(n):
+        return ' '.join(gerador.choice(palavras, size=n))
+
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        arquivo.write('{')
+        for i in range(total_candidatos):
+            candidato = {
+                "infos_basicas": {"nome": f"Candidato {i}", "email": f"candidato{i}@exemplo.com", "local": frase(2), "objetivo_profissional": frase(6), "codigo_profissional": str(i)},
+                "informacoes_pessoais": {"nome": f"Candidato {i}", "pcd": str(gerador.choice(['Sim', 'Não', ''])), "data_nascimento": "01-01-1990", "endereco": frase(4)},
+                "informacoes_profissionais": {"titulo_profissional": frase(3), "area_atuacao": frase(2), "conhecimentos_tecnicos": frase(30), "certificacoes": frase(5), "nivel_profissional": str(gerador.choice(['Júnior', 'Pleno', 'Sênior']))},
+                "formacao_e_idiomas": {"nivel_academico": "Ensino Superior Completo", "nivel_ingles": str(gerador.choice(['Básico', 'Intermediário', 'Avançado'])), "nivel_espanhol": "Nenhum", "outro_idioma": "-"},
+                "experiencia_profissional": [{"titulo_cargo": frase(3), "descricao_atividades": frase(40)} for _ in range(int(gerador.integers(0, 4)))],
+                "cv_pt": frase(300),
+            }
+            if i:
+                arquivo.write(',')
+            arquivo.write(f"\n{json.dumps(str(31000 + i))}: {json.dumps(candidato, ensure_ascii=False)}")
+        arquivo.write('\n}')
+
+
+def _carregar_com_json_load(caminho_json):
+    # Caminho das seções 3.1 a 3.3 sem streaming: dicionário inteiro, lista de dicts e DataFrame
+    with open(caminho_json, 'r', encoding='utf-8') as f:
+        data_applicants_json = json.load(f)
+    df_candidatos = pd.DataFrame([registro_candidato(candidato_id, detalhes) for candidato_id, detalhes in data_applicants_json.items()])
+    return pd.DataFrame({campo: df_candidatos[campo] if campo in df_candidatos.columns else pd.NA for campo in CAMPOS_SELECIONADOS_CANDIDATOS})
+
+
+def _pico_rss_mb():
+    # VmHWM é do processo atual; o ru_maxrss do Linux herda o pico do processo que o disparou
+    try:
+        with open('/proc/self/status') as status:
+            for linha in status:
+                if linha.startswith('VmHWM:'):
+                    return int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _medir_ingestao(modo, caminho_json):
+    # Roda num processo novo para que o pico de RSS seja só o desta leitura
+    import pyarrow.ipc  # importado antes da medida nos dois modos
+
+    rss_base = _pico_rss_mb()
+    inicio = time.perf_counter()
+    if modo == 'json.load':
+        total = len(_carregar_com_json_load(caminho_json))
+    else:
+        total = ingerir_candidatos(caminho_json, caminho_ingestao(caminho_json))
+    segundos = time.perf_counter() - inicio
+    print(json.dumps({'segundos': segundos, 'rss_base_mb': rss_base, 'pico_rss_mb': _pico_rss_mb(), 'registros': total}))
+
+
+def _texto_normalizado(df):
+    # Comparação depois do fillna/astype(str) que as seções 3.4 aplicam a todas as colunas
+    return df.reset_index(drop=True).apply(lambda serie: serie.astype(object).where(serie.notna(), None)).map(_texto_ou_nulo)
+
+
+def benchmark_ingestao(candidatos_base, escalas, semente=0):
+    pasta = tempfile.mkdtemp(prefix='ingestao_')
+    try:
+        print(f"{'escala':>6}{'candidatos':>12}{'arquivo (MB)':>14}{'modo':>11}{'tempo (s)':>11}{'RSS base (MB)':>15}{'pico RSS (MB)':>15}")
+        for escala in escalas:
+            caminho_json = os.path.join(pasta, f"applicants_{escala}x.json")
+            gravar_applicants_sintetico(caminho_json, candidatos_base * escala, semente)
+            tamanho_mb = os.path.getsize(caminho_json) / 2 ** 20
+            for modo in ('json.load', 'streaming'):
+                saida = subprocess.run(
+                    [sys.executable, '-m', 'recrutamento.ingestao', '_medir', modo, caminho_json],
+                    capture_output=True, text=True, check=True
+                )
+                medida = json.loads(saida.stdout.strip().splitlines()[-1])
+                print(f"{escala:>5}x{medida['registros']:>12,}{tamanho_mb:>14.1f}{modo:>11}{medida['segundos']:>11.2f}{medida['rss_base_mb']:>15.1f}{medida['pico_rss_mb']:>15.1f}")
+            if escala == escalas[0]:
+                iguais = _texto_normalizado(_carregar_com_json_load(caminho_json)).equals(_texto_normalizado(ler_ingestao(caminho_ingestao(caminho_json))))
+                print(f"       registros iguais aos do json.load: {'sim' if iguais else 'NÃO'}")
+            os.remove(caminho_json)
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingestão em streaming dos JSONs brutos para arquivos colunares.")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+    for nome, ajuda in (('vagas', "vagas.json -> .feather"), ('candidatos', "applicants.json -> .feather"), ('prospects', "prospects.json -> .feather")):
+        sub = subcomandos.add_parser(nome, help=ajuda)
+        sub.add_argument('caminho_json')
+        sub.add_argument('--saida', default=None, help="Padrão: o caminho do JSON com extensão .feather")
+        sub.add_argument('--lote', type=int, default=TAMANHO_LOTE)
+    bench = subcomandos.add_parser('benchmark', help="Pico de memória json.load x streaming em applicants sintéticos")
+    bench.add_argument('--candidatos', type=int, default=40000, help="Candidatos na escala 1x")
+    bench.add_argument('--escalas', type=int, nargs='+', default=[1, 10])
+    bench.add_argument('--semente', type=int, default=0)
+    medir = subcomandos.add_parser('_medir')
+    medir.add_argument('modo')
+    medir.add_argument('caminho_json')
+    args = parser.parse_args()
+
+    if args.comando == 'benchmark':
+        benchmark_ingestao(args.candidatos, args.escalas, args.semente)
+    elif args.comando == '_medir':
+        _medir_ingestao(args.modo, args.caminho_json)
+    else:
+        ingerir = {'vagas': ingerir_vagas, 'candidatos': ingerir_candidatos, 'prospects': ingerir_prospects}[args.comando]
+        inicio = time.perf_counter()
+        total = ingerir(args.caminho_json, args.saida, args.lote)
+        print(f"{args.caminho_json} -> {args.saida or caminho_ingestao(args.caminho_json)}: {total:,} registros ({time.perf_counter() - inicio:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
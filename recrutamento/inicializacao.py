@@ -0,0 +1,126 @@
+"""
+Inicialização rápida do app: os filtros de vaga da barra lateral saem de um arquivo pequeno de
+metadados (data/metadados_app.json), sem esperar modelo e candidatos, que carregam em segundo
+plano. Também guarda os marcos de tempo da inicialização do processo.
+
+Gerar os metadados e medir a inicialização a frio (processo novo, via streamlit.testing):
+    python -m recrutamento.inicializacao metadados
+    python -m recrutamento.inicializacao medir
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from recrutamento.cache_scores import carimbo_arquivo
+from recrutamento.colunar import caminho_colunar
+
+ARQUIVO_METADADOS = 'metadados_app.json'
+NOME_CSV_VAGAS = 'vagas_processadas.csv'
+COLUNAS_FILTRO_VAGAS = ('categoria_vaga', 'modalidade_trabalho', 'nivel_profissional_vaga')
+
+# Marcos da inicialização (perf_counter); o primeiro registro de cada nome vale para o processo
+MARCOS = {}
+
+
+def marcar(nome):
+    return MARCOS.setdefault(nome, time.perf_counter())
+
+
+def tempos_inicializacao():
+    # Segundos desde 'inicio' para cada marco registrado
+    if 'inicio' not in MARCOS:
+        return {}
+    return {nome: instante - MARCOS['inicio'] for nome, instante in MARCOS.items() if nome != 'inicio'}
+
+
+def _carimbo_vagas(path_data):
+    caminho_csv = os.path.join(path_data, NOME_CSV_VAGAS)
+    return [carimbo_arquivo(caminho_csv), carimbo_arquivo(caminho_colunar(caminho_csv))]
+
+
+def opcoes_filtro_vagas(df_vagas):
+    # Mesmas opções de sorted(df_vagas[col].unique()), sem os valores ausentes
+    return {
+        col: sorted(str(valor) for valor in df_vagas[col].dropna().unique())
+        for col in COLUNAS_FILTRO_VAGAS if col in df_vagas.columns
+    }
+
+
+def salvar_metadados_app(path_data, df_vagas):
+    caminho = os.path.join(path_data, ARQUIVO_METADADOS)
+    caminho_temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(caminho_temporario, 'w', encoding='utf-8') as f:
+        json.dump({'carimbo_vagas': _carimbo_vagas(path_data), 'filtros': opcoes_filtro_vagas(df_vagas)}, f, ensure_ascii=False)
+    os.replace(caminho_temporario, caminho)
+    return caminho
+
+
+def carregar_metadados_app(path_data):
+    """Metadados da barra lateral, ou None se ausentes ou gerados de outro arquivo de vagas."""
+    caminho = os.path.join(path_data, ARQUIVO_METADADOS)
+    try:
+        with open(caminho, encoding='utf-8') as f:
+            metadados = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if metadados.get('carimbo_vagas') != _carimbo_vagas(path_data):
+        return None
+    return metadados
+
+
+def _medir_app(caminho_app, timeout):
+    # Roda dentro do processo novo: importa e executa o app uma vez, como a primeira sessão faria.
+    # Os marcos ficam no módulo importado pelo app (aqui, rodando com -m, este arquivo é __main__)
+    from recrutamento import inicializacao
+    inicializacao.marcar('inicio')
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(caminho_app, default_timeout=timeout)
+    app.run()
+    if app.exception:
+        raise RuntimeError(f"O app falhou na inicialização: {app.exception[0].message}")
+    print(json.dumps(inicializacao.tempos_inicializacao()))
+
+
+def medir_inicializacao(caminho_app='app.py', timeout=600):
+    saida = subprocess.run(
+        [sys.executable, '-m', 'recrutamento.inicializacao', '_medir', caminho_app, str(timeout)],
+        capture_output=True, text=True, check=True
+    )
+    tempos = json.loads(saida.stdout.strip().splitlines()[-1])
+    print(f"{'marco':<28}{'segundos':>10}")
+    for nome in ('primeira_renderizacao', 'pronto'):
+        if nome in tempos:
+            print(f"{nome:<28}{tempos[nome]:>10.2f}")
+    return tempos
+
+
+def main():
+    from recrutamento.carregamento import PATH_DATA, ler_dados_processados
+
+    parser = argparse.ArgumentParser(description="Metadados de inicialização do app e medição do tempo de inicialização.")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+    metadados = subcomandos.add_parser('metadados', help="Gera data/metadados_app.json a partir das vagas processadas")
+    metadados.add_argument('--dados', default=PATH_DATA)
+    medir = subcomandos.add_parser('medir', help="Tempo até a primeira renderização e até o app ficar pronto")
+    medir.add_argument('--app', default='app.py')
+    medir.add_argument('--timeout', type=float, default=600)
+    medir_interno = subcomandos.add_parser('_medir')
+    medir_interno.add_argument('app')
+    medir_interno.add_argument('timeout', type=float)
+    args = parser.parse_args()
+
+    if args.comando == 'metadados':
+        df_vagas = ler_dados_processados(os.path.join(args.dados, NOME_CSV_VAGAS))
+        print(salvar_metadados_app(args.dados, df_vagas))
+    elif args.comando == 'medir':
+        medir_inicializacao(args.app, args.timeout)
+    else:
+        _medir_app(args.app, args.timeout)
+
+
+if __name__ == '__main__':
+    main()
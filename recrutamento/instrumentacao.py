@@ -0,0 +1,173 @@
+"""
+Tempos por etapa da busca de candidatos: cada busca ganha um registro com o tempo de parede,
+os candidatos que entram e saem de cada filtro e as linhas pontuadas por segundo. O app mostra
+o último registro num painel opcional da barra lateral e acrescenta cada um, como uma linha
+JSON, ao log data/tempos_busca.jsonl (outro caminho via RECRUTAMENTO_LOG_TEMPOS; vazio desliga).
+
+Percentis por etapa a partir do log:
+    python -m recrutamento.instrumentacao resumo --log data/tempos_busca.jsonl
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+ARQUIVO_LOG_TEMPOS = 'tempos_busca.jsonl'
+VARIAVEL_AMBIENTE_LOG = 'RECRUTAMENTO_LOG_TEMPOS'
+
+# Etapas na ordem em que acontecem (as que não rodaram ficam fora do registro)
+ETAPAS_BUSCA = (
+    'cache_scores', 'filtro_categoria', 'filtro_nivel', 'filtro_techs', 'tabela_topk',
+    'features', 'predicao', 'ranking', 'scoring_paralelo', 'montagem_resultados',
+)
+# Etapas em que cada linha é um par vaga x candidato pontuado
+ETAPAS_SCORING = ('features', 'predicao', 'ranking', 'scoring_paralelo')
+
+_trava_log = threading.Lock()
+
+
+def novo_registro(vaga_id, parametros=None):
+    return {'vaga_id': str(vaga_id), 'parametros': dict(parametros or {}), 'origem': None, 'etapas': {}, 'inicio': time.perf_counter()}
+
+
+def registrar_etapa(registro, nome, segundos, entrada=None, saida=None, linhas=None):
+    """
+    Acumula uma medição na etapa `nome` (etapas chamadas por bloco somam tempo e linhas).
+    entrada/saida são os candidatos antes e depois de um filtro; vale a primeira entrada e a
+    última saída. Com registro None não faz nada, para os chamadores não precisarem testar.
+    """
+    if registro is None:
+        return
+    etapa = registro['etapas'].setdefault(nome, {'segundos': 0.0, 'chamadas': 0})
+    etapa['segundos'] += segundos
+    etapa['chamadas'] += 1
+    if entrada is not None:
+        etapa.setdefault('entrada', int(entrada))
+    if saida is not None:
+        etapa['saida'] = int(saida)
+    if linhas is not None:
+        etapa['linhas'] = etapa.get('linhas', 0) + int(linhas)
+
+
+def marcar_origem(registro, origem):
+    # De onde veio o ranking: cache, tabela, paralelo ou armazem
+    if registro is not None:
+        registro['origem'] = origem
+
+
+def finalizar_registro(registro):
+    """Registro pronto para exibição e para o log (tempos em ms, linhas por segundo)."""
+    total_s = time.perf_counter() - registro['inicio']
+    etapas = {}
+    for nome in sorted(registro['etapas'], key=lambda nome: ETAPAS_BUSCA.index(nome) if nome in ETAPAS_BUSCA else len(ETAPAS_BUSCA)):
+        etapa = registro['etapas'][nome]
+        etapas[nome] = {chave: valor for chave, valor in etapa.items() if chave != 'segundos'}
+        etapas[nome]['ms'] = etapa['segundos'] * 1000
+        if etapa.get('linhas') and etapa['segundos'] > 0:
+            etapas[nome]['linhas_por_s'] = etapa['linhas'] / etapa['segundos']
+    segundos_scoring = sum(registro['etapas'][nome]['segundos'] for nome in ETAPAS_SCORING if nome in registro['etapas'])
+    linhas_pontuadas = max((registro['etapas'][nome].get('linhas', 0) for nome in ETAPAS_SCORING if nome in registro['etapas']), default=0)
+    return {
+        'data': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+        'vaga_id': registro['vaga_id'],
+        'parametros': registro['parametros'],
+        'origem': registro['origem'],
+        'total_ms': total_s * 1000,
+        'linhas_pontuadas': linhas_pontuadas,
+        'linhas_pontuadas_por_s': linhas_pontuadas / segundos_scoring if linhas_pontuadas and segundos_scoring > 0 else None,
+        'etapas': etapas,
+    }
+
+
+#  Log estruturado (JSON Lines)
+def caminho_log_tempos(path_data):
+    caminho = os.environ.get(VARIAVEL_AMBIENTE_LOG)
+    if caminho is None:
+        return os.path.join(path_data, ARQUIVO_LOG_TEMPOS)
+    return caminho or None
+
+
+def gravar_registro(caminho, registro_final):
+    if not caminho:
+        return
+    linha = json.dumps(registro_final, ensure_ascii=False) + '\n'
+    # Sessões do Streamlit rodam em threads do mesmo processo: uma linha inteira por escrita
+    with _trava_log:
+        with open(caminho, 'a', encoding='utf-8') as f:
+            f.write(linha)
+
+
+def ler_registros(caminho):
+    registros = []
+    with open(caminho, encoding='utf-8') as f:
+        for linha in f:
+            linha = linha.strip()
+            if not linha:
+                continue
+            try:
+                registros.append(json.loads(linha))
+            except ValueError:
+                # Linha truncada (processo interrompido no meio da escrita)
+                continue
+    return registros
+
+
+def resumir_registros(registros, origem=None):
+    """Percentis de latência (ms) por etapa e do total, com a vazão mediana das etapas de scoring."""
+    if origem is not None:
+        registros = [registro for registro in registros if registro.get('origem') == origem]
+    tempos = {'total': [registro['total_ms'] for registro in registros]}
+    vazoes = {}
+    for registro in registros:
+        for nome, etapa in registro['etapas'].items():
+            tempos.setdefault(nome, []).append(etapa['ms'])
+            if 'linhas_por_s' in etapa:
+                vazoes.setdefault(nome, []).append(etapa['linhas_por_s'])
+    resumo = {}
+    for nome, valores in tempos.items():
+        if not valores:
+            continue
+        valores = np.asarray(valores, dtype=np.float64)
+        resumo[nome] = {
+            'buscas': len(valores),
+            'p50_ms': float(np.percentile(valores, 50)),
+            'p90_ms': float(np.percentile(valores, 90)),
+            'p99_ms': float(np.percentile(valores, 99)),
+            'max_ms': float(valores.max()),
+            'linhas_por_s_p50': float(np.percentile(vazoes[nome], 50)) if nome in vazoes else None,
+        }
+    return resumo
+
+
+def main():
+    from recrutamento.carregamento import PATH_DATA
+
+    parser = argparse.ArgumentParser(description="Percentis de latência por etapa a partir do log de tempos da busca.")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+    resumo = subcomandos.add_parser('resumo', help="p50/p90/p99 por etapa")
+    resumo.add_argument('--log', default=None, help=f"Log JSONL (padrão: {VARIAVEL_AMBIENTE_LOG} ou {os.path.join(PATH_DATA, ARQUIVO_LOG_TEMPOS)})")
+    resumo.add_argument('--origem', default=None, help="Só buscas desta origem (cache, tabela, paralelo, armazem)")
+    resumo.add_argument('--json', action='store_true', help="Imprime o resumo em JSON")
+    args = parser.parse_args()
+
+    caminho = args.log or caminho_log_tempos(PATH_DATA)
+    registros = ler_registros(caminho)
+    resultado = resumir_registros(registros, args.origem)
+    if args.json:
+        print(json.dumps(resultado, indent=2, ensure_ascii=False))
+        return
+    print(f"{len(registros)} buscas em {caminho}")
+    print(f"{'etapa':<22}{'buscas':>8}{'p50 (ms)':>11}{'p90 (ms)':>11}{'p99 (ms)':>11}{'máx (ms)':>11}{'linhas/s (p50)':>17}")
+    nomes = [nome for nome in ETAPAS_BUSCA if nome in resultado] + [nome for nome in resultado if nome not in ETAPAS_BUSCA]
+    for nome in nomes:
+        estat = resultado[nome]
+        vazao = f"{estat['linhas_por_s_p50']:,.0f}" if estat['linhas_por_s_p50'] is not None else '-'
+        print(f"{nome:<22}{estat['buscas']:>8}{estat['p50_ms']:>11.2f}{estat['p90_ms']:>11.2f}{estat['p99_ms']:>11.2f}{estat['max_ms']:>11.2f}{vazao:>17}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Layout compacto da base de candidatos em memória e relatório de bytes por candidato.
+
+Depois de montado o armazém de features (skill_* só no bitset uint64, idiomas em uint8 e a
+coluna one-hot ativa de cada feature categórica como posição int16), o DataFrame de candidatos
+que o app mantém em memória só precisa das colunas exibidas. Textos livres e flags continuam nos
+arquivos processados, lidos de novo só quando o armazém é remontado.
+
+Relatório (antes = CSV inteiro com os dtypes inferidos pelo pandas + matriz densa float32):
+    python -m recrutamento.memoria --multiplicar 10
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+COLUNAS_EXIBICAO_CANDIDATOS = ('id_candidato', 'nome', 'titulo_profissional')
+
+# Arrays do armazém que substituíram a matriz densa (n x colunas_modelo, float32)
+ARRAYS_LAYOUT_COMPACTO = ('ingles', 'espanhol', 'skills_densas', 'one_hot_candidato')
+
+
+def candidatos_para_exibicao(df_candidatos):
+    # Mesmo índice do DataFrame original: as linhas do armazém continuam valendo para iloc/to_numpy
+    return df_candidatos[[col for col in COLUNAS_EXIBICAO_CANDIDATOS if col in df_candidatos.columns]].copy()
+
+
+def bytes_objeto(obj, vistos=None):
+    """Bytes ocupados por obj e tudo o que ele referencia (objetos compartilhados contam uma vez)."""
+    if vistos is None:
+        vistos = set()
+    if id(obj) in vistos:
+        return 0
+    vistos.add(id(obj))
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        return int(np.sum(obj.memory_usage(deep=True)))
+    if isinstance(obj, np.ndarray):
+        total = obj.nbytes
+        if obj.dtype == object:
+            total += sum(bytes_objeto(item, vistos) for item in obj.ravel())
+        return total
+    total = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        total += sum(bytes_objeto(chave, vistos) + bytes_objeto(valor, vistos) for chave, valor in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        total += sum(bytes_objeto(item, vistos) for item in obj)
+    return total
+
+
+def relatorio_memoria(df_original, df_exibicao, armazem, multiplicar=1):
+    """
+    Bytes por candidato antes (DataFrame original + matriz densa) e depois (DataFrame de exibição
+    + layout compacto). Índices e ids são os mesmos nos dois casos.
+    """
+    n = max(1, len(df_original))
+    n_colunas = len(armazem['colunas_modelo'])
+    vistos = set()
+    indices = sum(bytes_objeto(armazem[chave], vistos) for chave in ('indice_skills', 'indices_prefiltro', 'ids', 'indice_por_id'))
+    componentes = [
+        ('DataFrame de candidatos', bytes_objeto(df_original), bytes_objeto(df_exibicao)),
+        # Antes: matriz float32 (n x colunas_modelo) + idiomas em float32
+        ('features do candidato', n * n_colunas * 4 + n * 8, sum(armazem[chave].nbytes for chave in ARRAYS_LAYOUT_COMPACTO)),
+        ('índices e ids (armazém)', indices, indices),
+    ]
+    total_antes = sum(antes for _, antes, _ in componentes)
+    total_depois = sum(depois for _, _, depois in componentes)
+
+    print(f"{len(df_original):,} candidatos | {len(df_original.columns)} colunas no CSV -> {len(df_exibicao.columns)} no DataFrame do app | {n_colunas} colunas no modelo")
+    print(f"{'componente':<28}{'antes (B/cand.)':>17}{'depois (B/cand.)':>18}{'redução':>10}")
+    for nome, antes, depois in componentes + [('total', total_antes, total_depois)]:
+        print(f"{nome:<28}{antes / n:>17,.1f}{depois / n:>18,.1f}{antes / max(depois, 1):>9.1f}x")
+    if multiplicar > 1:
+        n_projetado = len(df_original) * multiplicar
+        print(f"Base x{multiplicar} ({n_projetado:,} candidatos): antes {total_antes / n * n_projetado / 2 ** 20:,.0f} MB, "
+              f"depois {total_depois / n * n_projetado / 2 ** 20:,.0f} MB")
+    return {nome: {'antes': antes / n, 'depois': depois / n} for nome, antes, depois in componentes}
+
+
+def main():
+    import joblib
+
+    from recrutamento.carregamento import PATH_ARTIFACTS, PATH_DATA, ler_csv_processado, ler_dados_processados, mapas_engenharia
+    from recrutamento.scoring import construir_armazem_candidatos
+
+    parser = argparse.ArgumentParser(description="Relatório de memória por candidato (layout original x compacto).")
+    parser.add_argument('--dados', default=PATH_DATA)
+    parser.add_argument('--artefatos', default=PATH_ARTIFACTS)
+    parser.add_argument('--multiplicar', type=int, default=10, help="Projeta a memória para a base multiplicada por este fator")
+    args = parser.parse_args()
+
+    caminho_csv = os.path.join(args.dados, 'candidatos_processados.csv')
+    colunas_modelo = joblib.load(os.path.join(args.artefatos, 'colunas_modelo.joblib'))
+    mapas = mapas_engenharia(joblib.load(os.path.join(args.artefatos, 'artefatos_engenharia.joblib')))
+
+    df_original = ler_csv_processado(caminho_csv)
+    df_app = ler_dados_processados(caminho_csv)
+    armazem = construir_armazem_candidatos(df_app, colunas_modelo, mapas)
+    relatorio_memoria(df_original, candidatos_para_exibicao(df_app), armazem, args.multiplicar)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,620 @@
+"""
+Merge, tabela de modelagem, treino e exportação: as seções 5 a 12 do notebook como funções, para
+que o notebook e o pipeline por etapas (recrutamento/pipeline.py) usem a mesma implementação.
+Os hiperparâmetros da busca do Random Forest ficam em otimizar_modelo.
+"""
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.stats import randint
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import (
+    accuracy_score, classification_report, confusion_matrix, f1_score, make_scorer, precision_recall_fscore_support,
+    roc_auc_score
+)
+from sklearn.model_selection import RandomizedSearchCV, train_test_split
+
+from recrutamento.colunar import caminho_colunar, salvar_colunar
+from recrutamento.features import (
+    MAPA_NIVEL_ACADEMICO_CANDIDATO, MAPA_NIVEL_IDIOMA, MAPA_NIVEL_PROFISSIONAL_CANDIDATO, colunas_categoricas_modelagem,
+    compatibilidade_idioma, contar_skills_faltantes, contar_skills_match, contar_total_techs, texto_categorico
+)
+from recrutamento.tecnologias import TECNOLOGIAS_LISTA_CANDIDATOS, TECNOLOGIAS_LISTA_VAGAS
+
+
+#  Merge (seção 5)
+def montar_master(df_prospects_processado, df_vagas_processado, df_candidatos_processado):
+    print("\n--- Iniciando Merge dos DataFrames ---")
+    if df_prospects_processado.empty:
+        print("df_prospects_processado está vazio ou não definido. Merge não pode continuar sem prospecções.")
+        return pd.DataFrame()
+
+    if df_vagas_processado.empty:
+        print("Aviso: df_vagas_processado está vazio ou não definido. Merge com vagas será incompleto.")
+        df_vagas_processado_para_merge = pd.DataFrame(columns=['id_vaga'] + [col for col in df_vagas_processado.columns if col != 'id_vaga'])
+    else:
+        df_vagas_processado_para_merge = df_vagas_processado
+
+    if df_candidatos_processado.empty:
+        print("Aviso: df_candidatos_processado está vazio ou não definido. Merge com candidatos será incompleto.")
+        df_candidatos_processado_para_merge = pd.DataFrame(columns=['id_candidato'] + [col for col in df_candidatos_processado.columns if col != 'id_candidato'])
+    else:
+        df_candidatos_processado_para_merge = df_candidatos_processado
+
+    print(f"Linhas em df_prospects_processado: {len(df_prospects_processado)}")
+    print(f"Linhas em df_vagas_processado_para_merge: {len(df_vagas_processado_para_merge)}")
+
+    # ### *5.1. Merge: Prospects + Vagas*
+    df_combinado_temp = pd.merge(
+        df_prospects_processado,
+        df_vagas_processado_para_merge,
+        left_on='id_vaga_origem',
+        right_on='id_vaga',
+        how='left',
+        suffixes=('_prospect', '_vaga_merged')
+    )
+    print(f"Linhas após merge com vagas: {len(df_combinado_temp)}")
+
+    if 'id_vaga' in df_combinado_temp.columns and 'id_vaga_origem' in df_combinado_temp.columns and 'id_vaga' != 'id_vaga_origem':
+        df_combinado_temp = df_combinado_temp.drop(columns=['id_vaga'])
+        print("Coluna 'id_vaga' (duplicada do merge com vagas) removida.")
+
+    # ### *5.2. Merge: (Prospects + Vagas) + Candidatos*
+    print(f"Linhas em df_candidatos_processado_para_merge: {len(df_candidatos_processado_para_merge)}")
+    df_master = pd.merge(
+        df_combinado_temp,
+        df_candidatos_processado_para_merge,
+        left_on='id_candidato_origem',
+        right_on='id_candidato',
+        how='left',
+        suffixes=('_vaga', '_candidato')
+    )
+    print(f"Linhas após merge com candidatos (final df_master): {len(df_master)}")
+
+    if 'id_candidato_candidato' in df_master.columns: # Se o sufixo _candidato foi adicionado a id_candidato
+        df_master = df_master.drop(columns=['id_candidato_candidato'])
+        print("Coluna 'id_candidato_candidato' (duplicada do merge com candidatos) removida.")
+    elif 'id_candidato_y' in df_master.columns: # Outro sufixo comum do Pandas
+        df_master = df_master.drop(columns=['id_candidato_y'])
+        if 'id_candidato_x' in df_master.columns:
+            df_master.rename(columns={'id_candidato_x': 'id_candidato'}, inplace=True)
+        print("Coluna 'id_candidato_y' removida e 'id_candidato_x' renomeada para 'id_candidato'.")
+
+    print("\nMerge concluído! DataFrame 'df_master' criado.")
+    print(f"Número de linhas em df_master: {len(df_master)}")
+    print(f"Número de colunas em df_master: {len(df_master.columns)}")
+    return df_master
+
+
+#  Tabela de modelagem (seções 6 a 8)
+def preparar_modelagem(df_master):
+    if df_master.empty:
+        print("df_master está vazio. Preparação para modelagem não pode continuar.")
+        return pd.DataFrame()
+
+    print("\n--- Iniciando Preparação Final para Modelagem ---")
+    # ### *6.1. Limpeza de linhas com merges incompletos*
+    print(f"\nLinhas em df_master antes da limpeza de nulos do merge: {len(df_master)}")
+
+    coluna_chave_vaga_check = 'titulo_vaga'
+    coluna_chave_candidato_check = 'texto_completo_candidato'
+    if coluna_chave_vaga_check + "_vaga" in df_master.columns:
+        coluna_chave_vaga_check = coluna_chave_vaga_check + "_vaga"
+    elif coluna_chave_vaga_check + "_vaga_merged" in df_master.columns:
+        coluna_chave_vaga_check = coluna_chave_vaga_check + "_vaga_merged"
+
+    if coluna_chave_candidato_check + "_candidato" in df_master.columns:
+         coluna_chave_candidato_check = coluna_chave_candidato_check + "_candidato"
+
+    colunas_para_dropna_merge = []
+    if coluna_chave_vaga_check in df_master.columns:
+        colunas_para_dropna_merge.append(coluna_chave_vaga_check)
+    else:
+        print(f"Aviso: A coluna chave para vagas '{coluna_chave_vaga_check}' (ou com sufixo) não foi encontrada em df_master.")
+
+    if coluna_chave_candidato_check in df_master.columns:
+        colunas_para_dropna_merge.append(coluna_chave_candidato_check)
+    else:
+        print(f"Aviso: A coluna chave para candidatos '{coluna_chave_candidato_check}' (ou com sufixo) não foi encontrada em df_master.")
+
+    df_limpo = df_master.copy()
+    if colunas_para_dropna_merge:
+        for col_check in colunas_para_dropna_merge:
+            df_limpo = df_limpo[df_limpo[col_check].notna()]
+
+        df_limpo.dropna(subset=colunas_para_dropna_merge, inplace=True)
+        print(f"Linhas em df_limpo após remover nulos de merge usando {colunas_para_dropna_merge}: {len(df_limpo)} linhas.")
+    else:
+        print("Aviso: Nenhuma coluna chave identificada para dropna de merges incompletos. df_limpo será uma cópia de df_master.")
+
+
+    # ### *6.2. Criação da variável alvo foi_contratado*
+    situacoes_sucesso_contratado = [
+        'contratado pela decision', 'contratado como hunting', 'aprovado', 'proposta aceita'
+    ]
+    situacoes_nao_sucesso_contratado = [
+        'não aprovado pelo cliente', 'não aprovado pelo rh', 'não aprovado pelo requisitante',
+        'desistiu', 'desistiu da contratação', 'sem interesse nesta vaga', 'recusado',
+        'reprovado', 'não aprovado', 'desclassificado', 'perfil não aderente', 'fora do perfil',
+        'não evoluiu', 'não selecionado'
+    ]
+
+    if 'situacao_candidato' in df_limpo.columns:
+        df_limpo.loc[:, 'foi_contratado_temp'] = -1
+
+        cond_sucesso = df_limpo['situacao_candidato'].str.lower().isin([s.lower() for s in situacoes_sucesso_contratado])
+        cond_nao_sucesso = df_limpo['situacao_candidato'].str.lower().isin([s.lower() for s in situacoes_nao_sucesso_contratado])
+
+        df_limpo.loc[cond_sucesso, 'foi_contratado_temp'] = 1
+        df_limpo.loc[cond_nao_sucesso, 'foi_contratado_temp'] = 0
+
+        df_modelagem = df_limpo[df_limpo['foi_contratado_temp'] != -1].copy()
+        df_modelagem.rename(columns={'foi_contratado_temp': 'foi_contratado'}, inplace=True)
+
+        print(f"Coluna 'foi_contratado' criada e df_modelagem filtrado.")
+        print(f"Linhas no df_modelagem final: {len(df_modelagem)}")
+    else:
+        print("Erro: Coluna 'situacao_candidato' não encontrada em df_limpo. Variável alvo não pôde ser criada.")
+        df_modelagem = df_limpo.copy()
+        if not df_modelagem.empty:
+             df_modelagem['foi_contratado'] = -1
+    return df_modelagem
+
+
+# Nome de coluna com possíveis sufixos do merge
+def obter_nome_coluna_eda(df, nome_base, sufixos_possiveis=['_vaga', '_candidato', '_vaga_merged', '']):
+    for sufixo in sufixos_possiveis:
+        nome_col_testado = nome_base + sufixo
+        if nome_col_testado in df.columns:
+            return nome_col_testado
+    # Se nenhum sufixo funcionar, tentar o nome base sem sufixo se ele existir
+    if nome_base in df.columns:
+        return nome_base
+    print(f"Aviso (EDA): Coluna base '{nome_base}' (ou com sufixos comuns) não encontrada no DataFrame.")
+    return None
+
+
+def calcular_features_eda(df_modelagem):
+    if df_modelagem.empty:
+        print("df_modelagem está vazio. EDA ignorada.")
+        return df_modelagem
+
+    print("\n--- Iniciando Recálculo de Features de EDA no df_modelagem ---")
+    # ### *7.1. Recálculo de features de EDA no df_modelagem*
+    # Colunas convertidas e features novas são montadas à parte e entram no df_modelagem de uma vez
+    # no final (atribuir uma a uma fragmenta o DataFrame e dispara PerformanceWarning do pandas)
+    colunas_eda = {}
+    col_nivel_ingles_cand_nome = obter_nome_coluna_eda(df_modelagem, 'nivel_ingles_ordinal', ['_candidato', ''])
+    col_nivel_ingles_vaga_nome = obter_nome_coluna_eda(df_modelagem, 'nivel_ingles_ordinal', ['_vaga', '_vaga_merged', ''])
+
+    if col_nivel_ingles_cand_nome and col_nivel_ingles_vaga_nome:
+        # Assegurar que são numéricos antes de comparar, convertendo não numéricos para 0 (ou NaN)
+        for col in (col_nivel_ingles_cand_nome, col_nivel_ingles_vaga_nome):
+            colunas_eda[col] = pd.to_numeric(df_modelagem[col], errors='coerce').fillna(0)
+        colunas_eda['compat_ingles'] = compatibilidade_idioma(colunas_eda[col_nivel_ingles_cand_nome], colunas_eda[col_nivel_ingles_vaga_nome])
+    else:
+        print("Aviso (EDA): Colunas para 'compat_ingles' não encontradas. Preenchendo com 0.")
+        colunas_eda['compat_ingles'] = 0
+
+    col_nivel_espanhol_cand_nome = obter_nome_coluna_eda(df_modelagem, 'nivel_espanhol_ordinal', ['_candidato', ''])
+    col_nivel_espanhol_vaga_nome = obter_nome_coluna_eda(df_modelagem, 'nivel_espanhol_ordinal', ['_vaga', '_vaga_merged', ''])
+    if col_nivel_espanhol_cand_nome and col_nivel_espanhol_vaga_nome:
+        for col in (col_nivel_espanhol_cand_nome, col_nivel_espanhol_vaga_nome):
+            colunas_eda[col] = pd.to_numeric(df_modelagem[col], errors='coerce').fillna(0)
+        colunas_eda['compat_espanhol'] = compatibilidade_idioma(colunas_eda[col_nivel_espanhol_cand_nome], colunas_eda[col_nivel_espanhol_vaga_nome])
+    else:
+        print("Aviso (EDA): Colunas para 'compat_espanhol' não encontradas. Preenchendo com 0.")
+        colunas_eda['compat_espanhol'] = 0
+
+    tech_cols_vaga_eda = [col for col in df_modelagem.columns if col.startswith('tech_') and not col.endswith('_candidato')]
+    skill_cols_candidato_eda = [col for col in df_modelagem.columns if col.startswith('skill_')]
+
+    # contar_total_techs/contar_skills_match já tratam não numéricos como 0, então leem as colunas originais;
+    # a contagem fica inteira, como a coluna de zeros em que o treino a gravava
+    colunas_eda['total_techs_vaga'] = contar_total_techs(df_modelagem, tech_cols_vaga_eda).astype('int64')
+    if tech_cols_vaga_eda:
+        colunas_eda.update(df_modelagem[tech_cols_vaga_eda].apply(pd.to_numeric, errors='coerce').fillna(0).items())
+    else:
+        print("Aviso (EDA): Nenhuma coluna 'tech_*' (vaga) encontrada para calcular 'total_techs_vaga'.")
+
+    if tech_cols_vaga_eda and skill_cols_candidato_eda:
+        colunas_eda.update(df_modelagem[skill_cols_candidato_eda].apply(pd.to_numeric, errors='coerce').fillna(0).items())
+        # Pares tech_*/skill_* pelo nome base, como no scoring do app (recrutamento/features.py)
+        colunas_eda['skills_match_count'] = contar_skills_match(df_modelagem, tech_cols_vaga_eda, skill_cols_candidato_eda)
+    else:
+        print("Aviso (EDA): Colunas 'tech_*' (vaga) ou 'skill_*' (candidato) não encontradas para 'skills_match_count'.")
+        colunas_eda['skills_match_count'] = pd.Series(0, index=df_modelagem.index)
+
+    colunas_eda['skills_faltantes_vaga'] = contar_skills_faltantes(colunas_eda['total_techs_vaga'], colunas_eda['skills_match_count'])
+
+    # Colunas já existentes mantêm a posição; as novas vão para o final, na ordem em que foram calculadas
+    ordem_colunas = list(df_modelagem.columns) + [col for col in colunas_eda if col not in df_modelagem.columns]
+    df_modelagem = pd.concat(
+        [df_modelagem.drop(columns=list(colunas_eda), errors='ignore'), pd.DataFrame(colunas_eda, index=df_modelagem.index)], axis=1
+    )[ordem_colunas]
+    print("Features de EDA ('compat_ingles', 'compat_espanhol', 'skills_faltantes_vaga', 'total_techs_vaga', 'skills_match_count') recalculadas/garantidas em df_modelagem.")
+    return df_modelagem
+
+
+def preparar_features_modelo(df_modelagem, colunas_vagas, colunas_candidatos):
+    """
+    Seção 8: one-hot, seleção das features e divisão treino/teste. colunas_vagas/colunas_candidatos
+    são as colunas das tabelas processadas (para as tech_*/skill_*). Devolve X, y, X_train, X_test,
+    y_train, y_test (vazios se não houver alvo válido).
+    """
+    if df_modelagem.empty or 'foi_contratado' not in df_modelagem.columns or not (df_modelagem['foi_contratado'] != -1).any():
+        print("Modelagem não pode prosseguir: df_modelagem está vazio, sem alvo 'foi_contratado' ou sem alvos válidos.")
+        return pd.DataFrame(), pd.Series(dtype='int'), pd.DataFrame(), pd.DataFrame(), pd.Series(dtype='int'), pd.Series(dtype='int')
+
+    print("\n--- Iniciando Preparação de Features para Modelagem ---")
+
+    # Features numéricas diretas (já existem ou são criadas e precisam ser selecionadas)
+    features_numericas_selecionadas_base = []
+
+    nivel_ingles_vaga_col = obter_nome_coluna_eda(df_modelagem, 'nivel_ingles_ordinal', ['_vaga', '_vaga_merged', ''])
+    if nivel_ingles_vaga_col: features_numericas_selecionadas_base.append(nivel_ingles_vaga_col)
+    nivel_espanhol_vaga_col = obter_nome_coluna_eda(df_modelagem, 'nivel_espanhol_ordinal', ['_vaga', '_vaga_merged', ''])
+    if nivel_espanhol_vaga_col: features_numericas_selecionadas_base.append(nivel_espanhol_vaga_col)
+    vaga_sap_bool_col = obter_nome_coluna_eda(df_modelagem, 'vaga_sap_bool', ['_vaga', '_vaga_merged', ''])
+    if vaga_sap_bool_col is None and 'vaga_sap_bool' in df_modelagem.columns:
+        vaga_sap_bool_col = 'vaga_sap_bool'
+    if vaga_sap_bool_col and vaga_sap_bool_col in df_modelagem.columns:
+         features_numericas_selecionadas_base.append(vaga_sap_bool_col)
+    nivel_ingles_cand_col = obter_nome_coluna_eda(df_modelagem, 'nivel_ingles_ordinal', ['_candidato', ''])
+    if nivel_ingles_cand_col: features_numericas_selecionadas_base.append(nivel_ingles_cand_col)
+    nivel_espanhol_cand_col = obter_nome_coluna_eda(df_modelagem, 'nivel_espanhol_ordinal', ['_candidato', ''])
+    if nivel_espanhol_cand_col: features_numericas_selecionadas_base.append(nivel_espanhol_cand_col)
+
+    features_numericas_ja_criadas_eda = ['compat_ingles', 'compat_espanhol', 'skills_faltantes_vaga', 'total_techs_vaga', 'skills_match_count']
+    for fn_criada_eda in features_numericas_ja_criadas_eda:
+        if fn_criada_eda in df_modelagem.columns:
+            features_numericas_selecionadas_base.append(fn_criada_eda)
+
+    if 'comentario_tem_valor_monetario' in df_modelagem.columns:
+        features_numericas_selecionadas_base.append('comentario_tem_valor_monetario')
+
+    features_numericas_selecionadas_final = sorted(list(set(col for col in features_numericas_selecionadas_base if col in df_modelagem.columns and (df_modelagem[col].dtype == 'int64' or df_modelagem[col].dtype == 'float64' or df_modelagem[col].dtype == 'int32'))))
+    print(f"\nFeatures numéricas selecionadas: {features_numericas_selecionadas_final}")
+
+    # Features categóricas para One-Hot Encoding
+    # Da VAGA e do CANDIDATO (mesma seleção usada na verificação de paridade com o app)
+    features_categoricas_selecionadas_base = colunas_categoricas_modelagem(df_modelagem)
+    for col_fc in features_categoricas_selecionadas_base:
+        df_modelagem[col_fc] = texto_categorico(df_modelagem[col_fc])
+
+
+    features_categoricas_selecionadas_final = sorted(list(set(col for col in features_categoricas_selecionadas_base if col in df_modelagem.columns)))
+    print(f"Features categóricas selecionadas para One-Hot Encoding: {features_categoricas_selecionadas_final}")
+    df_modelagem_encoded = pd.get_dummies(df_modelagem,
+                                          columns=features_categoricas_selecionadas_final,
+                                          dummy_na=False,
+                                          drop_first=True)
+    print(f"\nNúmero de colunas em df_modelagem_encoded após One-Hot Encoding: {len(df_modelagem_encoded.columns)}")
+
+    colunas_features_finais_modelo = features_numericas_selecionadas_final.copy()
+    for col_base_cat in features_categoricas_selecionadas_final:
+        cols_from_dummy_cat = [col for col in df_modelagem_encoded.columns if col.startswith(str(col_base_cat) + '_')]
+        colunas_features_finais_modelo.extend(cols_from_dummy_cat)
+
+    colunas_features_finais_modelo = sorted(list(set(col for col in colunas_features_finais_modelo if col in df_modelagem_encoded.columns)))
+
+    colunas_a_remover_de_features = ['foi_contratado', 'duracao_etapa_dias', 'id_vaga_origem', 'id_candidato_origem', 'id_vaga', 'id_candidato']
+    colunas_features_finais_modelo = [col for col in colunas_features_finais_modelo if col not in colunas_a_remover_de_features]
+
+    colunas_tech_vaga_finais = [col for col in df_modelagem_encoded.columns if col.startswith('tech_') and col in colunas_vagas]
+    colunas_skill_candidato_finais = [col for col in df_modelagem_encoded.columns if col.startswith('skill_') and col in colunas_candidatos]
+
+    colunas_features_finais_modelo.extend(colunas_tech_vaga_finais)
+    colunas_features_finais_modelo.extend(colunas_skill_candidato_finais)
+    colunas_features_finais_modelo = sorted(list(set(colunas_features_finais_modelo)))
+
+    print(f"\nNúmero de features finais para o modelo: {len(colunas_features_finais_modelo)}")
+
+
+    X = df_modelagem_encoded[colunas_features_finais_modelo]
+    y = df_modelagem_encoded['foi_contratado']
+    X = X.fillna(0)
+
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.3, random_state=42, stratify=y
+    )
+
+    print("\nFormatos dos dataframes de treino e teste:")
+    print(f"X_train: {X_train.shape}, X_test: {X_test.shape}")
+    print(f"y_train: {y_train.shape}, y_test: {y_test.shape}")
+    if not y_train.empty:
+        print("\nDistribuição do alvo no conjunto de treino:")
+        print(y_train.value_counts(normalize=True))
+    if not y_test.empty:
+        print("\nDistribuição do alvo no conjunto de teste:")
+        print(y_test.value_counts(normalize=True))
+
+    print("\nAlgumas colunas de X_train (primeiras 5 linhas, primeiras 5 colunas) para verificação:")
+    if not X_train.empty:
+        print(X_train.iloc[:5, :min(5, X_train.shape[1])])
+    else:
+        print("X_train está vazio.")
+    return X, y, X_train, X_test, y_train, y_test
+
+
+#  Treino (seções 9 a 11)
+def treinar_baseline(X_train, X_test, y_train, y_test):
+    if X_train.empty or y_train.empty:
+        print("Treinamento de modelos não pode prosseguir: X_train ou y_train estão vazios.")
+        return None
+
+    print("\n--- Iniciando Treinamento de Modelos Baseline ---")
+    # ### *9.1. Regressão Logística*
+    log_reg_model = LogisticRegression(class_weight='balanced', random_state=42, max_iter=1000, solver='liblinear')
+    log_reg_model.fit(X_train, y_train)
+
+    y_pred_lr = log_reg_model.predict(X_test)
+    y_pred_proba_lr = log_reg_model.predict_proba(X_test)[:, 1]
+
+    accuracy_lr = accuracy_score(y_test, y_pred_lr)
+    roc_auc_lr = roc_auc_score(y_test, y_pred_proba_lr) if len(np.unique(y_test)) > 1 else 0.5
+    conf_matrix_lr = confusion_matrix(y_test, y_pred_lr)
+    class_report_lr = classification_report(y_test, y_pred_lr, target_names=['Não Contratado (0)', 'Contratado (1)'], zero_division=0)
+
+    print("\n--- Resultados da Regressão Logística ---")
+    print(f"Acurácia: {accuracy_lr:.4f}")
+    print(f"AUC-ROC: {roc_auc_lr:.4f}")
+    print("\nMatriz de Confusão:")
+    print(conf_matrix_lr)
+    print("\nRelatório de Classificação:")
+    print(class_report_lr)
+
+    # ### *9.2. Random Forest Classifier*
+    rf_clf_model = RandomForestClassifier(n_estimators=100, class_weight='balanced', random_state=42, n_jobs=-1, min_samples_split=10, min_samples_leaf=5)
+    rf_clf_model.fit(X_train, y_train)
+
+    y_pred_rf = rf_clf_model.predict(X_test)
+    y_pred_proba_rf = rf_clf_model.predict_proba(X_test)[:, 1]
+
+    accuracy_rf = accuracy_score(y_test, y_pred_rf)
+    roc_auc_rf = roc_auc_score(y_test, y_pred_proba_rf) if len(np.unique(y_test)) > 1 else 0.5
+    conf_matrix_rf = confusion_matrix(y_test, y_pred_rf)
+    class_report_rf = classification_report(y_test, y_pred_rf, target_names=['Não Contratado (0)', 'Contratado (1)'], zero_division=0)
+
+    print("\n--- Resultados do Random Forest Classifier ---")
+    print(f"Acurácia: {accuracy_rf:.4f}")
+    print(f"AUC-ROC: {roc_auc_rf:.4f}")
+    print("\nMatriz de Confusão:")
+    print(conf_matrix_rf)
+    print("\nRelatório de Classificação:")
+    print(class_report_rf)
+
+    if hasattr(rf_clf_model, 'feature_importances_') and not X_train.empty:
+        feature_importances_rf = pd.Series(rf_clf_model.feature_importances_, index=X_train.columns).sort_values(ascending=False)
+        print("\nTop 20 Features Mais Importantes (Random Forest Baseline):")
+        print(feature_importances_rf.head(20))
+    else:
+        print("Não foi possível calcular a importância das features para rf_clf_model.")
+    return rf_clf_model
+
+
+def otimizar_modelo(rf_clf_model, X_train, X_test, y_train, y_test):
+    """Seções 10.1 a 10.3: devolve o Random Forest otimizado e a importância das features (ou None, None)."""
+    if rf_clf_model is None or X_test.empty or y_test.empty: # Checar se o modelo foi treinado
+        print("Análise de resultados e otimização não pode prosseguir: modelo RF baseline não treinado ou dados de teste vazios.")
+        return None, None
+
+    print("\n--- Iniciando Análise de Resultados e Otimização ---")
+    # ### *10.1. Ajuste do Threshold de Decisão do Random Forest*
+    y_pred_proba_rf_classe1_test = rf_clf_model.predict_proba(X_test)[:, 1]
+    print("\n--- Ajuste de Threshold para Random Forest ---")
+    thresholds_para_testar_rf = [0.30, 0.35, 0.40, 0.45, 0.50, 0.55]
+    resultados_threshold_rf = []
+    for thr_rf in thresholds_para_testar_rf:
+        y_pred_rf_novo_thr = (y_pred_proba_rf_classe1_test >= thr_rf).astype(int)
+        precision_rf, recall_rf, f1_rf, _ = precision_recall_fscore_support(y_test, y_pred_rf_novo_thr, labels=[0,1], zero_division=0)
+        conf_matrix_thr_rf = confusion_matrix(y_test, y_pred_rf_novo_thr)
+        accuracy_geral_thr_rf = accuracy_score(y_test, y_pred_rf_novo_thr)
+        resultados_threshold_rf.append({
+            'threshold': thr_rf, 'accuracy': accuracy_geral_thr_rf,
+            'recall_classe1': recall_rf[1], 'precision_classe1': precision_rf[1], 'f1_classe1': f1_rf[1],
+            'TN': conf_matrix_thr_rf[0,0], 'FP': conf_matrix_thr_rf[0,1],
+            'FN': conf_matrix_thr_rf[1,0], 'TP': conf_matrix_thr_rf[1,1]
+        })
+    df_resultados_threshold_rf = pd.DataFrame(resultados_threshold_rf)
+    print("\n--- Resumo dos Resultados por Threshold (Random Forest Baseline) ---")
+    print(df_resultados_threshold_rf[['threshold', 'accuracy', 'recall_classe1', 'precision_classe1', 'f1_classe1', 'TP', 'FN']])
+
+
+    # ### *10.2. Otimização de hiperparâmetros do Random Forest*
+    param_dist_rf_opt = {
+        'n_estimators': randint(100, 400), 'max_depth': [None, 10, 20, 30],
+        'min_samples_split': randint(5, 30), 'min_samples_leaf': randint(2, 15),
+        'class_weight': ['balanced', 'balanced_subsample'], 'max_features': ['sqrt', 'log2', 0.4, None]
+    }
+    scorer_f1_classe1_opt = make_scorer(f1_score, pos_label=1, zero_division=0)
+    random_search_rf_opt = RandomizedSearchCV(
+        estimator=RandomForestClassifier(random_state=42, n_jobs=-1),
+        param_distributions=param_dist_rf_opt, n_iter=15, cv=3,
+        scoring=scorer_f1_classe1_opt, random_state=42, n_jobs=-1, verbose=1
+    )
+    print("\nIniciando RandomizedSearchCV para Random Forest...")
+    random_search_rf_opt.fit(X_train, y_train)
+
+    print("\nMelhores Hiperparâmetros encontrados para Random Forest:")
+    print(random_search_rf_opt.best_params_)
+    print(f"\nMelhor F1-score (classe 1) na validação cruzada: {random_search_rf_opt.best_score_:.4f}")
+
+    best_rf_clf_otimizado = random_search_rf_opt.best_estimator_
+
+    y_pred_best_rf_otimizado = best_rf_clf_otimizado.predict(X_test)
+    y_pred_proba_best_rf_otimizado = best_rf_clf_otimizado.predict_proba(X_test)[:, 1]
+
+    accuracy_best_rf_otimizado = accuracy_score(y_test, y_pred_best_rf_otimizado)
+    roc_auc_best_rf_otimizado = roc_auc_score(y_test, y_pred_proba_best_rf_otimizado) if len(np.unique(y_test)) > 1 else 0.5
+    conf_matrix_best_rf_otimizado = confusion_matrix(y_test, y_pred_best_rf_otimizado)
+    class_report_best_rf_otimizado = classification_report(y_test, y_pred_best_rf_otimizado, target_names=['Não Contratado (0)', 'Contratado (1)'], zero_division=0)
+
+    print("\n--- Resultados do Random Forest Otimizado ---")
+    print(f"Acurácia: {accuracy_best_rf_otimizado:.4f}")
+    print(f"AUC-ROC: {roc_auc_best_rf_otimizado:.4f}")
+    print("\nMatriz de Confusão:")
+    print(conf_matrix_best_rf_otimizado)
+    print("\nRelatório de Classificação:")
+    print(class_report_best_rf_otimizado)
+
+    # ### *10.3. Importância das Features do Modelo Final*
+    feature_importances_final_model = None
+    if hasattr(best_rf_clf_otimizado, 'feature_importances_'):
+        feature_importances_final_model = pd.Series(best_rf_clf_otimizado.feature_importances_, index=X_train.columns).sort_values(ascending=False)
+        print("\nTop 20 Features Mais Importantes (Modelo Random Forest Otimizado - FINAL):")
+        print(feature_importances_final_model.head(20))
+    else:
+        print("Não foi possível calcular a importância das features do modelo otimizado.")
+    return best_rf_clf_otimizado, feature_importances_final_model
+
+
+def salvar_grafico_importancias(feature_importances_final_model, caminho):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.figure(figsize=(10,12))
+    sns.barplot(x=feature_importances_final_model.head(20).values, y=feature_importances_final_model.head(20).index)
+    plt.title('Top 20 Features Mais Importantes - Random Forest Otimizado')
+    plt.xlabel('Importância da Feature')
+    plt.ylabel('Feature')
+    plt.tight_layout()
+    plt.savefig(caminho) # Salvar figura
+    print(f"Gráfico de importância das features salvo em {caminho}")
+
+
+def selecionar_exemplos(best_rf_clf_otimizado, X_test, y_test, feature_importances_final_model):
+    """Seção 11: exemplos de verdadeiro positivo e verdadeiro negativo do teste (DataFrames de uma linha ou None)."""
+    exemplo_tp_df, exemplo_tn_df = None, None
+    if best_rf_clf_otimizado is None or X_test.empty or y_test.empty:
+        print("Demonstração com exemplos não pode prosseguir: modelo otimizado não treinado ou dados de teste X_test/y_test vazios.")
+        return exemplo_tp_df, exemplo_tn_df
+
+    print("\n--- Iniciando Demonstração com Exemplos do Conjunto de Teste ---")
+    # ### *11.1. Selecionando exemplos significativos do conjunto de teste*
+    y_pred_proba_test_demo = best_rf_clf_otimizado.predict_proba(X_test)[:, 1]
+    prediction_threshold_final_demo = 0.50
+    y_pred_test_binario_demo = (y_pred_proba_test_demo >= prediction_threshold_final_demo).astype(int)
+
+    df_resultados_teste_demo = pd.DataFrame({
+        'y_real': y_test.values,
+        'y_predito_binario': y_pred_test_binario_demo,
+        'probabilidade_contratado': y_pred_proba_test_demo
+    }, index=X_test.index)
+
+    tps_demo = df_resultados_teste_demo[
+        (df_resultados_teste_demo['y_real'] == 1) & (df_resultados_teste_demo['y_predito_binario'] == 1)
+    ].sort_values(by='probabilidade_contratado', ascending=False)
+
+    tns_demo = df_resultados_teste_demo[
+        (df_resultados_teste_demo['y_real'] == 0) & (df_resultados_teste_demo['y_predito_binario'] == 0)
+    ].sort_values(by='probabilidade_contratado', ascending=True)
+
+    indice_tp_exemplo_demo, indice_tn_exemplo_demo = None, None
+    if not tps_demo.empty:
+        indice_tp_exemplo_demo = tps_demo.index[0]
+        exemplo_tp_df = X_test.loc[[indice_tp_exemplo_demo]]
+        print(f"\n--- Exemplo de Verdadeiro Positivo (TP) Selecionado (Índice Original: {indice_tp_exemplo_demo}) ---")
+        print(f"Probabilidade de Contratação (prevista): {tps_demo.loc[indice_tp_exemplo_demo, 'probabilidade_contratado']:.4f}")
+    else:
+        print("Não foram encontrados Verdadeiros Positivos com o threshold atual para demonstração.")
+
+    if not tns_demo.empty:
+        indice_tn_exemplo_demo = tns_demo.index[0]
+        exemplo_tn_df = X_test.loc[[indice_tn_exemplo_demo]]
+        print(f"\n--- Exemplo de Verdadeiro Negativo (TN) Selecionado (Índice Original: {indice_tn_exemplo_demo}) ---")
+        print(f"Probabilidade de Contratação (prevista): {tns_demo.loc[indice_tn_exemplo_demo, 'probabilidade_contratado']:.4f}")
+    else:
+        print("Não foram encontrados Verdadeiros Negativos com o threshold atual para demonstração.")
+
+    # ### *11.2. Analisando as Features mais importantes para os exemplos selecionados*
+    if isinstance(feature_importances_final_model, pd.Series):
+        top_10_features_demo = feature_importances_final_model.head(10).index.tolist()
+        if exemplo_tp_df is not None:
+            print(f"\n--- Valores das Top 10 Features para o Exemplo TP (Índice Original: {indice_tp_exemplo_demo}) ---")
+            print(exemplo_tp_df[top_10_features_demo].transpose().rename(columns={exemplo_tp_df.index[0]: 'Valor no Exemplo TP'}))
+        if exemplo_tn_df is not None:
+            print(f"\n--- Valores das Top 10 Features para o Exemplo TN (Índice Original: {indice_tn_exemplo_demo}) ---")
+            print(exemplo_tn_df[top_10_features_demo].transpose().rename(columns={exemplo_tn_df.index[0]: 'Valor no Exemplo TN'}))
+    else:
+        print("Importância das features ('feature_importances_final_model') não calculada ou não é uma Series.")
+    return exemplo_tp_df, exemplo_tn_df
+
+
+#  Exportação para o app (seção 12)
+def exportar_artefatos(df_vagas_processado, df_candidatos_processado, best_rf_clf_otimizado, X, X_train,
+                       exemplo_tp_df, exemplo_tn_df, path_data_processed, path_artifacts):
+    """Grava as tabelas processadas, o modelo, as colunas, os artefatos de engenharia e os exemplos; devolve os caminhos gravados."""
+    print("\n--- Iniciando Preparação de Arquivos para Streamlit ---")
+    arquivos_gravados = []
+
+    for df_processado, nome_df, nome_csv in ((df_vagas_processado, 'df_vagas_processado', 'vagas_processadas.csv'), (df_candidatos_processado, 'df_candidatos_processado', 'candidatos_processados.csv')):
+        if isinstance(df_processado, pd.DataFrame) and not df_processado.empty:
+            try:
+                df_processado.to_csv(os.path.join(path_data_processed, nome_csv), index=False)
+                arquivos_gravados.append(os.path.join(path_data_processed, nome_csv))
+                print(f"DataFrame '{nome_df}' (processado) salvo em '{os.path.join(path_data_processed, nome_csv)}'")
+            except Exception as e:
+                print(f"Erro ao salvar {nome_df} (processado): {e}")
+        else:
+            print(f"DataFrame '{nome_df}' não encontrado, não é DataFrame ou vazio. Não foi salvo (processado).")
+
+    # Cópias colunares (Feather, dtypes explícitos) que o app lê por memory-map no lugar dos CSVs
+    try:
+        for df_colunar, nome_df_colunar, nome_csv_colunar in ((df_vagas_processado, 'df_vagas_processado', 'vagas_processadas.csv'), (df_candidatos_processado, 'df_candidatos_processado', 'candidatos_processados.csv')):
+            if isinstance(df_colunar, pd.DataFrame) and not df_colunar.empty:
+                caminho_saida_colunar = caminho_colunar(os.path.join(path_data_processed, nome_csv_colunar))
+                salvar_colunar(df_colunar, caminho_saida_colunar)
+                arquivos_gravados.append(caminho_saida_colunar)
+                print(f"DataFrame '{nome_df_colunar}' salvo em formato colunar em '{caminho_saida_colunar}'")
+    except Exception as e:
+        print(f"Erro ao salvar as cópias colunares (Feather): {e}")
+
+    # Salvar o modelo otimizado final
+    if best_rf_clf_otimizado is not None:
+        joblib.dump(best_rf_clf_otimizado, os.path.join(path_artifacts, 'modelo_recrutamento_rf.joblib'))
+        arquivos_gravados.append(os.path.join(path_artifacts, 'modelo_recrutamento_rf.joblib'))
+        print(f"Modelo 'best_rf_clf_otimizado' salvo em '{os.path.join(path_artifacts, 'modelo_recrutamento_rf.joblib')}'")
+    else:
+        print("Variável 'best_rf_clf_otimizado' não encontrada ou é None. Nenhum modelo salvo.")
+
+    # Salvar as colunas do modelo
+    colunas_para_salvar_joblib = None
+    if isinstance(X, pd.DataFrame) and not X.empty:
+        colunas_para_salvar_joblib = X.columns.tolist()
+    elif isinstance(X_train, pd.DataFrame) and not X_train.empty:
+        colunas_para_salvar_joblib = X_train.columns.tolist()
+
+    if colunas_para_salvar_joblib:
+        joblib.dump(colunas_para_salvar_joblib, os.path.join(path_artifacts, 'colunas_modelo.joblib'))
+        arquivos_gravados.append(os.path.join(path_artifacts, 'colunas_modelo.joblib'))
+        print(f"{len(colunas_para_salvar_joblib)} colunas do modelo salvas em '{os.path.join(path_artifacts, 'colunas_modelo.joblib')}'")
+    else:
+        print("Nenhuma lista de colunas (X ou X_train) encontrada para salvar.")
+
+    artefatos_para_streamlit = {
+        'mapa_nivel_idioma': MAPA_NIVEL_IDIOMA,
+        'mapa_nivel_academico_candidato': MAPA_NIVEL_ACADEMICO_CANDIDATO,
+        'mapa_nivel_profissional_candidato': MAPA_NIVEL_PROFISSIONAL_CANDIDATO,
+        'tecnologias_lista_vagas': TECNOLOGIAS_LISTA_VAGAS,
+        'tecnologias_lista_candidatos': TECNOLOGIAS_LISTA_CANDIDATOS,
+    }
+    joblib.dump(artefatos_para_streamlit, os.path.join(path_artifacts, 'artefatos_engenharia.joblib'))
+    arquivos_gravados.append(os.path.join(path_artifacts, 'artefatos_engenharia.joblib'))
+    print(f"Artefatos de engenharia de features salvos em '{os.path.join(path_artifacts, 'artefatos_engenharia.joblib')}'")
+
+    # Salvar os DataFrames de exemplo TP e TN
+    for exemplo_df, rotulo, nome_csv in ((exemplo_tp_df, 'TP', 'exemplo_tp_streamlit.csv'), (exemplo_tn_df, 'TN', 'exemplo_tn_streamlit.csv')):
+        if exemplo_df is not None and not exemplo_df.empty:
+            exemplo_df.to_csv(os.path.join(path_artifacts, nome_csv), index=False)
+            arquivos_gravados.append(os.path.join(path_artifacts, nome_csv))
+            print(f"Exemplo {rotulo} salvo em '{os.path.join(path_artifacts, nome_csv)}'")
+        else:
+            print(f"Exemplo {rotulo} (exemplo_{rotulo.lower()}_df) não disponível ou vazio. Não foi salvo.")
+
+    print("\n--- Processo de salvamento de artefatos concluído. ---")
+    return arquivos_gravados
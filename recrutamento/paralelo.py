@@ -0,0 +1,229 @@
+"""
+Scoring multi-core: os arrays grandes do armazém de candidatos (idiomas, bitset de skills e
+one-hots) vão para memória compartilhada uma única vez e um ProcessPoolExecutor pontua fatias
+deles. Os workers recebem só os nomes dos blocos de memória, então nada é copiado via pickle.
+
+Dois modos:
+  - busca interativa: as linhas pré-filtradas de uma vaga são divididas em fatias, cada worker
+    devolve o top-k da sua fatia e o processo principal junta os top-k parciais;
+  - lote de vagas: cada worker pontua vagas inteiras (usado pelo job da tabela top-N).
+
+Benchmark:
+    python -m recrutamento.paralelo --vagas 20 --processos 1 2 4 8
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import repeat
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from recrutamento.floresta import modelo_sklearn
+from recrutamento.scoring import TAMANHO_LOTE_PREDICAO, n_candidatos, selecionar_top_k, top_k_armazem
+
+# Número de processos de scoring (1 = scoring no próprio processo, sem pool)
+VARIAVEL_AMBIENTE_PROCESSOS = 'RECRUTAMENTO_PROCESSOS_SCORING'
+# Abaixo disso por fatia, o custo de despachar para o pool supera o ganho
+MIN_LINHAS_POR_FATIA = 2000
+
+ARRAYS_COMPARTILHADOS = ('ingles', 'espanhol', 'skills_densas', 'one_hot_candidato')
+
+_armazem_worker = None
+_modelo_worker = None
+_mapas_worker = None
+_memorias_worker = []
+
+
+def processos_configurados(padrao=1):
+    try:
+        return max(1, int(os.environ.get(VARIAVEL_AMBIENTE_PROCESSOS, padrao)))
+    except ValueError:
+        return padrao
+
+
+def _para_memoria_compartilhada(array):
+    array = np.ascontiguousarray(array)
+    memoria = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=memoria.buf)[...] = array
+    return memoria, (memoria.name, array.shape, array.dtype.str)
+
+
+def _abrir_memoria_compartilhada(descritor):
+    nome, forma, dtype = descritor
+    try:
+        # Python >= 3.13: quem só anexa não deve registrar o bloco no resource_tracker
+        memoria = shared_memory.SharedMemory(name=nome, track=False)
+    except TypeError:
+        memoria = shared_memory.SharedMemory(name=nome)
+    return memoria, np.ndarray(forma, dtype=np.dtype(dtype), buffer=memoria.buf)
+
+
+def _iniciar_worker(descritores, armazem_leve, modelo, mapas):
+    global _armazem_worker, _modelo_worker, _mapas_worker, _memorias_worker
+    armazem = dict(armazem_leve)
+    indice_skills = dict(armazem_leve['indice_skills'])
+    for chave, descritor in descritores.items():
+        memoria, array = _abrir_memoria_compartilhada(descritor)
+        _memorias_worker.append(memoria)
+        if chave == 'bits_skills':
+            indice_skills['bits'] = array
+        else:
+            armazem[chave] = array
+    armazem['indice_skills'] = indice_skills
+    # Cada worker já é um núcleo; paralelismo interno do RF só disputaria CPU com os outros workers
+    if hasattr(modelo_sklearn(modelo), 'n_jobs'):
+        modelo_sklearn(modelo).n_jobs = 1
+    _armazem_worker, _modelo_worker, _mapas_worker = armazem, modelo, mapas
+
+
+def _top_k_no_worker(vaga_serie, linhas, k, tamanho_lote):
+    if linhas is None:
+        linhas = np.arange(n_candidatos(_armazem_worker), dtype=np.int64)
+    return top_k_armazem(vaga_serie, _armazem_worker, linhas, _modelo_worker, _mapas_worker, k=k, tamanho_lote=tamanho_lote)
+
+
+def criar_pool_scoring(armazem, modelo, mapas, n_processos):
+    """
+    Copia os arrays grandes do armazém para memória compartilhada e sobe n_processos workers.
+    Deve ser encerrado com fechar_pool_scoring para liberar os blocos de memória.
+    """
+    memorias = []
+    descritores = {}
+    try:
+        for chave in ARRAYS_COMPARTILHADOS:
+            memoria, descritores[chave] = _para_memoria_compartilhada(armazem[chave])
+            memorias.append(memoria)
+        memoria, descritores['bits_skills'] = _para_memoria_compartilhada(armazem['indice_skills']['bits'])
+        memorias.append(memoria)
+    except Exception:
+        for memoria in memorias:
+            memoria.close()
+            memoria.unlink()
+        raise
+
+    armazem_leve = {
+        'colunas_modelo': armazem['colunas_modelo'],
+        'indice_colunas': armazem['indice_colunas'],
+        'layout_candidato': armazem['layout_candidato'],
+        'indice_skills': {chave: valor for chave, valor in armazem['indice_skills'].items() if chave != 'bits'},
+    }
+    executor = ProcessPoolExecutor(
+        max_workers=n_processos,
+        initializer=_iniciar_worker,
+        initargs=(descritores, armazem_leve, modelo, mapas)
+    )
+    return {'executor': executor, 'memorias': memorias, 'n_processos': n_processos}
+
+
+def fechar_pool_scoring(pool):
+    pool['executor'].shutdown(wait=True)
+    for memoria in pool['memorias']:
+        memoria.close()
+        try:
+            memoria.unlink()
+        except FileNotFoundError:
+            pass
+    pool['memorias'] = []
+
+
+def top_k_paralelo(pool, vaga_serie, linhas, k=5, tamanho_lote=TAMANHO_LOTE_PREDICAO, min_linhas_por_fatia=MIN_LINHAS_POR_FATIA, ao_progredir=None):
+    """
+    Mesmo resultado de top_k_armazem, com as linhas divididas entre os workers. Cada fatia devolve
+    o seu top-k na ordem (score desc, linha asc); o top-k global está contido na união deles.
+    ao_progredir(linhas, scores, linhas_processadas) recebe o top-k parcial a cada fatia concluída.
+    """
+    linhas = np.asarray(linhas, dtype=np.int64)
+    if len(linhas) == 0 or k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    n_fatias = max(1, min(pool['n_processos'], len(linhas) // max(1, min_linhas_por_fatia)))
+    tamanho_por_futuro = {
+        pool['executor'].submit(_top_k_no_worker, vaga_serie, fatia, k, tamanho_lote): len(fatia)
+        for fatia in np.array_split(linhas, n_fatias)
+    }
+    melhores_linhas = np.empty(0, dtype=np.int64)
+    melhores_scores = np.empty(0, dtype=np.float64)
+    processadas = 0
+    # A junção é exata em qualquer ordem de chegada das fatias
+    for futuro in as_completed(tamanho_por_futuro):
+        linhas_fatia, scores_fatia = futuro.result()
+        melhores_linhas, melhores_scores = selecionar_top_k(
+            np.concatenate([melhores_linhas, linhas_fatia]),
+            np.concatenate([melhores_scores, scores_fatia]),
+            k
+        )
+        processadas += tamanho_por_futuro[futuro]
+        if ao_progredir is not None:
+            ao_progredir(melhores_linhas, melhores_scores, processadas)
+    return melhores_linhas, melhores_scores
+
+
+def top_k_varias_vagas(pool, vagas_series, k=5, linhas=None, tamanho_lote=TAMANHO_LOTE_PREDICAO):
+    # Uma vaga inteira por tarefa; linhas=None pontua todos os candidatos
+    return list(pool['executor'].map(_top_k_no_worker, vagas_series, repeat(linhas), repeat(k), repeat(tamanho_lote)))
+
+
+def benchmark_processos(dados, armazem, n_vagas=20, lista_processos=(1, 2, 4), k=5):
+    df_vagas = dados['df_vagas']
+    vagas = [df_vagas.iloc[i] for i in range(min(n_vagas, len(df_vagas)))]
+    todas_linhas = np.arange(n_candidatos(armazem), dtype=np.int64)
+    pares = len(vagas) * len(todas_linhas)
+    if hasattr(dados['modelo'], 'n_jobs'):
+        dados['modelo'].n_jobs = 1
+
+    inicio = time.perf_counter()
+    referencia = [top_k_armazem(vaga, armazem, todas_linhas, dados['modelo'], dados['mapas'], k=k) for vaga in vagas]
+    tempo_serial = time.perf_counter() - inicio
+    print(f"{os.cpu_count()} núcleos | {len(vagas)} vagas x {len(todas_linhas)} candidatos | top-{k}")
+    print(f"{'modo':<12}{'processos':>10}{'tempo (s)':>12}{'pares/s':>14}{'speedup':>10}")
+    print(f"{'serial':<12}{1:>10}{tempo_serial:>12.2f}{pares / tempo_serial:>14,.0f}{1.0:>10.2f}")
+
+    for n_processos in lista_processos:
+        pool = criar_pool_scoring(armazem, dados['modelo'], dados['mapas'], n_processos)
+        try:
+            # Aquece os workers (carga do modelo) fora da medição
+            top_k_varias_vagas(pool, vagas[:1] * n_processos, k=k, linhas=todas_linhas[:1])
+
+            inicio = time.perf_counter()
+            fatiados = [top_k_paralelo(pool, vaga, todas_linhas, k=k) for vaga in vagas]
+            tempo_interativo = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            em_lote = top_k_varias_vagas(pool, vagas, k=k)
+            tempo_lote = time.perf_counter() - inicio
+        finally:
+            fechar_pool_scoring(pool)
+
+        for (linhas_ref, scores_ref), (linhas_a, scores_a), (linhas_b, scores_b) in zip(referencia, fatiados, em_lote):
+            if not (np.array_equal(linhas_ref, linhas_a) and np.array_equal(linhas_ref, linhas_b)
+                    and np.array_equal(scores_ref, scores_a) and np.array_equal(scores_ref, scores_b)):
+                raise AssertionError(f"Resultado paralelo difere do serial com {n_processos} processos.")
+        for modo, tempo in (('interativo', tempo_interativo), ('lote', tempo_lote)):
+            print(f"{modo:<12}{n_processos:>10}{tempo:>12.2f}{pares / tempo:>14,.0f}{tempo_serial / tempo:>10.2f}")
+
+
+def main():
+    from recrutamento.carregamento import PATH_ARTIFACTS, PATH_DATA, carregar_tudo
+    from recrutamento.scoring import construir_armazem_candidatos
+
+    parser = argparse.ArgumentParser(description="Benchmark do scoring multi-core (speedup x número de processos).")
+    parser.add_argument('--dados', default=PATH_DATA)
+    parser.add_argument('--artefatos', default=PATH_ARTIFACTS)
+    parser.add_argument('--vagas', type=int, default=20, help="Quantidade de vagas pontuadas contra todos os candidatos")
+    parser.add_argument('--processos', type=int, nargs='+', default=None, help="Números de processos a medir (padrão: 1, 2, 4, ... até os núcleos)")
+    parser.add_argument('--top-k', type=int, default=5)
+    args = parser.parse_args()
+
+    lista_processos = args.processos
+    if lista_processos is None:
+        n_nucleos = os.cpu_count() or 1
+        lista_processos = sorted({2 ** i for i in range(n_nucleos.bit_length()) if 2 ** i <= n_nucleos} | {n_nucleos})
+
+    dados = carregar_tudo(args.dados, args.artefatos)
+    armazem = construir_armazem_candidatos(dados['df_candidatos'], dados['colunas_modelo'], dados['mapas'])
+    benchmark_processos(dados, armazem, args.vagas, lista_processos, args.top_k)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,260 @@
+"""
+Paridade entre as features de treino e as do app, bit a bit em float32.
+
+Gera campos brutos sintéticos de vagas e candidatos (títulos, observações, níveis, idiomas, PCD e
+flags tech_*/skill_*) e monta as tabelas processadas com as funções de recrutamento.features, como
+o notebook. A partir delas:
+  - treino: prospecções de todos os pares passadas pelo merge (seção 5), limpeza e alvo (seção 6),
+    features de compatibilidade (seção 7) e One-Hot Encoding (seção 8) de recrutamento/modelagem.py,
+    alinhadas a colunas_modelo;
+  - app: tabelas gravadas como na seção 12 (CSV + .feather) e relidas como o app as lê, armazém
+    de candidatos e matriz por vaga (busca de candidatos), matriz de pares (busca reversa) e linha
+    a linha (linha_features_par).
+
+    python -m recrutamento.paridade_features --vagas 40 --candidatos 300
+
+Sai com código 1 se alguma coluna diverge. comentario_tem_valor_monetario vem do comentário da
+prospecção no treino e é sempre 0 no app; aqui as prospecções sintéticas não têm comentário.
+"""
+import argparse
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from recrutamento.carregamento import PATH_ARTIFACTS, ler_dados_processados, mapas_engenharia
+from recrutamento.colunar import caminho_colunar, salvar_colunar
+from recrutamento.features import (
+    MAPA_NIVEL_ACADEMICO_CANDIDATO, MAPA_NIVEL_IDIOMA, MAPA_NIVEL_PROFISSIONAL_CANDIDATO, codificar_idioma,
+    extrair_modalidade, generalizar_titulo_profissional_candidato, generalizar_titulo_vaga, limpar_pcd_candidato,
+    marcar_vaga_sap, padronizar_nivel_academico_candidato, padronizar_nivel_profissional_candidato
+)
+
+# Valores brutos sorteados (com variações de caixa, ausentes e valores fora dos mapas)
+TITULOS = [
+    'Consultor SAP FI', 'Consultora SAP MM', 'SAP Especialista ABAP', 'Arquiteto SAP', 'Arquiteto de Soluções',
+    'Tech Lead Java', 'Desenvolvedor Java Sênior', 'Programadora Python', 'Analista de Dados', 'Cientista de Dados',
+    'Analista de Sistemas', 'Analista de Negócios', 'Analista de Processos', 'Analista de Requisitos',
+    'Analista Fiscal', 'Analista Administrativo', 'Gerente de Projetos', 'Scrum Master', 'Analista de Testes',
+    'Analista de Suporte', 'Service Desk N1', 'UX Designer', 'Coordenador Administrativo', 'Cloud Engineer',
+    'Assistente Comercial', 'Não Informado', 'NÃO INFORMADO', None,
+]
+OBSERVACOES = [
+    'Trabalho 100% remoto', 'Modelo híbrido, 2x por semana', 'Presencial no escritório', 'Alocação no cliente',
+    'Remoto com encontros em formato hibrido', 'Atuação na planta', 'A combinar', '', None,
+]
+NIVEIS_IDIOMA = ['Nenhum', 'Básico', 'Intermediário', 'Avançado', 'Fluente', 'Técnico', 'Nativo', 'FLUENTE', 'Não Informado', 'outro', None]
+SIM_NAO = ['Sim', 'Não', 'sim', 'SIM', 'nao', None]
+NIVEIS_ACADEMICOS_CANDIDATO = [
+    'Ensino Superior Completo', 'Ensino Superior Incompleto', 'Ensino Médio Completo', 'Pós Graduação Completo',
+    'Mestrado Incompleto', 'Ensino Técnico Cursando', 'Doutorado Completo', 'Ensino Fundamental Completo',
+    'MBA', 'Não Informado', 'Outro', None,
+]
+NIVEIS_PROFISSIONAIS_CANDIDATO = [
+    'Júnior', 'Pleno', 'Sênior', 'Especialista', 'Analista', 'Gerente', 'Trainee', 'Líder', 'Diretor', 'Assistente',
+    'Não Informado', None,
+]
+PCD = ['Sim', 'Não', 'não', 's', 'N', 'true', 'Não Informado', '', None]
+DENSIDADE_FLAGS = 0.1
+# Fração das categóricas processadas trocada por ausente (None) e por texto vazio
+FRACAO_AUSENTES = 0.05
+
+
+#  Tabelas processadas sintéticas (mesmas funções do notebook, seções 2.5 e 3.5)
+def _valores_do_modelo(colunas_modelo, prefixo, extras):
+    return [col[len(prefixo):] for col in colunas_modelo if col.startswith(prefixo)] + extras
+
+
+def _sortear(gerador, valores, n):
+    return pd.Series(np.array(valores, dtype=object)[gerador.integers(0, len(valores), n)], dtype=object)
+
+
+def _com_ausentes(gerador, df, colunas):
+    for coluna in colunas:
+        sorteio = gerador.random(len(df))
+        serie = df[coluna].astype(object)
+        serie[sorteio < FRACAO_AUSENTES] = None
+        serie[(sorteio >= FRACAO_AUSENTES) & (sorteio < 2 * FRACAO_AUSENTES)] = ''
+        df[coluna] = serie
+    return df
+
+
+def _flags(gerador, colunas, n):
+    return pd.DataFrame((gerador.random((n, len(colunas))) < DENSIDADE_FLAGS).astype(int), columns=colunas)
+
+
+def gerar_tabelas_processadas(colunas_modelo, mapas, total_vagas, total_candidatos, semente=0):
+    gerador = np.random.default_rng(semente)
+    mapa_nivel_idioma = mapas['mapa_nivel_idioma']
+
+    df_vagas = pd.DataFrame({
+        'id_vaga': [str(1000 + i) for i in range(total_vagas)],
+        'titulo_vaga': _sortear(gerador, TITULOS, total_vagas),
+        'demais_observacoes': _sortear(gerador, OBSERVACOES, total_vagas),
+        'vaga_sap': _sortear(gerador, SIM_NAO, total_vagas),
+        'nivel_ingles': _sortear(gerador, NIVEIS_IDIOMA, total_vagas),
+        'nivel_espanhol': _sortear(gerador, NIVEIS_IDIOMA, total_vagas),
+        # Categoria antes de todas as do modelo na ordem alfabética: é a que o drop_first da seção 8 descarta, como no treino
+        'nivel_academico': _sortear(gerador, _valores_do_modelo(colunas_modelo, 'nivel_academico_vaga_', ['Ensino Fundamental Completo', 'Não Informado']), total_vagas),
+        'nivel_profissional_vaga': _sortear(gerador, _valores_do_modelo(colunas_modelo, 'nivel_profissional_vaga_', ['Analista', 'Não Informado']), total_vagas),
+    })
+    df_vagas['modalidade_trabalho'] = extrair_modalidade(df_vagas['demais_observacoes'])
+    df_vagas['vaga_sap_bool'] = marcar_vaga_sap(df_vagas['vaga_sap'])
+    df_vagas['nivel_ingles_ordinal'] = codificar_idioma(df_vagas['nivel_ingles'], mapa_nivel_idioma)
+    df_vagas['nivel_espanhol_ordinal'] = codificar_idioma(df_vagas['nivel_espanhol'], mapa_nivel_idioma)
+    df_vagas['categoria_vaga'] = generalizar_titulo_vaga(df_vagas['titulo_vaga'])
+    df_vagas = _com_ausentes(gerador, df_vagas, ['nivel_academico', 'nivel_profissional_vaga', 'modalidade_trabalho', 'categoria_vaga'])
+    df_vagas = pd.concat([df_vagas, _flags(gerador, [col for col in colunas_modelo if col.startswith('tech_')], total_vagas)], axis=1)
+
+    df_candidatos = pd.DataFrame({
+        'id_candidato': [str(50000 + i) for i in range(total_candidatos)],
+        'nome': [f"Candidato {i}" for i in range(total_candidatos)],
+        'titulo_profissional': _sortear(gerador, TITULOS, total_candidatos),
+        'nivel_ingles': _sortear(gerador, NIVEIS_IDIOMA, total_candidatos),
+        'nivel_espanhol': _sortear(gerador, NIVEIS_IDIOMA, total_candidatos),
+        'nivel_academico': _sortear(gerador, NIVEIS_ACADEMICOS_CANDIDATO, total_candidatos),
+        'nivel_profissional': _sortear(gerador, NIVEIS_PROFISSIONAIS_CANDIDATO, total_candidatos),
+        'pcd': _sortear(gerador, PCD, total_candidatos),
+    })
+    df_candidatos['categoria_profissional'] = generalizar_titulo_profissional_candidato(df_candidatos['titulo_profissional'])
+    df_candidatos['nivel_ingles_ordinal'] = codificar_idioma(df_candidatos['nivel_ingles'], mapa_nivel_idioma)
+    df_candidatos['nivel_espanhol_ordinal'] = codificar_idioma(df_candidatos['nivel_espanhol'], mapa_nivel_idioma)
+    df_candidatos['nivel_academico_padronizado'] = padronizar_nivel_academico_candidato(df_candidatos['nivel_academico'], mapas['mapa_nivel_academico_candidato'])
+    df_candidatos['nivel_profissional_padronizado'] = padronizar_nivel_profissional_candidato(df_candidatos['nivel_profissional'], mapas['mapa_nivel_profissional_candidato'])
+    df_candidatos['pcd_padronizado'] = limpar_pcd_candidato(df_candidatos['pcd'])
+    df_candidatos = _com_ausentes(gerador, df_candidatos, ['categoria_profissional', 'nivel_academico_padronizado', 'nivel_profissional_padronizado', 'pcd_padronizado'])
+    df_candidatos = pd.concat([df_candidatos, _flags(gerador, [col for col in colunas_modelo if col.startswith('skill_')], total_candidatos)], axis=1)
+    return df_vagas, df_candidatos
+
+
+#  Lado do treino (seções 5 a 8 do notebook, pelas funções de recrutamento/modelagem.py)
+def matriz_treino(df_vagas, df_candidatos, colunas_modelo):
+    """
+    Todos os pares (vaga, candidato), vaga a vaga, passados por montar_master, preparar_modelagem,
+    calcular_features_eda e preparar_features_modelo como no treino. Devolve (matriz alinhada a
+    colunas_modelo, índices dos pares que o treino mantém): pares sem titulo_vaga saem na seção 6.1.
+    """
+    from recrutamento.modelagem import calcular_features_eda, montar_master, preparar_features_modelo, preparar_modelagem
+
+    total_pares = len(df_vagas) * len(df_candidatos)
+    df_prospects = pd.DataFrame({
+        'id_vaga_origem': np.repeat(df_vagas['id_vaga'].to_numpy(), len(df_candidatos)),
+        'id_candidato_origem': np.tile(df_candidatos['id_candidato'].to_numpy(), len(df_vagas)),
+        # Alvo alternado: a seção 6.2 só mantém situações com alvo e o split estratificado precisa das duas classes
+        'situacao_candidato': np.where(np.arange(total_pares) % 2, 'contratado pela decision', 'desistiu'),
+        'comentario_tem_valor_monetario': 0,
+    })
+    # As funções de modelagem imprimem o progresso das seções do notebook
+    with open(os.devnull, 'w') as nulo:
+        with redirect_stdout(nulo):
+            df_master = montar_master(df_prospects, df_vagas, df_candidatos)
+            df_modelagem = calcular_features_eda(preparar_modelagem(df_master))
+            X = preparar_features_modelo(df_modelagem, df_vagas.columns, df_candidatos.columns)[0]
+    matriz = X.reindex(columns=colunas_modelo, fill_value=0).fillna(0).to_numpy(dtype=np.float32)
+    return matriz, X.index.to_numpy()
+
+
+#  Lado do app
+def matrizes_app(df_vagas, df_candidatos, colunas_modelo, mapas, pares_linha):
+    """Tabelas relidas como o app as lê; devolve {caminho: (matriz, linhas dos pares)}."""
+    from recrutamento.busca_reversa import construir_armazem_vagas, matriz_features_pares
+    from recrutamento.scoring import construir_armazem_candidatos, linha_features_par, matriz_features_do_armazem, preparar_vetor_vaga
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho_vagas = os.path.join(pasta, 'vagas_processadas.csv')
+        caminho_candidatos = os.path.join(pasta, 'candidatos_processados.csv')
+        # CSV e depois .feather, como exportar_artefatos: o app lê o .feather, que mantém '' distinto
+        # de ausente (no CSV os dois viram NaN)
+        for df, caminho in ((df_vagas, caminho_vagas), (df_candidatos, caminho_candidatos)):
+            df.to_csv(caminho, index=False)
+            salvar_colunar(df, caminho_colunar(caminho))
+        df_vagas_app = ler_dados_processados(caminho_vagas)
+        df_candidatos_app = ler_dados_processados(caminho_candidatos)
+
+    n_candidatos = len(df_candidatos_app)
+    armazem = construir_armazem_candidatos(df_candidatos_app, colunas_modelo, mapas)
+    todas = np.arange(len(df_vagas_app) * n_candidatos)
+
+    por_vaga = np.concatenate([
+        matriz_features_do_armazem(armazem, preparar_vetor_vaga(df_vagas_app.iloc[i], colunas_modelo, mapas))
+        for i in range(len(df_vagas_app))
+    ])
+    armazem_vagas = construir_armazem_vagas(df_vagas_app, armazem, mapas)
+    pares = matriz_features_pares(armazem_vagas, armazem, todas // n_candidatos, todas % n_candidatos)
+
+    amostra = todas[:: max(1, len(todas) // pares_linha)][:pares_linha] if pares_linha else todas[:0]
+    linha_a_linha = np.array([
+        linha_features_par(df_vagas_app.iloc[p // n_candidatos], df_candidatos_app.iloc[p % n_candidatos], colunas_modelo, mapas)
+        for p in amostra
+    ], dtype=np.float32).reshape(len(amostra), len(colunas_modelo))
+    return {
+        'busca por vaga': (por_vaga, todas),
+        'busca reversa': (pares, todas),
+        'linha a linha': (linha_a_linha, amostra),
+    }
+
+
+def comparar_matrizes(treino, app, colunas_modelo):
+    """Colunas divergentes: nome -> (linhas diferentes, exemplo treino, exemplo app)."""
+    diferentes = (treino != app) & ~(np.isnan(treino) & np.isnan(app))
+    divergencias = {}
+    for j in np.flatnonzero(diferentes.any(axis=0)):
+        i = np.flatnonzero(diferentes[:, j])[0]
+        divergencias[colunas_modelo[j]] = (int(diferentes[:, j].sum()), float(treino[i, j]), float(app[i, j]))
+    return divergencias
+
+
+def verificar_paridade(colunas_modelo, mapas, total_vagas=40, total_candidatos=300, semente=0, pares_linha=200):
+    df_vagas, df_candidatos = gerar_tabelas_processadas(colunas_modelo, mapas, total_vagas, total_candidatos, semente)
+    treino, pares_treino = matriz_treino(df_vagas, df_candidatos, colunas_modelo)
+    linha_treino = pd.Series(np.arange(len(pares_treino)), index=pares_treino)
+    resultado = {}
+    for caminho, (matriz, linhas) in matrizes_app(df_vagas, df_candidatos, colunas_modelo, mapas, pares_linha).items():
+        # Só os pares que o treino mantém
+        comparaveis = np.isin(linhas, pares_treino)
+        resultado[caminho] = {
+            'pares': int(comparaveis.sum()),
+            'divergencias': comparar_matrizes(treino[linha_treino[linhas[comparaveis]].to_numpy()], matriz[comparaveis], colunas_modelo),
+        }
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara bit a bit as features de treino (notebook) e as do app em dados sintéticos.")
+    parser.add_argument('--vagas', type=int, default=40)
+    parser.add_argument('--candidatos', type=int, default=300)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--pares-linha', type=int, default=200, help="Pares conferidos também linha a linha (mais lento)")
+    parser.add_argument('--artefatos', default=PATH_ARTIFACTS, help="Pasta com colunas_modelo.joblib e artefatos_engenharia.joblib")
+    args = parser.parse_args()
+
+    colunas_modelo = joblib.load(os.path.join(args.artefatos, 'colunas_modelo.joblib'))
+    caminho_eng = os.path.join(args.artefatos, 'artefatos_engenharia.joblib')
+    if os.path.exists(caminho_eng):
+        mapas = mapas_engenharia(joblib.load(caminho_eng))
+    else:
+        mapas = {
+            'mapa_nivel_idioma': MAPA_NIVEL_IDIOMA,
+            'mapa_nivel_academico_candidato': MAPA_NIVEL_ACADEMICO_CANDIDATO,
+            'mapa_nivel_profissional_candidato': MAPA_NIVEL_PROFISSIONAL_CANDIDATO,
+        }
+
+    resultado = verificar_paridade(colunas_modelo, mapas, args.vagas, args.candidatos, args.semente, args.pares_linha)
+    ok = True
+    for caminho, info in resultado.items():
+        if not info['divergencias']:
+            print(f"{caminho}: {info['pares']} pares x {len(colunas_modelo)} colunas idênticos")
+            continue
+        ok = False
+        print(f"{caminho}: {len(info['divergencias'])} colunas divergentes em {info['pares']} pares")
+        for coluna, (linhas, valor_treino, valor_app) in info['divergencias'].items():
+            print(f"  {coluna}: {linhas} pares (ex.: treino={valor_treino:g}, app={valor_app:g})")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,289 @@
+"""
+Pipeline do notebook de desenvolvimento do modelo em etapas com cache.
+
+Etapas, na ordem: ingestao, vagas, candidatos, prospects, merge, modelagem, treino, exportacao.
+A saída de cada etapa é gravada em data/cache_pipeline/<etapa>-<chave>.joblib, com a chave calculada
+a partir do código da etapa (funções de recrutamento/modelagem.py ou módulos inteiros de
+ingestão/processamento), das chaves das etapas de que ela depende e, na ingestão, do conteúdo dos
+JSONs brutos. Uma etapa cuja chave já está no cache não é executada; assim, mudar um hiperparâmetro
+em otimizar_modelo só refaz treino e exportação. Os JSONs brutos precisam estar em data/raw/
+(baixados pelo notebook).
+
+    python -m recrutamento.pipeline executar
+    python -m recrutamento.pipeline executar --de treino --ate exportacao --verboso
+    python -m recrutamento.pipeline status
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+
+from recrutamento import colunar, features, ingestao, modelagem, processamento, tecnologias
+from recrutamento.ingestao import ingerir_candidatos, ingerir_prospects, ingerir_vagas, ler_ingestao
+from recrutamento.processamento import processar_candidatos, processar_prospects, processar_vagas
+
+PATH_DATA = 'data/'
+PATH_DATA_RAW = 'data/raw/'
+PATH_ARTIFACTS = 'artifacts/'
+PATH_CACHE = 'data/cache_pipeline/'
+
+ARQUIVOS_BRUTOS = {'vagas': 'vagas_raw.json', 'candidatos': 'applicants_raw.json', 'prospects': 'prospects_raw.json'}
+
+
+#  Etapas
+def _etapa_ingestao(entradas, config):
+    pasta = tempfile.mkdtemp(prefix='ingestao_')
+    try:
+        saida = {}
+        for nome, ingerir in (('vagas', ingerir_vagas), ('candidatos', ingerir_candidatos), ('prospects', ingerir_prospects)):
+            caminho_saida = os.path.join(pasta, nome + '.feather')
+            ingerir(os.path.join(config['path_data_raw'], ARQUIVOS_BRUTOS[nome]), caminho_saida)
+            saida[nome] = ler_ingestao(caminho_saida)
+        return saida
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+def _etapa_vagas(entradas, config):
+    return {'df_vagas_processado': processar_vagas(entradas['ingestao']['vagas'])}
+
+
+def _etapa_candidatos(entradas, config):
+    return {'df_candidatos_processado': processar_candidatos(entradas['ingestao']['candidatos'])}
+
+
+def _etapa_prospects(entradas, config):
+    return {'df_prospects_processado': processar_prospects(entradas['ingestao']['prospects'].copy())}
+
+
+def _etapa_merge(entradas, config):
+    return {'df_master': modelagem.montar_master(
+        entradas['prospects']['df_prospects_processado'], entradas['vagas']['df_vagas_processado'],
+        entradas['candidatos']['df_candidatos_processado']
+    )}
+
+
+def _etapa_modelagem(entradas, config):
+    df_modelagem = modelagem.calcular_features_eda(modelagem.preparar_modelagem(entradas['merge']['df_master']))
+    X, y, X_train, X_test, y_train, y_test = modelagem.preparar_features_modelo(
+        df_modelagem, entradas['vagas']['df_vagas_processado'].columns, entradas['candidatos']['df_candidatos_processado'].columns
+    )
+    return {'X': X, 'y': y, 'X_train': X_train, 'X_test': X_test, 'y_train': y_train, 'y_test': y_test}
+
+
+def _etapa_treino(entradas, config):
+    dados = entradas['modelagem']
+    rf_clf_model = modelagem.treinar_baseline(dados['X_train'], dados['X_test'], dados['y_train'], dados['y_test'])
+    best_rf_clf_otimizado, feature_importances_final_model = modelagem.otimizar_modelo(
+        rf_clf_model, dados['X_train'], dados['X_test'], dados['y_train'], dados['y_test']
+    )
+    exemplo_tp_df, exemplo_tn_df = modelagem.selecionar_exemplos(best_rf_clf_otimizado, dados['X_test'], dados['y_test'], feature_importances_final_model)
+    return {
+        'best_rf_clf_otimizado': best_rf_clf_otimizado, 'feature_importances_final_model': feature_importances_final_model,
+        'exemplo_tp_df': exemplo_tp_df, 'exemplo_tn_df': exemplo_tn_df,
+    }
+
+
+def _etapa_exportacao(entradas, config):
+    treino = entradas['treino']
+    # Pastas de saída, como no setup do notebook
+    os.makedirs(config['path_data'], exist_ok=True)
+    os.makedirs(config['path_artifacts'], exist_ok=True)
+    arquivos = modelagem.exportar_artefatos(
+        entradas['vagas']['df_vagas_processado'], entradas['candidatos']['df_candidatos_processado'],
+        treino['best_rf_clf_otimizado'], entradas['modelagem']['X'], entradas['modelagem']['X_train'],
+        treino['exemplo_tp_df'], treino['exemplo_tn_df'], config['path_data'], config['path_artifacts']
+    )
+    if treino['feature_importances_final_model'] is not None:
+        caminho_grafico = os.path.join(config['path_artifacts'], 'feature_importances.png')
+        try:
+            modelagem.salvar_grafico_importancias(treino['feature_importances_final_model'], caminho_grafico)
+            arquivos.append(caminho_grafico)
+        except ImportError as e:
+            print(f"Gráfico de importância das features não gerado (matplotlib/seaborn indisponíveis): {e}")
+    return {'arquivos': arquivos}
+
+
+# 'codigo': módulos (arquivo inteiro) e funções (só o código-fonte delas) que definem a saída da etapa
+ETAPAS = {
+    'ingestao': {'entradas': (), 'codigo': (ingestao,), 'executar': _etapa_ingestao},
+    'vagas': {'entradas': ('ingestao',), 'codigo': (features, tecnologias, ingestao, processamento), 'executar': _etapa_vagas},
+    'candidatos': {'entradas': ('ingestao',), 'codigo': (features, tecnologias, ingestao, processamento), 'executar': _etapa_candidatos},
+    'prospects': {'entradas': ('ingestao',), 'codigo': (features, tecnologias, ingestao, processamento), 'executar': _etapa_prospects},
+    'merge': {'entradas': ('vagas', 'candidatos', 'prospects'), 'codigo': (modelagem.montar_master,), 'executar': _etapa_merge},
+    'modelagem': {
+        'entradas': ('merge', 'vagas', 'candidatos'), 'executar': _etapa_modelagem,
+        'codigo': (features, modelagem.preparar_modelagem, modelagem.obter_nome_coluna_eda, modelagem.calcular_features_eda, modelagem.preparar_features_modelo),
+    },
+    'treino': {
+        'entradas': ('modelagem',), 'executar': _etapa_treino,
+        'codigo': (modelagem.treinar_baseline, modelagem.otimizar_modelo, modelagem.selecionar_exemplos),
+    },
+    'exportacao': {
+        'entradas': ('vagas', 'candidatos', 'modelagem', 'treino'), 'executar': _etapa_exportacao,
+        'codigo': (colunar, features, tecnologias, modelagem.exportar_artefatos, modelagem.salvar_grafico_importancias),
+    },
+}
+ORDEM_ETAPAS = list(ETAPAS)
+
+
+#  Chaves do cache
+def _hash_arquivo(caminho, tamanho_bloco=1 << 20):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(tamanho_bloco), b''):
+            digest.update(bloco)
+    return digest.hexdigest()
+
+
+def _hash_codigo(item):
+    if inspect.ismodule(item):
+        return _hash_arquivo(item.__file__)
+    return hashlib.blake2b(inspect.getsource(item).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _parametros_etapa(etapa, config):
+    # Entradas de fora do pipeline: o conteúdo dos JSONs na ingestão e as pastas de saída na exportação
+    if etapa == 'ingestao':
+        caminhos = {nome: os.path.join(config['path_data_raw'], arquivo) for nome, arquivo in ARQUIVOS_BRUTOS.items()}
+        faltando = [caminho for caminho in caminhos.values() if not os.path.exists(caminho)]
+        if faltando:
+            raise SystemExit(f"JSON bruto não encontrado: {', '.join(faltando)}. Baixe os dados pelo notebook (seções 2.1, 3.1 e 4.1) ou indique a pasta com --brutos.")
+        return {nome: _hash_arquivo(caminho) for nome, caminho in caminhos.items()}
+    if etapa == 'exportacao':
+        return {'path_data': os.path.abspath(config['path_data']), 'path_artifacts': os.path.abspath(config['path_artifacts'])}
+    return {}
+
+
+def calcular_chaves(config):
+    versoes = {'pandas': pd.__version__, 'numpy': np.__version__, 'sklearn': sklearn.__version__}
+    chaves = {}
+    for etapa in ORDEM_ETAPAS:
+        definicao = ETAPAS[etapa]
+        conteudo = {
+            'etapa': etapa, 'versoes': versoes, 'parametros': _parametros_etapa(etapa, config),
+            'codigo': [_hash_codigo(item) for item in (definicao['executar'],) + definicao['codigo']],
+            'entradas': [chaves[entrada] for entrada in definicao['entradas']],
+        }
+        chaves[etapa] = hashlib.blake2b(json.dumps(conteudo, sort_keys=True).encode('utf-8'), digest_size=16).hexdigest()
+    return chaves
+
+
+#  Cache em disco
+def caminho_cache(config, etapa, chave):
+    return os.path.join(config['path_cache'], f"{etapa}-{chave}.joblib")
+
+
+def em_cache(config, etapa, chave):
+    caminho = caminho_cache(config, etapa, chave)
+    if not os.path.exists(caminho):
+        return False
+    if etapa == 'exportacao':
+        # A exportação só vale enquanto os arquivos gravados por ela existirem
+        return all(os.path.exists(arquivo) for arquivo in joblib.load(caminho)['arquivos'])
+    return True
+
+
+def gravar_cache(config, etapa, chave, saida):
+    os.makedirs(config['path_cache'], exist_ok=True)
+    caminho = caminho_cache(config, etapa, chave)
+    joblib.dump(saida, caminho + '.tmp')
+    os.replace(caminho + '.tmp', caminho)
+    # Só a saída mais recente de cada etapa fica no cache
+    for nome in os.listdir(config['path_cache']):
+        if nome.startswith(etapa + '-') and nome.endswith('.joblib') and os.path.join(config['path_cache'], nome) != caminho:
+            os.remove(os.path.join(config['path_cache'], nome))
+
+
+#  Execução
+def configuracao(path_data=PATH_DATA, path_data_raw=PATH_DATA_RAW, path_artifacts=PATH_ARTIFACTS, path_cache=PATH_CACHE):
+    return {'path_data': path_data, 'path_data_raw': path_data_raw, 'path_artifacts': path_artifacts, 'path_cache': path_cache}
+
+
+def executar_pipeline(config, de=ORDEM_ETAPAS[0], ate=ORDEM_ETAPAS[-1], forcar=False, verboso=False):
+    """
+    Executa as etapas de `de` a `ate` (inclusive), pulando as que já estão no cache (exceto com
+    forcar). Etapas anteriores a `de` só são lidas do cache. Devolve um resumo por etapa.
+    """
+    selecionadas = ORDEM_ETAPAS[ORDEM_ETAPAS.index(de):ORDEM_ETAPAS.index(ate) + 1]
+    chaves = calcular_chaves(config)
+    saidas, resumos = {}, []
+
+    def obter(etapa):
+        if etapa not in saidas:
+            if not em_cache(config, etapa, chaves[etapa]):
+                raise SystemExit(f"A etapa '{etapa}' não está no cache para a chave atual; execute o pipeline a partir dela (--de {etapa}).")
+            inicio = time.perf_counter()
+            saidas[etapa] = joblib.load(caminho_cache(config, etapa, chaves[etapa]))
+            if etapa not in selecionadas:
+                resumos.append({'etapa': etapa, 'status': 'lida do cache', 'segundos': time.perf_counter() - inicio, 'chave': chaves[etapa]})
+        return saidas[etapa]
+
+    for etapa in selecionadas:
+        if not forcar and em_cache(config, etapa, chaves[etapa]):
+            resumos.append({'etapa': etapa, 'status': 'cache', 'segundos': 0.0, 'chave': chaves[etapa]})
+            continue
+        definicao = ETAPAS[etapa]
+        entradas = {entrada: obter(entrada) for entrada in definicao['entradas']}
+        inicio = time.perf_counter()
+        with open(os.devnull, 'w') as nulo:
+            with redirect_stdout(sys.stdout if verboso else nulo):
+                saidas[etapa] = definicao['executar'](entradas, config)
+        gravar_cache(config, etapa, chaves[etapa], saidas[etapa])
+        resumos.append({'etapa': etapa, 'status': 'executada', 'segundos': time.perf_counter() - inicio, 'chave': chaves[etapa]})
+    return resumos
+
+
+def status_pipeline(config):
+    chaves = calcular_chaves(config)
+    return [{'etapa': etapa, 'status': 'cache' if em_cache(config, etapa, chaves[etapa]) else 'pendente', 'segundos': 0.0, 'chave': chaves[etapa]}
+            for etapa in ORDEM_ETAPAS]
+
+
+def imprimir_resumos(resumos):
+    print(f"{'etapa':<12}{'status':>15}{'tempo (s)':>11}  chave")
+    for resumo in resumos:
+        print(f"{resumo['etapa']:<12}{resumo['status']:>15}{resumo['segundos']:>11.2f}  {resumo['chave'][:12]}")
+    executadas = [resumo for resumo in resumos if resumo['status'] == 'executada']
+    acertos = sum(resumo['status'] == 'cache' for resumo in resumos)
+    print(f"\n{acertos} etapa(s) do cache, {len(executadas)} executada(s) em {sum(resumo['segundos'] for resumo in resumos):.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline do desenvolvimento do modelo em etapas com cache.")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+    executar = subcomandos.add_parser('executar', help="Executa um intervalo de etapas, pulando as que estão no cache")
+    executar.add_argument('--de', choices=ORDEM_ETAPAS, default=ORDEM_ETAPAS[0])
+    executar.add_argument('--ate', choices=ORDEM_ETAPAS, default=ORDEM_ETAPAS[-1])
+    executar.add_argument('--forcar', action='store_true', help="Executa as etapas do intervalo mesmo com cache")
+    executar.add_argument('--verboso', action='store_true', help="Mostra a saída das seções do notebook")
+    status = subcomandos.add_parser('status', help="Mostra quais etapas estão no cache para o código e os dados atuais")
+    for subparser in (executar, status):
+        subparser.add_argument('--dados', default=PATH_DATA)
+        subparser.add_argument('--brutos', default=PATH_DATA_RAW)
+        subparser.add_argument('--artefatos', default=PATH_ARTIFACTS)
+        subparser.add_argument('--cache', default=PATH_CACHE)
+    args = parser.parse_args()
+
+    config = configuracao(args.dados, args.brutos, args.artefatos, args.cache)
+    if args.comando == 'executar':
+        if ORDEM_ETAPAS.index(args.de) > ORDEM_ETAPAS.index(args.ate):
+            parser.error("--de deve vir antes de --ate na ordem das etapas")
+        imprimir_resumos(executar_pipeline(config, args.de, args.ate, args.forcar, args.verboso))
+    else:
+        imprimir_resumos(status_pipeline(config))
+
+
+if __name__ == '__main__':
+    main()
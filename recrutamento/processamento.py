@@ -0,0 +1,445 @@
+"""
+Limpeza e engenharia de features das tabelas de vagas, candidatos e prospecções: as seções 2.3 a
+2.5, 3.3 a 3.5 e 4.3 a 4.4 do notebook como funções de DataFrame -> DataFrame processado, para que
+o notebook, a atualização incremental (recrutamento/incremental.py) e o pipeline por etapas usem a
+mesma implementação. Todas as regras são por linha: processar um subconjunto de registros dá as
+mesmas linhas que processar a tabela inteira.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from recrutamento.features import (
+    MAPA_NIVEL_ACADEMICO_CANDIDATO, MAPA_NIVEL_IDIOMA, MAPA_NIVEL_PROFISSIONAL_CANDIDATO, codificar_idioma,
+    extrair_modalidade, generalizar_titulo_profissional_candidato, generalizar_titulo_vaga, limpar_pcd_candidato,
+    marcar_vaga_sap, padronizar_nivel_academico_candidato, padronizar_nivel_profissional_candidato
+)
+from recrutamento.ingestao import CAMPOS_SELECIONADOS_CANDIDATOS, CAMPOS_SELECIONADOS_VAGAS
+from recrutamento.tecnologias import extrair_tecnologias, padroes_tecnologias_candidatos, padroes_tecnologias_vagas
+
+
+#  Regras das prospecções (seção 4.4)
+def padronizar_modalidade_prospect(modalidade_texto):
+    if not isinstance(modalidade_texto, str): modalidade_texto = str(modalidade_texto)
+    modalidade_texto = modalidade_texto.lower() 
+    if modalidade_texto == "não informado" or modalidade_texto == "nan": return "Não Informado"
+    if re.search(r"h[íi]brido|hibrida", modalidade_texto): return "Híbrido"
+    if re.search(r"remoto|remota|home|100% remoto", modalidade_texto): return "Remoto"
+    if re.search(r"presencial", modalidade_texto): return "Presencial"
+    return "Outros/Não Especificado"
+
+
+MAPA_SITUACAO_AGRUPADA = {
+    "prospect": "Em Processo", "encaminhado ao requisitante": "Em Processo", "contato inicial": "Em Processo",
+    "entrevista rh": "Em Processo", "entrevista gestor": "Em Processo", "teste técnico": "Em Processo",
+    "em processo": "Em Processo", "em avaliação": "Em Processo", "agendado": "Em Processo", "selecionado para entrevista": "Em Processo",
+    "inscrito": "Em Processo",
+    "aprovado": "Finalizado - Contratado", "contratado": "Finalizado - Contratado", "proposta aceita": "Finalizado - Contratado",
+    "contratado pela decision": "Finalizado - Contratado", "contratado como hunting": "Finalizado - Contratado",
+    "oferta enviada": "Finalizado - Oferta", "proposta enviada": "Finalizado - Oferta", "encaminhar proposta": "Finalizado - Oferta",
+    "reprovado": "Finalizado - Rejeitado", "não aprovado": "Finalizado - Rejeitado", "desclassificado": "Finalizado - Rejeitado",
+    "perfil não aderente": "Finalizado - Rejeitado", "fora do perfil": "Finalizado - Rejeitado",
+    "não evoluiu": "Finalizado - Rejeitado", "não selecionado": "Finalizado - Rejeitado",
+    "não aprovado pelo cliente": "Finalizado - Rejeitado", "não aprovado pelo rh": "Finalizado - Rejeitado", "não aprovado pelo requisitante": "Finalizado - Rejeitado",
+    "recusado": "Finalizado - Rejeitado",
+    "desistiu": "Desistiu/Standby", "stand by": "Desistiu/Standby", "standby": "Desistiu/Standby",
+    "não tem interesse": "Desistiu/Standby", "sem interesse": "Desistiu/Standby", "sem interesse nesta vaga": "Desistiu/Standby",
+    "desistiu da contratação": "Desistiu/Standby",
+    "congelado": "Vaga Congelada/Cancelada", "pausado": "Vaga Congelada/Cancelada", "cancelado":"Vaga Congelada/Cancelada",
+    "documentação": "Outros/Não Classificado"
+}
+
+
+def agrupar_situacao_candidato(situacao):
+    if not isinstance(situacao, str): situacao = str(situacao)
+    situacao_lower = situacao.lower() 
+    if situacao_lower == "não informado" or situacao_lower == "nan": return "Não Informado"
+
+    if "contratado pela decision" in situacao_lower: return "Finalizado - Contratado"
+    if "contratado como hunting" in situacao_lower: return "Finalizado - Contratado"
+    if "proposta aceita" in situacao_lower: return "Finalizado - Contratado"
+    if "aprovado" in situacao_lower and not "não aprovado" in situacao_lower : return "Finalizado - Contratado"
+    if "não aprovado pelo cliente" in situacao_lower: return "Finalizado - Rejeitado"
+    for key, value in MAPA_SITUACAO_AGRUPADA.items():
+        if key in situacao_lower:
+            return value
+    return "Outros/Não Classificado"
+
+
+#  Tabelas processadas
+def processar_vagas(df_vagas):
+    # ### *2.3. Seleção dos campos de interesse para vagas*
+    df_vagas_processado = pd.DataFrame()
+    if not df_vagas.empty:
+        for campo in CAMPOS_SELECIONADOS_VAGAS:
+            if campo in df_vagas.columns:
+                df_vagas_processado[campo] = df_vagas[campo]
+            else:
+                df_vagas_processado[campo] = pd.Series(dtype='object')
+                print(f"Aviso (Vagas): Coluna '{campo}' não encontrada no DataFrame original. Será criada com NA.")
+    else:
+        print("DataFrame de vagas original está vazio. df_vagas_processado será criado com colunas vazias.")
+        for campo in CAMPOS_SELECIONADOS_VAGAS:
+            df_vagas_processado[campo] = pd.Series(dtype='object')
+
+    # ### *2.4. Pré-limpeza de campos textuais de vagas*
+    if not df_vagas_processado.empty:
+        text_cols_vagas_feature_eng = ["titulo_vaga", "principais_atividades", "competencia_tecnicas_e_comportamentais", "demais_observacoes", "areas_atuacao", "vaga_sap", "nivel_ingles", "nivel_espanhol", "cliente", "empresa_divisao"]
+        for col in text_cols_vagas_feature_eng:
+            if col in df_vagas_processado.columns:
+                df_vagas_processado[col] = df_vagas_processado[col].fillna("Não Informado").astype(str)
+            else:
+                df_vagas_processado[col] = "Não Informado"
+                print(f"Aviso (Vagas): Coluna '{col}' para pré-limpeza não existia e foi criada como 'Não Informado'.")
+
+    else:
+        print("df_vagas_processado está vazio. Pré-limpeza de campos textuais de vagas ignorada.")
+
+    # ### *2.5. Engenharia de features para vagas*
+    # 2.5.1. Modalidade de Trabalho
+    if not df_vagas_processado.empty and "demais_observacoes" in df_vagas_processado.columns:
+        df_vagas_processado["modalidade_trabalho"] = extrair_modalidade(df_vagas_processado["demais_observacoes"])
+    else:
+        if df_vagas_processado.empty: print("df_vagas_processado está vazio. Extração de modalidade de trabalho ignorada.")
+        else:
+            print("Coluna 'demais_observacoes' não encontrada em df_vagas_processado. Extração de modalidade de trabalho ignorada.")
+            df_vagas_processado["modalidade_trabalho"] = "Não Informado"
+
+    # 2.5.2. Flag Vaga SAP
+    if not df_vagas_processado.empty and "vaga_sap" in df_vagas_processado.columns:
+        df_vagas_processado["vaga_sap_bool"] = marcar_vaga_sap(df_vagas_processado["vaga_sap"])
+    else:
+        if df_vagas_processado.empty: print("df_vagas_processado está vazio. Criação de 'vaga_sap_bool' ignorada.")
+        else:
+            print("Coluna 'vaga_sap' não encontrada em df_vagas_processado. 'vaga_sap_bool' será definida como 0.")
+            df_vagas_processado["vaga_sap_bool"] = 0
+
+    # 2.5.3. Nível de Idioma Ordinal
+    if not df_vagas_processado.empty:
+        if "nivel_ingles" in df_vagas_processado.columns:
+            df_vagas_processado["nivel_ingles_ordinal"] = codificar_idioma(df_vagas_processado["nivel_ingles"], MAPA_NIVEL_IDIOMA)
+        else:
+            print("Coluna 'nivel_ingles' não encontrada em df_vagas_processado. 'nivel_ingles_ordinal' será definida como 0.")
+            df_vagas_processado["nivel_ingles_ordinal"] = 0
+        if "nivel_espanhol" in df_vagas_processado.columns:
+            df_vagas_processado["nivel_espanhol_ordinal"] = codificar_idioma(df_vagas_processado["nivel_espanhol"], MAPA_NIVEL_IDIOMA)
+        else:
+            print("Coluna 'nivel_espanhol' não encontrada em df_vagas_processado. 'nivel_espanhol_ordinal' será definida como 0.")
+            df_vagas_processado["nivel_espanhol_ordinal"] = 0
+    else:
+        print("df_vagas_processado está vazio. Codificação de nível de idioma ignorada.")
+        df_vagas_processado["nivel_ingles_ordinal"] = 0
+        df_vagas_processado["nivel_espanhol_ordinal"] = 0
+
+    # 2.5.4. Limpeza de 'areas_atuacao'
+    if not df_vagas_processado.empty and "areas_atuacao" in df_vagas_processado.columns:
+        def limpar_area_atuacao(area): return str(area).replace("-", "").strip()
+        df_vagas_processado["area_atuacao_limpa"] = df_vagas_processado["areas_atuacao"].apply(limpar_area_atuacao)
+    else:
+        if df_vagas_processado.empty: print("df_vagas_processado está vazio. Limpeza de 'areas_atuacao' ignorada.")
+        else:
+            print("Coluna 'areas_atuacao' não encontrada em df_vagas_processado. 'area_atuacao_limpa' será definida como 'Não Informado'.")
+            df_vagas_processado["area_atuacao_limpa"] = "Não Informado"
+
+    # 2.5.5. Texto Combinado da Vaga para NLP
+    if not df_vagas_processado.empty:
+        text_fields_to_combine_nlp_vagas = ["titulo_vaga", "principais_atividades", "competencia_tecnicas_e_comportamentais"]
+        df_vagas_processado["texto_completo_vaga"] = ""
+        for field in text_fields_to_combine_nlp_vagas:
+            if field in df_vagas_processado.columns:
+                df_vagas_processado["texto_completo_vaga"] += df_vagas_processado[field].astype(str) + " "
+            else:
+                print(f"Aviso (Vagas): Campo '{field}' não encontrado para combinação em 'texto_completo_vaga'.")
+        df_vagas_processado["texto_completo_vaga"] = df_vagas_processado["texto_completo_vaga"].str.strip().str.lower()
+    else:
+        print("df_vagas_processado está vazio. Criação de 'texto_completo_vaga' ignorada.")
+        df_vagas_processado["texto_completo_vaga"] = ""
+
+    # 2.5.6. Tratamento dos Campos 'cliente' e 'empresa_divisao'
+    if not df_vagas_processado.empty:
+        for campo_tratamento_vaga in ["cliente", "empresa_divisao"]:
+            if campo_tratamento_vaga in df_vagas_processado.columns:
+                df_vagas_processado[campo_tratamento_vaga] = df_vagas_processado[campo_tratamento_vaga].astype(str).str.strip()
+            else:
+                print(f"Aviso (Vagas): Campo '{campo_tratamento_vaga}' não encontrado para tratamento.")
+                df_vagas_processado[campo_tratamento_vaga] = "Não Informado"
+    else:
+        print("df_vagas_processado está vazio. Tratamento de 'cliente' e 'empresa_divisao' ignorado.")
+
+    # 2.5.7. Extração de Tecnologias (Features tech_*)
+    # Lista, nomes das colunas e padrões em recrutamento/tecnologias.py; cada texto é lido uma vez para todas as tecnologias
+    if not df_vagas_processado.empty and "texto_completo_vaga" in df_vagas_processado.columns:
+        flags_tech_vagas = extrair_tecnologias(df_vagas_processado["texto_completo_vaga"], padroes_tecnologias_vagas())
+        df_vagas_processado = pd.concat([df_vagas_processado.drop(columns=flags_tech_vagas.columns, errors='ignore'), flags_tech_vagas], axis=1)
+    else:
+        if df_vagas_processado.empty: print("df_vagas_processado está vazio. Extração de tecnologias para vagas ignorada.")
+        else: print("Coluna 'texto_completo_vaga' não encontrada para extração de tecnologias de vagas.")
+
+    # 2.5.8. Generalização do Título da Vaga (categoria_vaga)
+    if not df_vagas_processado.empty and "titulo_vaga" in df_vagas_processado.columns:
+        df_vagas_processado["categoria_vaga"] = generalizar_titulo_vaga(df_vagas_processado["titulo_vaga"])
+    else:
+        if df_vagas_processado.empty: print("df_vagas_processado está vazio. Generalização de título de vaga ignorada.")
+        else:
+            print("Coluna 'titulo_vaga' não encontrada em df_vagas_processado. 'categoria_vaga' será definida como 'Não Informado'.")
+            df_vagas_processado["categoria_vaga"] = "Não Informado"
+
+    # 2.5.9. Renomear Coluna 'nivel profissional'
+    if not df_vagas_processado.empty:
+        if "nivel profissional" in df_vagas_processado.columns:
+            df_vagas_processado.rename(columns={"nivel profissional": "nivel_profissional_vaga"}, inplace=True)
+            print("Coluna 'nivel profissional' de vagas renomeada para 'nivel_profissional_vaga'.")
+        else:
+            print("Aviso (Vagas): Coluna 'nivel profissional' não encontrada para renomear, criando 'nivel_profissional_vaga' como 'Não Informado'.")
+            df_vagas_processado["nivel_profissional_vaga"] = "Não Informado"
+    return df_vagas_processado
+
+
+def processar_candidatos(df_candidatos):
+    # ### *3.3. Seleção de campos de interesse para candidatos*
+    df_candidatos_processado = pd.DataFrame()
+    if not df_candidatos.empty:
+        for col_cand in CAMPOS_SELECIONADOS_CANDIDATOS:
+            if col_cand in df_candidatos.columns:
+                df_candidatos_processado[col_cand] = df_candidatos[col_cand]
+            else:
+                print(f"Aviso (Candidatos): Coluna '{col_cand}' não encontrada no DataFrame original de candidatos. Será criada com NA.")
+                df_candidatos_processado[col_cand] = pd.NA # Usar pd.NA para tipos mistos
+    else:
+        print("DataFrame original de candidatos está vazio ou não definido. df_candidatos_processado será inicializado com colunas NA.")
+        for col_cand in CAMPOS_SELECIONADOS_CANDIDATOS:
+            df_candidatos_processado[col_cand] = pd.NA
+
+    # ### *3.4. Limpeza dos dados dos candidatos*
+    if not df_candidatos_processado.empty and df_candidatos_processado.shape[1] > 0:
+        cols_para_limpeza_profunda_cand = [
+            'local', 'titulo_profissional', 'area_atuacao', 'objetivo_profissional',
+            'conhecimentos_tecnicos', 'certificacoes', 'outras_certificacoes', 'qualificacoes',
+            'nivel_profissional', 'nivel_academico', 'nivel_ingles', 'nivel_espanhol', 'outro_idioma', 
+            'experiencia_descricoes_concatenadas', 'experiencia_titulos_concatenados'
+        ]
+        for col in df_candidatos_processado.columns:
+
+            df_candidatos_processado[col] = df_candidatos_processado[col].fillna("Não Informado").astype(str)
+            df_candidatos_processado[col] = df_candidatos_processado[col].str.strip()
+
+        placeholders_lower_cand = ['', 'nan', 'none', 'null', 'na', '<na>', 'undefined', 'nil', '-', '[]', '{}', 'não informado']
+        for col in cols_para_limpeza_profunda_cand:
+            if col in df_candidatos_processado.columns:
+                df_candidatos_processado[col] = df_candidatos_processado[col].str.lower()
+                df_candidatos_processado[col] = df_candidatos_processado[col].replace(placeholders_lower_cand, "Não Informado")
+            else: 
+                 df_candidatos_processado[col] = "Não Informado"
+
+
+        cols_case_preserved_cand = ['nome', 'email', 'pcd'] 
+        for col_special_cand in cols_case_preserved_cand:
+            if col_special_cand in df_candidatos_processado.columns:
+                 df_candidatos_processado[col_special_cand] = df_candidatos_processado[col_special_cand].replace(placeholders_lower_cand, "Não Informado", regex=False)
+            else:
+                 df_candidatos_processado[col_special_cand] = "Não Informado"
+        print("Limpeza dos campos selecionados dos candidatos concluída.")
+    else:
+        print("df_candidatos_processado está vazio ou sem colunas. Limpeza ignorada.")
+
+
+    # ### *3.5. Engenharia de features para candidatos*
+    # 3.5.1. Texto Combinado do Candidato para NLP
+    campos_para_texto_completo_cand = [
+        'titulo_profissional', 'objetivo_profissional', 'conhecimentos_tecnicos',
+        'certificacoes', 'outras_certificacoes', 'qualificacoes', 'area_atuacao',
+        'experiencia_descricoes_concatenadas', 'experiencia_titulos_concatenados'
+    ]
+    df_candidatos_processado["texto_completo_candidato"] = ""
+    if not df_candidatos_processado.empty:
+        for field_cand in campos_para_texto_completo_cand:
+            if field_cand in df_candidatos_processado.columns and not df_candidatos_processado[field_cand].isnull().all():
+            
+                df_candidatos_processado["texto_completo_candidato"] += df_candidatos_processado[field_cand].apply(lambda x: str(x) + " " if str(x).lower() != "não informado" else "")
+        df_candidatos_processado["texto_completo_candidato"] = df_candidatos_processado["texto_completo_candidato"].str.strip().str.lower()
+        print("Coluna 'texto_completo_candidato' criada.")
+    else:
+        df_candidatos_processado["texto_completo_candidato"] = ""
+        print("df_candidatos_processado vazio, 'texto_completo_candidato' criada como vazia.")
+
+    # 3.5.2. Extração de Tecnologias/Habilidades (Features skill_*)
+    if "texto_completo_candidato" in df_candidatos_processado.columns and not df_candidatos_processado.empty:
+        print("Iniciando extração de tecnologias/habilidades para candidatos...")
+        flags_skill_candidatos = extrair_tecnologias(df_candidatos_processado["texto_completo_candidato"], padroes_tecnologias_candidatos())
+        for col_name_cand in flags_skill_candidatos.columns.intersection(df_candidatos_processado.columns):
+            flags_skill_candidatos[col_name_cand] = flags_skill_candidatos[col_name_cand] | df_candidatos_processado[col_name_cand]
+        df_candidatos_processado = pd.concat([df_candidatos_processado.drop(columns=flags_skill_candidatos.columns, errors='ignore'), flags_skill_candidatos], axis=1)
+        print(f"Extração de habilidades/tecnologias para candidatos (skill_*) concluída.")
+    else:
+        print("Coluna 'texto_completo_candidato' não encontrada ou df vazio. Extração de skills ignorada.")
+
+    # Consolidar colunas duplicadas (ex: skill_nodejs e skill_node.js)
+    if 'skill_node.js' in df_candidatos_processado.columns and 'skill_nodejs' in df_candidatos_processado.columns:
+        df_candidatos_processado['skill_nodejs'] = df_candidatos_processado['skill_nodejs'] | df_candidatos_processado['skill_node.js']
+        df_candidatos_processado.drop(columns=['skill_node.js'], inplace=True, errors='ignore')
+    if 'skill_power_bi' in df_candidatos_processado.columns and 'skill_powerbi' in df_candidatos_processado.columns: # Se power_bi existir como nome limpo
+        df_candidatos_processado['skill_powerbi'] = df_candidatos_processado['skill_powerbi'] | df_candidatos_processado['skill_power_bi']
+        df_candidatos_processado.drop(columns=['skill_power_bi'], inplace=True, errors='ignore')
+
+
+    # 3.5.3. Generalização do Título Profissional do Candidato (categoria_profissional)
+    if 'titulo_profissional' in df_candidatos_processado.columns and not df_candidatos_processado.empty:
+        df_candidatos_processado["categoria_profissional"] = generalizar_titulo_profissional_candidato(df_candidatos_processado["titulo_profissional"])
+        print("Coluna 'categoria_profissional' criada.")
+    else:
+        df_candidatos_processado["categoria_profissional"] = "Não Informado"
+        print("Coluna 'titulo_profissional' não encontrada ou df vazio. 'categoria_profissional' definida como 'Não Informado'.")
+
+    # 3.5.4. Níveis de Idioma Ordinais do Candidato (mesmo mapa das vagas)
+    if not df_candidatos_processado.empty:
+        if 'nivel_ingles' in df_candidatos_processado.columns:
+            df_candidatos_processado["nivel_ingles_ordinal"] = codificar_idioma(df_candidatos_processado["nivel_ingles"], MAPA_NIVEL_IDIOMA)
+        else:
+            df_candidatos_processado["nivel_ingles_ordinal"] = 0
+            print("Aviso (Candidatos): Coluna 'nivel_ingles' não encontrada. 'nivel_ingles_ordinal' definida como 0.")
+
+        if 'nivel_espanhol' in df_candidatos_processado.columns:
+            df_candidatos_processado["nivel_espanhol_ordinal"] = codificar_idioma(df_candidatos_processado["nivel_espanhol"], MAPA_NIVEL_IDIOMA)
+        else:
+            df_candidatos_processado["nivel_espanhol_ordinal"] = 0
+            print("Aviso (Candidatos): Coluna 'nivel_espanhol' não encontrada. 'nivel_espanhol_ordinal' definida como 0.")
+        print("Colunas de nível de idioma ordinal do candidato criadas/atualizadas.")
+    else:
+        df_candidatos_processado["nivel_ingles_ordinal"] = 0
+        df_candidatos_processado["nivel_espanhol_ordinal"] = 0
+        print("df_candidatos_processado vazio. Níveis de idioma ordinal definidos como 0.")
+
+
+    # 3.5.5. Nível Acadêmico Padronizado do Candidato
+    if 'nivel_academico' in df_candidatos_processado.columns and not df_candidatos_processado.empty:
+        df_candidatos_processado["nivel_academico_padronizado"] = padronizar_nivel_academico_candidato(df_candidatos_processado["nivel_academico"], MAPA_NIVEL_ACADEMICO_CANDIDATO)
+        print("Coluna 'nivel_academico_padronizado' do candidato criada.")
+    else:
+        df_candidatos_processado["nivel_academico_padronizado"] = "Não Informado"
+        print("Coluna 'nivel_academico' do candidato não encontrada ou df vazio. 'nivel_academico_padronizado' definida como 'Não Informado'.")
+
+    # 3.5.6. Nível Profissional Padronizado do Candidato
+    if 'nivel_profissional' in df_candidatos_processado.columns and not df_candidatos_processado.empty :
+        df_candidatos_processado["nivel_profissional_padronizado"] = padronizar_nivel_profissional_candidato(df_candidatos_processado["nivel_profissional"], MAPA_NIVEL_PROFISSIONAL_CANDIDATO)
+        print("Coluna 'nivel_profissional_padronizado' do candidato criada.")
+    else:
+        df_candidatos_processado["nivel_profissional_padronizado"] = "Não Informado"
+        print("Coluna 'nivel_profissional' (original) do candidato não encontrada ou df vazio. 'nivel_profissional_padronizado' definida como 'Não Informado'.")
+
+    # 3.5.7. PCD (Pessoa com Deficiência) Padronizado
+    if 'pcd' in df_candidatos_processado.columns and not df_candidatos_processado.empty:
+        df_candidatos_processado["pcd_padronizado"] = limpar_pcd_candidato(df_candidatos_processado["pcd"])
+        print("Coluna 'pcd_padronizado' do candidato criada.")
+    else:
+        df_candidatos_processado["pcd_padronizado"] = "Não Informado"
+        print("Coluna 'pcd' do candidato não encontrada ou df vazio. 'pcd_padronizado' definida como 'Não Informado'.")
+
+    # 3.5.8. Localização Limpa do Candidato
+    if 'local' in df_candidatos_processado.columns and not df_candidatos_processado.empty:
+        df_candidatos_processado["local_limpo_candidato"] = df_candidatos_processado["local"] # Já foi limpo na Seção 3.4
+        print("Coluna 'local_limpo_candidato' do candidato criada/mantida.")
+    else:
+        df_candidatos_processado["local_limpo_candidato"] = "Não Informado"
+        print("Coluna 'local' do candidato não encontrada ou df vazio. 'local_limpo_candidato' definida como 'Não Informado'.")
+    return df_candidatos_processado
+
+
+# Seção 4.3: colunas de texto livre (em minúsculas) e valores tratados como ausentes
+COLUNAS_MINUSCULAS_PROSPECTS = [
+    "titulo_vaga_origem_json", "modalidade_vaga_origem_json", "nome_candidato",
+    "situacao_candidato", "comentario", "recrutador"
+]
+PLACEHOLDERS_PROSPECTS = ['', 'nan', 'none', 'null', 'na', '<na>', 'undefined', 'nil', '-', '[]', '{}', 'não informado', '<NA>']
+PADRAO_VALOR_MONETARIO = re.compile(r'r\$|\bsal[áa]rio\b|\bremunera[çc][ãa]o\b|pretens[ãa]o', re.IGNORECASE)
+
+
+def _limpar_coluna_prospect(serie, minusculas):
+    # strip, lower e placeholders -> "Não Informado" uma vez por valor distinto. Com o lower antes da
+    # troca, uma passada dá o mesmo que as duas do notebook: placeholder em minúsculas continua placeholder
+    texto = serie.fillna('').astype(str)
+    codigos, unicos = pd.factorize(texto)
+    unicos = pd.Series(unicos, dtype=texto.dtype).str.strip()
+    if minusculas:
+        unicos = unicos.str.lower()
+    unicos = unicos.replace(PLACEHOLDERS_PROSPECTS, "Não Informado")
+    return unicos.take(codigos).set_axis(serie.index)
+
+
+def _aplicar_por_valor(serie, funcao):
+    # Regras de poucas categorias (modalidade, situação) aplicadas aos valores distintos
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=False)
+    return pd.Series([funcao(valor) for valor in unicos]).take(codigos).set_axis(serie.index)
+
+
+def processar_prospects(df_prospects_processado):
+    # ### *4.3. Limpeza e pré-processamento do DataFrame de prospecções*
+    if not df_prospects_processado.empty:
+        for col_prospect in df_prospects_processado.columns:
+            df_prospects_processado[col_prospect] = _limpar_coluna_prospect(df_prospects_processado[col_prospect], col_prospect in COLUNAS_MINUSCULAS_PROSPECTS)
+
+        date_cols_prospects = ["data_candidatura", "data_ultima_atualizacao"]
+        for col_date_prospect in date_cols_prospects:
+            if col_date_prospect in df_prospects_processado.columns:
+                df_prospects_processado[col_date_prospect + "_dt"] = pd.to_datetime(df_prospects_processado[col_date_prospect], format='%d-%m-%Y', errors='coerce')
+            else:
+                df_prospects_processado[col_date_prospect + "_dt"] = pd.NaT 
+        print("Limpeza e pré-processamento de df_prospects_processado concluída.")
+    else:
+        print("DataFrame de prospecções está vazio ou não definido. Limpeza e Pré-processamento ignorados.")
+
+
+    # ### *4.4. Engenharia de features para prospecções*
+    # 4.4.1. Duração da Etapa/Processo (em dias) - duracao_etapa_dias
+    if not df_prospects_processado.empty:
+        if "data_ultima_atualizacao_dt" in df_prospects_processado.columns and "data_candidatura_dt" in df_prospects_processado.columns:
+            df_prospects_processado["data_ultima_atualizacao_dt"] = pd.to_datetime(df_prospects_processado["data_ultima_atualizacao_dt"], errors='coerce')
+            df_prospects_processado["data_candidatura_dt"] = pd.to_datetime(df_prospects_processado["data_candidatura_dt"], errors='coerce')
+
+            duracao_etapa_dias = (df_prospects_processado["data_ultima_atualizacao_dt"] - df_prospects_processado["data_candidatura_dt"]).dt.days
+            df_prospects_processado["duracao_etapa_dias"] = duracao_etapa_dias.where(duracao_etapa_dias >= 0) # Negativas viram NaN
+            print("Coluna 'duracao_etapa_dias' criada.")
+        else:
+            df_prospects_processado["duracao_etapa_dias"] = np.nan
+            print("Colunas de data '_dt' não encontradas ou inválidas em prospecções para calcular 'duracao_etapa_dias'. Coluna criada com NaN.")
+    else:
+        df_prospects_processado["duracao_etapa_dias"] = np.nan
+
+
+    # 4.4.2. Padronização da Modalidade da Vaga (em Prospecções)
+    if not df_prospects_processado.empty:
+        if 'modalidade_vaga_origem_json' in df_prospects_processado.columns:
+            df_prospects_processado["modalidade_vaga_padronizada_prospect"] = _aplicar_por_valor(df_prospects_processado["modalidade_vaga_origem_json"], padronizar_modalidade_prospect)
+            print("Coluna 'modalidade_vaga_padronizada_prospect' criada.")
+        else:
+            df_prospects_processado["modalidade_vaga_padronizada_prospect"] = "Não Informado"
+            print("Coluna 'modalidade_vaga_origem_json' não encontrada em prospecções. 'modalidade_vaga_padronizada_prospect' definida como 'Não Informado'.")
+    else:
+        df_prospects_processado["modalidade_vaga_padronizada_prospect"] = "Não Informado"
+
+    # 4.4.3. Agrupamento da Situação do Candidato (situacao_candidato_agrupada)
+    if not df_prospects_processado.empty:
+        if 'situacao_candidato' in df_prospects_processado.columns:
+            df_prospects_processado["situacao_candidato_agrupada"] = _aplicar_por_valor(df_prospects_processado["situacao_candidato"], agrupar_situacao_candidato)
+            print("Coluna 'situacao_candidato_agrupada' criada/atualizada.")
+        else:
+            df_prospects_processado["situacao_candidato_agrupada"] = "Não Informado"
+            print("Coluna 'situacao_candidato' não encontrada em prospecções. 'situacao_candidato_agrupada' definida como 'Não Informado'.")
+    else:
+        df_prospects_processado["situacao_candidato_agrupada"] = "Não Informado"
+
+
+    # 4.4.4. Análise de Comentário por Valor Monetário
+    if not df_prospects_processado.empty:
+        if 'comentario' in df_prospects_processado.columns:
+            # Pelo re do Python (dtype object): no RE2 do pyarrow o \b só considera letras ASCII ("ésalário" casaria)
+            df_prospects_processado['comentario_tem_valor_monetario'] = df_prospects_processado['comentario'].astype(object).str.contains(PADRAO_VALOR_MONETARIO, na=False).astype('int64')
+            print("Coluna 'comentario_tem_valor_monetario' criada.")
+        else:
+            df_prospects_processado['comentario_tem_valor_monetario'] = 0
+            print("Coluna 'comentario' não encontrada em prospecções. 'comentario_tem_valor_monetario' definida como 0.")
+    else:
+        df_prospects_processado['comentario_tem_valor_monetario'] = 0
+
+    print("Engenharia de features para df_prospects_processado concluída.")
+    return df_prospects_processado
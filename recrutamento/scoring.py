@@ -0,0 +1,381 @@
+"""
+Scoring em lote: monta a matriz de features de todos os candidatos de uma vaga de uma só vez
+(a partir do armazém de features de candidatos pré-calculado) e chama predict_proba uma vez
+por bloco, reproduzindo exatamente as features do treino (seções 7 e 8 do notebook; conferido por
+recrutamento.paridade_features).
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from recrutamento.codificador import (
+    FEATURES_CATEGORICAS_CANDIDATO, FEATURES_CATEGORICAS_VAGA, codificador_para_colunas, coluna_de_origem,
+    coluna_texto, posicao_one_hot, posicoes_one_hot
+)
+from recrutamento.features import codificar_idioma, nivel_idioma, nome_base_skill, nome_base_tech, vaga_sap_do_texto
+from recrutamento.floresta import LIMITE_LINHAS_FLORESTA_NUMPY, eh_floresta_compilada, prever_probabilidades_floresta
+from recrutamento.indices import (
+    construir_indice_skills, construir_indices_prefiltro, contar_skills_em_comum,
+    linhas_pre_filtradas, mascara_por_colunas, mascara_por_nomes_base
+)
+from recrutamento.instrumentacao import registrar_etapa
+
+# Tamanho máximo de cada bloco enviado ao predict_proba
+TAMANHO_LOTE_PREDICAO = 20000
+
+def coluna_numerica(df, coluna):
+    if coluna not in df.columns:
+        return np.zeros(len(df), dtype=np.float32)
+    return pd.to_numeric(df[coluna], errors='coerce').fillna(0).to_numpy(dtype=np.float32)
+
+
+def coluna_idioma_ordinal(df, coluna, mapa_nivel_idioma):
+    return codificar_idioma(coluna_texto(df, coluna), mapa_nivel_idioma).to_numpy(dtype=np.float32)
+
+
+def techs_da_vaga(vaga_serie):
+    # Colunas tech_* da vaga e seus valores numéricos (não numéricos e ausentes valem 0), numa única conversão
+    posicoes = [i for i, col in enumerate(vaga_serie.index) if col.startswith('tech_')]
+    if not posicoes:
+        return [], np.zeros(0)
+    valores = pd.to_numeric(vaga_serie.to_numpy()[posicoes], errors='coerce')
+    return [vaga_serie.index[i] for i in posicoes], np.where(pd.isna(valores), 0, valores)
+
+
+def preparar_vetor_vaga(vaga_serie, colunas_modelo, mapas):
+    """
+    Pré-calcula tudo o que depende apenas da vaga: os valores das features de vaga já como
+    (posições em colunas_modelo, valores float32), incluindo as colunas one-hot ativas, e as
+    techs ativas que contam para skills_match_count.
+    """
+    mapa_nivel_idioma = mapas['mapa_nivel_idioma']
+    codificador = codificador_para_colunas(colunas_modelo)
+    indice_colunas = codificador['indice_colunas']
+
+    # Posição em colunas_modelo -> valor; uma escrita posterior na mesma coluna prevalece
+    valores = {}
+    def definir(col, valor):
+        if col in indice_colunas:
+            valores[indice_colunas[col]] = valor
+
+    ingles_vaga = nivel_idioma(vaga_serie.get('nivel_ingles', "Não Informado"), mapa_nivel_idioma)
+    espanhol_vaga = nivel_idioma(vaga_serie.get('nivel_espanhol', "Não Informado"), mapa_nivel_idioma)
+    definir('nivel_ingles_ordinal_vaga', ingles_vaga)
+    definir('nivel_espanhol_ordinal_vaga', espanhol_vaga)
+    definir('vaga_sap_bool', vaga_sap_do_texto(vaga_serie.get('vaga_sap', "Não")))
+    definir('comentario_tem_valor_monetario', 0)
+
+    tech_cols_vaga, valores_techs = techs_da_vaga(vaga_serie)
+    total_techs_vaga = valores_techs.sum() if tech_cols_vaga else 0
+    definir('total_techs_vaga', total_techs_vaga)
+
+    for tech_col, valor in zip(tech_cols_vaga, valores_techs):
+        definir(tech_col, valor)
+
+    for feature, coluna_origem in FEATURES_CATEGORICAS_VAGA.items():
+        posicao = posicao_one_hot(codificador, feature, vaga_serie.get(coluna_origem, 'Não Informado'))
+        if posicao >= 0:
+            valores[posicao] = 1
+
+    techs_ativas_vaga = [nome_base_tech(col) for col, valor in zip(tech_cols_vaga, valores_techs) if valor == 1]
+
+    return {
+        'indice_colunas': indice_colunas,
+        'colunas_definidas': np.fromiter(valores.keys(), dtype=np.intp, count=len(valores)),
+        'valores_definidos': np.array(list(valores.values()), dtype=np.float32),
+        'total_techs_vaga': total_techs_vaga,
+        'techs_ativas': techs_ativas_vaga,
+        'ingles': ingles_vaga,
+        'espanhol': espanhol_vaga,
+    }
+
+
+def _ordinal_compacto(valores):
+    # Níveis ordinais de idioma são inteiros pequenos: uint8 quando cabem sem perda
+    if len(valores) and ((valores >= 0) & (valores <= 255) & (valores == np.floor(valores))).all():
+        return valores.astype(np.uint8)
+    return valores.astype(np.float32)
+
+
+def construir_armazem_candidatos(df_candidatos, colunas_modelo, mapas):
+    """
+    Armazém de features do lado do candidato, montado uma vez por carga de dados, em layout
+    compacto: idiomas ordinais, skill_* só no bitset do índice de skills e, por feature categórica,
+    a coluna one-hot ativa. A linha densa alinhada a colunas_modelo é remontada por bloco em
+    matriz_candidatos_do_armazem. Também guarda o índice id_candidato -> linha.
+    """
+    indice_colunas = codificador_para_colunas(colunas_modelo)['indice_colunas']
+    n = len(df_candidatos)
+    mapa_nivel_idioma = mapas['mapa_nivel_idioma']
+    ingles_cand = _ordinal_compacto(coluna_idioma_ordinal(df_candidatos, 'nivel_ingles', mapa_nivel_idioma))
+    espanhol_cand = _ordinal_compacto(coluna_idioma_ordinal(df_candidatos, 'nivel_espanhol', mapa_nivel_idioma))
+
+    # Skills 0/1 do modelo saem do bitset; só colunas com outros valores ficam densas
+    indice_skills = construir_indice_skills(df_candidatos, coluna_numerica)
+    bits_skills, colunas_skills, colunas_skills_densas, valores_skills_densas = [], [], [], []
+    for j, col in enumerate(indice_skills['colunas']):
+        if col not in indice_colunas:
+            continue
+        valores_col = coluna_numerica(df_candidatos, col)
+        if ((valores_col == 0) | (valores_col == 1)).all():
+            bits_skills.append(j)
+            colunas_skills.append(indice_colunas[col])
+        else:
+            colunas_skills_densas.append(indice_colunas[col])
+            valores_skills_densas.append(valores_col)
+    skills_densas = np.zeros((n, len(colunas_skills_densas)), dtype=np.float32)
+    for j, valores_col in enumerate(valores_skills_densas):
+        skills_densas[:, j] = valores_col
+
+    codificador = codificador_para_colunas(colunas_modelo)
+    dtype_posicao = np.int16 if len(colunas_modelo) <= np.iinfo(np.int16).max else np.int32
+    one_hot_candidato = np.empty((n, len(FEATURES_CATEGORICAS_CANDIDATO)), dtype=dtype_posicao)
+    for f, (feature, coluna_origem) in enumerate(FEATURES_CATEGORICAS_CANDIDATO.items()):
+        one_hot_candidato[:, f] = posicoes_one_hot(codificador, feature, df_candidatos, coluna_origem)
+
+    if 'id_candidato' in df_candidatos.columns:
+        ids = df_candidatos['id_candidato'].astype(str).to_numpy()
+    else:
+        ids = np.array([str(i) for i in df_candidatos.index], dtype=object)
+
+    return {
+        'colunas_modelo': list(colunas_modelo),
+        'indice_colunas': indice_colunas,
+        'layout_candidato': {
+            'ingles': indice_colunas.get('nivel_ingles_ordinal_candidato', -1),
+            'espanhol': indice_colunas.get('nivel_espanhol_ordinal_candidato', -1),
+            'bits_skills': np.array(bits_skills, dtype=np.intp),
+            'colunas_skills': np.array(colunas_skills, dtype=np.intp),
+            'colunas_skills_densas': np.array(colunas_skills_densas, dtype=np.intp),
+        },
+        'ingles': ingles_cand,
+        'espanhol': espanhol_cand,
+        'skills_densas': skills_densas,
+        'one_hot_candidato': one_hot_candidato,
+        'indice_skills': indice_skills,
+        'indices_prefiltro': construir_indices_prefiltro(df_candidatos),
+        'ids': ids,
+        'indice_por_id': {id_cand: i for i, id_cand in enumerate(ids)},
+    }
+
+
+def n_candidatos(armazem):
+    return len(armazem['ingles'])
+
+
+def matriz_candidatos_do_armazem(armazem, linhas, saida=None):
+    # Linhas densas (float32, alinhadas a colunas_modelo) só com as features do lado do candidato;
+    # com saida (buffer float32 de len(linhas) linhas), escreve nele em vez de alocar
+    layout = armazem['layout_candidato']
+    if saida is None:
+        matriz = np.zeros((len(linhas), len(armazem['colunas_modelo'])), dtype=np.float32)
+    else:
+        matriz = saida
+        matriz[...] = 0
+    if layout['ingles'] >= 0:
+        matriz[:, layout['ingles']] = armazem['ingles'][linhas]
+    if layout['espanhol'] >= 0:
+        matriz[:, layout['espanhol']] = armazem['espanhol'][linhas]
+
+    if len(layout['bits_skills']):
+        # Bit j da palavra w está no byte 8*w + j//8 (uint64 little-endian)
+        bytes_skills = np.ascontiguousarray(armazem['indice_skills']['bits'][linhas]).view(np.uint8)
+        bits = np.unpackbits(bytes_skills, axis=1, bitorder='little')
+        matriz[:, layout['colunas_skills']] = bits[:, layout['bits_skills']]
+    if len(layout['colunas_skills_densas']):
+        matriz[:, layout['colunas_skills_densas']] = armazem['skills_densas'][linhas]
+
+    one_hot = armazem['one_hot_candidato'][linhas]
+    for f in range(one_hot.shape[1]):
+        ativas = np.flatnonzero(one_hot[:, f] >= 0)
+        matriz[ativas, one_hot[ativas, f]] = 1
+    return matriz
+
+
+def linhas_pre_filtradas_para_vaga(vaga_serie, armazem, num_min_tech_match=1, registro=None):
+    # Filtros 1 e 2: Categoria e Nível Profissional (interseção nos índices invertidos)
+    linhas = linhas_pre_filtradas(
+        armazem['indices_prefiltro'],
+        n_candidatos(armazem),
+        vaga_serie.get('categoria_vaga', "Não Informado"),
+        vaga_serie.get('nivel_profissional_vaga', "Não Informado"),
+        registro
+    )
+
+    # Filtro 3: Mínimo de Tecnologias em Comum (AND + popcount no índice de skills em bitset)
+    tech_cols_vaga, valores_techs = techs_da_vaga(vaga_serie)
+    techs_requeridas_pela_vaga = [col.replace('tech_', '') for col, valor in zip(tech_cols_vaga, valores_techs) if valor == 1]
+    if techs_requeridas_pela_vaga and num_min_tech_match > 0:
+        inicio = time.perf_counter()
+        entrada = len(linhas)
+        indice_skills = armazem['indice_skills']
+        mascara_techs_vaga = mascara_por_colunas(indice_skills, [f"skill_{tech}" for tech in techs_requeridas_pela_vaga])
+        contagem_techs = contar_skills_em_comum(indice_skills, mascara_techs_vaga, linhas)
+        linhas = linhas[contagem_techs >= num_min_tech_match]
+        registrar_etapa(registro, 'filtro_techs', time.perf_counter() - inicio, entrada, len(linhas))
+    return linhas
+
+
+def _buffer_matriz(armazem, n_linhas):
+    # Uma matriz por busca, reaproveitada por todos os blocos (o bloco é consumido antes do próximo)
+    return np.empty((n_linhas, len(armazem['colunas_modelo'])), dtype=np.float32)
+
+
+def matriz_features_do_armazem(armazem, vetor_vaga, linhas=None, saida=None):
+    indice_colunas = armazem['indice_colunas']
+    if linhas is None:
+        linhas = np.arange(n_candidatos(armazem))
+    matriz = matriz_candidatos_do_armazem(armazem, linhas, saida)
+    matriz[:, vetor_vaga['colunas_definidas']] = vetor_vaga['valores_definidos']
+
+    ingles_cand = armazem['ingles'][linhas]
+    espanhol_cand = armazem['espanhol'][linhas]
+    mascara_vaga = mascara_por_nomes_base(armazem['indice_skills'], vetor_vaga['techs_ativas'])
+    skills_match_count = contar_skills_em_comum(armazem['indice_skills'], mascara_vaga, linhas).astype(np.float32)
+
+    pareadas = {
+        'compat_ingles': (ingles_cand >= vetor_vaga['ingles']).astype(np.float32),
+        'compat_espanhol': (espanhol_cand >= vetor_vaga['espanhol']).astype(np.float32),
+        'skills_match_count': skills_match_count,
+        'skills_faltantes_vaga': np.maximum(0, vetor_vaga['total_techs_vaga'] - skills_match_count),
+    }
+    for col, valores_col in pareadas.items():
+        if col in indice_colunas:
+            matriz[:, indice_colunas[col]] = valores_col
+    return matriz
+
+
+def linha_features_par(vaga_serie, candidato_serie, colunas_modelo, mapas, saida=None):
+    """
+    Features de um único par (vaga, candidato), as mesmas da matriz por vaga, escritas direto numa linha float32 alinhada a colunas_modelo (saida, se dada) sem DataFrame
+    intermediário: cada feature categórica vira a posição da sua coluna one-hot no codificador.
+    """
+    mapa_nivel_idioma = mapas['mapa_nivel_idioma']
+    codificador = codificador_para_colunas(colunas_modelo)
+    indice_colunas = codificador['indice_colunas']
+    vetor_vaga = preparar_vetor_vaga(vaga_serie, colunas_modelo, mapas)
+    if saida is None:
+        linha = np.zeros(len(colunas_modelo), dtype=np.float32)
+    else:
+        linha = saida
+        linha[...] = 0
+
+    def definir(col, valor):
+        if col in indice_colunas:
+            linha[indice_colunas[col]] = valor
+
+    ingles_cand = nivel_idioma(candidato_serie.get('nivel_ingles', "Não Informado"), mapa_nivel_idioma)
+    espanhol_cand = nivel_idioma(candidato_serie.get('nivel_espanhol', "Não Informado"), mapa_nivel_idioma)
+    definir('nivel_ingles_ordinal_candidato', ingles_cand)
+    definir('nivel_espanhol_ordinal_candidato', espanhol_cand)
+
+    skill_cols_candidato = [col for col in candidato_serie.index if col.startswith('skill_')]
+    valores_skills = np.zeros(0)
+    if skill_cols_candidato:
+        valores_skills = pd.to_numeric(candidato_serie[skill_cols_candidato], errors='coerce').fillna(0).to_numpy()
+    for skill_col, valor in zip(skill_cols_candidato, valores_skills):
+        definir(skill_col, valor)
+
+    for feature, coluna_origem in FEATURES_CATEGORICAS_CANDIDATO.items():
+        posicao = posicao_one_hot(codificador, feature, candidato_serie.get(coluna_de_origem(candidato_serie.index, coluna_origem), "Não Informado"))
+        if posicao >= 0:
+            linha[posicao] = 1
+
+    linha[vetor_vaga['colunas_definidas']] = vetor_vaga['valores_definidos']
+
+    skill_ativa_por_nome_base = {nome_base_skill(col): valor == 1 for col, valor in zip(skill_cols_candidato, valores_skills)}
+    skills_match_count = sum(1 for tech in vetor_vaga['techs_ativas'] if skill_ativa_por_nome_base.get(tech, False))
+    definir('compat_ingles', 1 if ingles_cand >= vetor_vaga['ingles'] else 0)
+    definir('compat_espanhol', 1 if espanhol_cand >= vetor_vaga['espanhol'] else 0)
+    definir('skills_match_count', skills_match_count)
+    definir('skills_faltantes_vaga', max(0, vetor_vaga['total_techs_vaga'] - skills_match_count))
+    return linha
+
+
+def prever_probabilidades_lote(modelo, matriz, colunas_modelo, tamanho_lote=TAMANHO_LOTE_PREDICAO):
+    # modelo pode ser o estimador sklearn ou a floresta compilada (recrutamento.floresta), que
+    # responde os blocos pequenos em NumPy e repassa os grandes ao predict_proba do sklearn
+    # (todos em NumPy enquanto o estimador sklearn não foi anexado)
+    probabilidades = np.empty(len(matriz), dtype=np.float64)
+    for inicio in range(0, len(matriz), tamanho_lote):
+        bloco_matriz = matriz[inicio:inicio + tamanho_lote]
+        if eh_floresta_compilada(modelo):
+            if len(bloco_matriz) <= LIMITE_LINHAS_FLORESTA_NUMPY or modelo['modelo'] is None:
+                probabilidades[inicio:inicio + tamanho_lote] = prever_probabilidades_floresta(modelo, bloco_matriz)
+                continue
+            estimador = modelo['modelo']
+        else:
+            estimador = modelo
+        bloco = pd.DataFrame(bloco_matriz, columns=colunas_modelo)
+        probabilidades[inicio:inicio + tamanho_lote] = estimador.predict_proba(bloco)[:, 1]
+    return probabilidades
+
+
+def selecionar_top_k(linhas, scores, k):
+    # Seleção parcial: só ordena quem empata ou supera o k-ésimo maior score.
+    # Empates são resolvidos pela ordem original dos candidatos (linha crescente).
+    if k <= 0:
+        return linhas[:0], scores[:0]
+    if len(scores) > k:
+        limiar = np.partition(scores, len(scores) - k)[len(scores) - k]
+        selecionados = np.flatnonzero(scores >= limiar)
+        linhas, scores = linhas[selecionados], scores[selecionados]
+    ordem = np.lexsort((linhas, -scores))[:k]
+    return linhas[ordem], scores[ordem]
+
+
+def top_k_armazem_progressivo(vaga_serie, armazem, linhas, modelo, mapas, k=5, tamanho_lote=TAMANHO_LOTE_PREDICAO, tamanho_primeiro_lote=None, registro=None, prever=None):
+    """
+    Mesmo cálculo de top_k_armazem, gerando (linhas, scores, linhas_processadas) com o top-k
+    parcial após cada bloco. Os blocos começam em tamanho_primeiro_lote e dobram até tamanho_lote,
+    para que o primeiro resultado saia rápido sem pagar overhead de predict em todos os blocos.
+    Com registro (recrutamento.instrumentacao), acumula o tempo de features, predição e ranking.
+    prever(matriz) -> scores substitui a predição direta pelo modelo (ex.: o micro-lote do serviço).
+    """
+    linhas = np.asarray(linhas, dtype=np.int64)
+    if len(linhas) == 0 or k <= 0:
+        return
+    melhores_linhas = np.empty(0, dtype=np.int64)
+    melhores_scores = np.empty(0, dtype=np.float64)
+
+    instante = time.perf_counter()
+    vetor_vaga = preparar_vetor_vaga(vaga_serie, armazem['colunas_modelo'], mapas)
+    registrar_etapa(registro, 'features', time.perf_counter() - instante)
+    tamanho_bloco = min(tamanho_primeiro_lote or tamanho_lote, tamanho_lote)
+    buffer = _buffer_matriz(armazem, min(len(linhas), tamanho_lote))
+    inicio = 0
+    while inicio < len(linhas):
+        linhas_bloco = linhas[inicio:inicio + tamanho_bloco]
+        instante = time.perf_counter()
+        matriz_bloco = matriz_features_do_armazem(armazem, vetor_vaga, linhas_bloco, buffer[:len(linhas_bloco)])
+        registrar_etapa(registro, 'features', time.perf_counter() - instante, linhas=len(linhas_bloco))
+        instante = time.perf_counter()
+        if prever is None:
+            scores_bloco = prever_probabilidades_lote(modelo, matriz_bloco, armazem['colunas_modelo'], tamanho_lote)
+        else:
+            scores_bloco = prever(matriz_bloco)
+        registrar_etapa(registro, 'predicao', time.perf_counter() - instante, linhas=len(linhas_bloco))
+        instante = time.perf_counter()
+        melhores_linhas, melhores_scores = selecionar_top_k(
+            np.concatenate([melhores_linhas, linhas_bloco]),
+            np.concatenate([melhores_scores, scores_bloco]),
+            k
+        )
+        registrar_etapa(registro, 'ranking', time.perf_counter() - instante, linhas=len(linhas_bloco))
+        inicio += len(linhas_bloco)
+        yield melhores_linhas, melhores_scores, inicio
+        tamanho_bloco = min(tamanho_bloco * 2, tamanho_lote)
+
+
+def top_k_armazem(vaga_serie, armazem, linhas, modelo, mapas, k=5, tamanho_lote=TAMANHO_LOTE_PREDICAO, registro=None, prever=None):
+    """
+    Ranking exato dos k melhores candidatos entre `linhas`, pontuando em blocos e mantendo apenas
+    os k melhores até o momento (memória O(k + tamanho_lote)). Retorna (linhas, scores) em ordem
+    decrescente de score.
+    """
+    melhores_linhas = np.empty(0, dtype=np.int64)
+    melhores_scores = np.empty(0, dtype=np.float64)
+    for melhores_linhas, melhores_scores, _ in top_k_armazem_progressivo(vaga_serie, armazem, linhas, modelo, mapas, k, tamanho_lote, registro=registro, prever=prever):
+        pass
+    return melhores_linhas, melhores_scores
@@ -0,0 +1,354 @@
+"""
+Serviço HTTP de scoring, sem Streamlit, para integrações (ATS): carrega os mesmos artefatos do
+main() do app e responde JSON. Requisições pequenas que chegam juntas são agrupadas num micro-lote
+e pontuadas numa única chamada de predição, dentro de uma janela de tempo configurável.
+
+Endpoints (POST, corpo JSON):
+    /score        {"vaga_id": "123", "candidate_ids": ["1", "2"]}
+    /top_k        {"vaga_id": "123", "k": 5, "num_min_tech_match": 1}
+    /score_pairs  {"pairs": [{"vaga_id": "123", "candidate_id": "1"}, ...]}
+GET /saude devolve o tamanho das bases e os contadores do micro-lote.
+
+Uso (só biblioteca padrão; teste de carga em recrutamento.carga_servico):
+    python -m recrutamento.servico --porta 8000 --janela-ms 5
+"""
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from recrutamento.busca_reversa import construir_armazem_vagas, matriz_features_pares
+from recrutamento.cache_scores import versao_artefatos
+from recrutamento.carregamento import PATH_ARTIFACTS, PATH_DATA, arquivos_versao_scores, carregar_tudo
+from recrutamento.floresta import compilar_floresta
+from recrutamento.memoria import candidatos_para_exibicao
+from recrutamento.scoring import construir_armazem_candidatos, linhas_pre_filtradas_para_vaga, prever_probabilidades_lote, top_k_armazem
+from recrutamento.tabela_topk import carregar_tabela_topk, top_k_da_tabela
+
+JANELA_MS_PADRAO = 5.0
+# Acima disso o micro-lote é pontuado sem esperar o fim da janela
+MAX_LINHAS_LOTE_PADRAO = 4096
+K_PADRAO = 5
+K_MAXIMO = 1000
+FILA_CONEXOES = 128
+
+
+#  Micro-lote: junta matrizes de requisições concorrentes numa só chamada de predição
+def criar_micro_lote(prever, janela_segundos=JANELA_MS_PADRAO / 1000, max_linhas=MAX_LINHAS_LOTE_PADRAO):
+    lote = {
+        'fila': queue.Queue(),
+        'prever': prever,
+        'janela': janela_segundos,
+        'max_linhas': max_linhas,
+        'chamadas': 0,
+        'requisicoes': 0,
+        'linhas': 0,
+    }
+    lote['thread'] = threading.Thread(target=_executar_micro_lote, args=(lote,), name="micro-lote-scoring", daemon=True)
+    lote['thread'].start()
+    return lote
+
+
+def _executar_micro_lote(lote):
+    fila = lote['fila']
+    while True:
+        item = fila.get()
+        if item is None:
+            return
+        # A janela começa na primeira requisição do lote; janela 0 = sem agrupamento
+        pendentes = [item]
+        n_linhas = len(item[0])
+        prazo = time.perf_counter() + lote['janela']
+        while n_linhas < lote['max_linhas']:
+            restante = prazo - time.perf_counter()
+            if restante <= 0:
+                break
+            try:
+                item = fila.get(timeout=restante)
+            except queue.Empty:
+                break
+            if item is None:
+                # Pontua o que já chegou e encerra na próxima volta
+                fila.put(None)
+                break
+            pendentes.append(item)
+            n_linhas += len(item[0])
+
+        matrizes = [matriz for matriz, _ in pendentes]
+        try:
+            scores = lote['prever'](matrizes[0] if len(matrizes) == 1 else np.concatenate(matrizes))
+        except Exception as e:
+            for _, futuro in pendentes:
+                futuro.set_exception(e)
+            continue
+        lote['chamadas'] += 1
+        lote['requisicoes'] += len(pendentes)
+        lote['linhas'] += n_linhas
+        inicio = 0
+        for matriz, futuro in pendentes:
+            futuro.set_result(scores[inicio:inicio + len(matriz)])
+            inicio += len(matriz)
+
+
+def prever_em_micro_lote(lote, matriz):
+    if len(matriz) == 0:
+        return np.empty(0, dtype=np.float64)
+    futuro = Future()
+    lote['fila'].put((matriz, futuro))
+    return futuro.result()
+
+
+def fechar_micro_lote(lote):
+    lote['fila'].put(None)
+    lote['thread'].join()
+
+
+#  Carga dos artefatos e operações de scoring
+def carregar_servico(path_data=PATH_DATA, path_artifacts=PATH_ARTIFACTS, janela_ms=JANELA_MS_PADRAO, max_linhas_lote=MAX_LINHAS_LOTE_PADRAO):
+    dados = carregar_tudo(path_data, path_artifacts)
+    try:
+        modelo = compilar_floresta(dados['modelo'])
+    except ValueError as e:
+        print(f"Aviso: modelo não compilado para inferência em NumPy ({e}); usando predict_proba.")
+        modelo = dados['modelo']
+
+    armazem = construir_armazem_candidatos(dados['df_candidatos'], dados['colunas_modelo'], dados['mapas'])
+    df_vagas = dados['df_vagas']
+    posicao_por_vaga = {}
+    for pos, id_vaga in enumerate(df_vagas['id_vaga'].astype(str)):
+        posicao_por_vaga.setdefault(id_vaga, pos)
+
+    try:
+        tabela = carregar_tabela_topk(os.path.join(path_data, 'topk'), versao_artefatos(arquivos_versao_scores(path_data, path_artifacts)))
+    except Exception as e:
+        print(f"Aviso: não foi possível abrir a tabela top-N: {e}")
+        tabela = None
+
+    return {
+        'modelo': modelo,
+        'mapas': dados['mapas'],
+        'df_vagas': df_vagas,
+        'df_candidatos': candidatos_para_exibicao(dados['df_candidatos']),
+        'armazem': armazem,
+        'armazem_vagas': construir_armazem_vagas(df_vagas, armazem, dados['mapas']),
+        'posicao_por_vaga': posicao_por_vaga,
+        'tabela_topk': tabela,
+        'micro_lote': criar_micro_lote(
+            partial(prever_probabilidades_lote, modelo, colunas_modelo=armazem['colunas_modelo']), janela_ms / 1000, max_linhas_lote
+        ),
+    }
+
+
+def pontuar_pares(servico, pares):
+    """
+    Scores de pares (vaga_id, candidate_id), na ordem recebida; None para pares com id desconhecido.
+    Todos os pares válidos entram juntos no micro-lote.
+    """
+    indice_por_id = servico['armazem']['indice_por_id']
+    linhas_vagas, linhas_candidatos, validos = [], [], []
+    for i, (vaga_id, candidato_id) in enumerate(pares):
+        linha_vaga = servico['posicao_por_vaga'].get(str(vaga_id))
+        linha_candidato = indice_por_id.get(str(candidato_id))
+        if linha_vaga is not None and linha_candidato is not None:
+            linhas_vagas.append(linha_vaga)
+            linhas_candidatos.append(linha_candidato)
+            validos.append(i)
+
+    scores = [None] * len(pares)
+    if validos:
+        matriz = matriz_features_pares(servico['armazem_vagas'], servico['armazem'], linhas_vagas, linhas_candidatos)
+        for i, score in zip(validos, prever_em_micro_lote(servico['micro_lote'], matriz).tolist()):
+            scores[i] = score
+    return scores
+
+
+def top_k_vaga(servico, vaga_id, k=K_PADRAO, num_min_tech_match=1):
+    # Mesmo caminho da busca do app: pré-filtros, tabela top-N se houver, senão scoring ao vivo
+    pos = servico['posicao_por_vaga'].get(str(vaga_id))
+    if pos is None:
+        return None
+    vaga_serie = servico['df_vagas'].iloc[pos]
+    armazem = servico['armazem']
+    linhas = linhas_pre_filtradas_para_vaga(vaga_serie, armazem, num_min_tech_match)
+    resultado = None
+    if servico['tabela_topk'] is not None:
+        resultado = top_k_da_tabela(servico['tabela_topk'], armazem, vaga_id, linhas, k)
+    if resultado is None:
+        # Blocos do scoring ao vivo passam pelo micro-lote, junto com /score e /score_pairs
+        resultado = top_k_armazem(
+            vaga_serie, armazem, linhas, servico['modelo'], servico['mapas'], k=k, prever=partial(prever_em_micro_lote, servico['micro_lote'])
+        )
+    linhas_top, scores_top = resultado
+    nomes = servico['df_candidatos']['nome'].to_numpy() if 'nome' in servico['df_candidatos'].columns else None
+    return [
+        {'candidate_id': armazem['ids'][linha], 'name': None if nomes is None else str(nomes[linha]), 'score': score}
+        for linha, score in zip(linhas_top.tolist(), scores_top.tolist())
+    ]
+
+
+#  Rotas HTTP: cada uma devolve (status, corpo); ValueError vira 400
+def _texto(corpo, campo):
+    valor = corpo.get(campo)
+    if not isinstance(valor, (str, int)) or isinstance(valor, bool):
+        raise ValueError(f"Campo '{campo}' ausente ou inválido.")
+    return str(valor)
+
+
+def _inteiro(corpo, campo, padrao, minimo, maximo):
+    valor = corpo.get(campo, padrao)
+    if not isinstance(valor, int) or isinstance(valor, bool) or not minimo <= valor <= maximo:
+        raise ValueError(f"Campo '{campo}' deve ser inteiro entre {minimo} e {maximo}.")
+    return valor
+
+
+def _rota_score(servico, corpo):
+    vaga_id = _texto(corpo, 'vaga_id')
+    ids_candidatos = corpo.get('candidate_ids')
+    if not isinstance(ids_candidatos, list):
+        raise ValueError("Campo 'candidate_ids' deve ser uma lista.")
+    if vaga_id not in servico['posicao_por_vaga']:
+        return 404, {'error': f"Vaga '{vaga_id}' não encontrada."}
+    ids_candidatos = [str(id_cand) for id_cand in ids_candidatos]
+    scores = pontuar_pares(servico, [(vaga_id, id_cand) for id_cand in ids_candidatos])
+    return 200, {
+        'vaga_id': vaga_id,
+        'scores': [{'candidate_id': id_cand, 'score': score} for id_cand, score in zip(ids_candidatos, scores) if score is not None],
+        'not_found': [id_cand for id_cand, score in zip(ids_candidatos, scores) if score is None],
+    }
+
+
+def _rota_top_k(servico, corpo):
+    vaga_id = _texto(corpo, 'vaga_id')
+    k = _inteiro(corpo, 'k', K_PADRAO, 1, K_MAXIMO)
+    num_min_tech_match = _inteiro(corpo, 'num_min_tech_match', 1, 0, 1000)
+    ranking = top_k_vaga(servico, vaga_id, k, num_min_tech_match)
+    if ranking is None:
+        return 404, {'error': f"Vaga '{vaga_id}' não encontrada."}
+    return 200, {'vaga_id': vaga_id, 'ranking': ranking}
+
+
+def _rota_score_pairs(servico, corpo):
+    pares = corpo.get('pairs')
+    if not isinstance(pares, list) or not all(isinstance(par, dict) for par in pares):
+        raise ValueError("Campo 'pairs' deve ser uma lista de objetos {vaga_id, candidate_id}.")
+    pares = [(_texto(par, 'vaga_id'), _texto(par, 'candidate_id')) for par in pares]
+    scores = pontuar_pares(servico, pares)
+    return 200, {'scores': [
+        {'vaga_id': vaga_id, 'candidate_id': id_cand, 'score': score}
+        for (vaga_id, id_cand), score in zip(pares, scores)
+    ]}
+
+
+ROTAS = {
+    '/score': _rota_score,
+    '/top_k': _rota_top_k,
+    '/score_pairs': _rota_score_pairs,
+}
+
+
+def _saude(servico):
+    lote = servico['micro_lote']
+    return {
+        'vagas': len(servico['df_vagas']),
+        'candidatos': len(servico['armazem']['ids']),
+        'tabela_topk': servico['tabela_topk'] is not None,
+        'micro_lote': {chave: lote[chave] for chave in ('chamadas', 'requisicoes', 'linhas')},
+    }
+
+
+def criar_servidor(servico, host='127.0.0.1', porta=8000):
+    class ManipuladorScoring(BaseHTTPRequestHandler):
+        # Keep-alive: clientes reaproveitam a conexão entre requisições
+        protocol_version = 'HTTP/1.1'
+
+        def _responder(self, status, corpo):
+            dados = json.dumps(corpo, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(dados)))
+            self.end_headers()
+            self.wfile.write(dados)
+
+        def do_GET(self):
+            if self.path == '/saude':
+                self._responder(200, _saude(servico))
+            else:
+                self._responder(404, {'error': "Rota não encontrada."})
+
+        def do_POST(self):
+            try:
+                tamanho = int(self.headers.get('Content-Length') or 0)
+                if tamanho < 0:
+                    raise ValueError
+            except ValueError:
+                # Sem tamanho válido o corpo não pode ser lido: responde e fecha a conexão
+                self.close_connection = True
+                self._responder(400, {'error': "Cabeçalho Content-Length inválido."})
+                return
+            conteudo = self.rfile.read(tamanho)
+            rota = ROTAS.get(self.path)
+            if rota is None:
+                self._responder(404, {'error': "Rota não encontrada."})
+                return
+            try:
+                corpo = json.loads(conteudo or b'{}')
+                if not isinstance(corpo, dict):
+                    raise ValueError("O corpo deve ser um objeto JSON.")
+                status, resposta = rota(servico, corpo)
+            except ValueError as e:
+                status, resposta = 400, {'error': str(e)}
+            except Exception as e:
+                status, resposta = 500, {'error': f"Erro interno: {e}"}
+            self._responder(status, resposta)
+
+        def log_message(self, formato, *args):
+            # Sem log por requisição (atrapalharia o teste de carga); erros saem na resposta
+            pass
+
+    servidor = ThreadingHTTPServer((host, porta), ManipuladorScoring, bind_and_activate=False)
+    servidor.daemon_threads = True
+    # Fila de conexões do listen(): com o padrão (5), rajadas de clientes concorrentes esperam
+    # retransmissão de SYN (~1s) ou são recusadas
+    servidor.request_queue_size = FILA_CONEXOES
+    try:
+        servidor.server_bind()
+        servidor.server_activate()
+    except OSError:
+        servidor.server_close()
+        raise
+    return servidor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serviço HTTP de scoring com micro-lotes.")
+    parser.add_argument('--dados', default=PATH_DATA)
+    parser.add_argument('--artefatos', default=PATH_ARTIFACTS)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8000)
+    parser.add_argument('--janela-ms', type=float, default=JANELA_MS_PADRAO, help="Espera máxima para agrupar requisições (0 = sem agrupamento)")
+    parser.add_argument('--max-linhas-lote', type=int, default=MAX_LINHAS_LOTE_PADRAO, help="Pontua o micro-lote assim que ele tiver estas linhas")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    servico = carregar_servico(args.dados, args.artefatos, args.janela_ms, args.max_linhas_lote)
+    servidor = criar_servidor(servico, args.host, args.porta)
+    print(f"Serviço pronto em {time.perf_counter() - inicio:.1f}s: http://{args.host}:{args.porta} "
+          f"({len(servico['df_vagas'])} vagas, {len(servico['armazem']['ids'])} candidatos)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        fechar_micro_lote(servico['micro_lote'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+"""
+Job offline que pontua todas as vagas contra todos os candidatos e grava, por vaga, os top-N
+candidatos em arquivos .npy mapeados em memória (ids int32 + scores float32). O app lê essa
+tabela para responder o ranking sem chamar o modelo e só pontua ao vivo as vagas ausentes.
+
+Uso:
+    python -m recrutamento.tabela_topk --top-n 100 --lote-vagas 32 --processos 8
+
+O job é retomável: vagas já concluídas (mesma versão de modelo/dados) não são recalculadas.
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from recrutamento.cache_scores import versao_artefatos
+from recrutamento.carregamento import PATH_ARTIFACTS, PATH_DATA, arquivos_versao_scores, carregar_tudo
+from recrutamento.paralelo import criar_pool_scoring, fechar_pool_scoring, processos_configurados, top_k_varias_vagas
+from recrutamento.scoring import construir_armazem_candidatos, n_candidatos, top_k_armazem
+
+PASTA_TABELA_TOPK = os.path.join(PATH_DATA, 'topk')
+TOP_N_PADRAO = 100
+LOTE_VAGAS_PADRAO = 32
+ID_AUSENTE = -1
+
+ARQUIVO_META = 'meta.json'
+ARQUIVO_IDS = 'topk_ids.npy'
+ARQUIVO_SCORES = 'topk_scores.npy'
+ARQUIVO_CONCLUIDAS = 'concluidas.npy'
+
+
+def ids_candidatos_int32(ids_candidatos):
+    # Os ids vêm do CSV como texto; a tabela guarda o id numérico original em int32
+    ids_numericos = np.empty(len(ids_candidatos), dtype=np.int32)
+    limite = np.iinfo(np.int32)
+    for i, id_cand in enumerate(ids_candidatos):
+        try:
+            valor = int(id_cand)
+        except ValueError:
+            raise ValueError(f"id_candidato '{id_cand}' não é numérico; a tabela top-N exige ids inteiros.")
+        if str(valor) != id_cand or not 0 <= valor <= limite.max:
+            raise ValueError(f"id_candidato '{id_cand}' não cabe em int32 (não negativo) sem perda.")
+        ids_numericos[i] = valor
+    if len(np.unique(ids_numericos)) != len(ids_numericos):
+        raise ValueError("id_candidato repetido; a tabela top-N exige ids únicos.")
+    return ids_numericos
+
+
+def _meta_compativel(meta, versao, top_n, ids_vagas):
+    return (
+        meta.get('versao') == versao
+        and meta.get('top_n') == top_n
+        and meta.get('ids_vagas') == ids_vagas
+    )
+
+
+def _abrir_tabela(pasta, versao, top_n, ids_vagas, recomecar=False):
+    caminho_meta = os.path.join(pasta, ARQUIVO_META)
+    caminhos = {nome: os.path.join(pasta, nome) for nome in (ARQUIVO_IDS, ARQUIVO_SCORES, ARQUIVO_CONCLUIDAS)}
+
+    if not recomecar and os.path.exists(caminho_meta) and all(os.path.exists(c) for c in caminhos.values()):
+        with open(caminho_meta, encoding='utf-8') as f:
+            meta = json.load(f)
+        if _meta_compativel(meta, versao, top_n, ids_vagas):
+            return (
+                np.load(caminhos[ARQUIVO_IDS], mmap_mode='r+'),
+                np.load(caminhos[ARQUIVO_SCORES], mmap_mode='r+'),
+                np.load(caminhos[ARQUIVO_CONCLUIDAS], mmap_mode='r+'),
+            )
+        print("Tabela existente é de outra versão do modelo/dados ou outro top-N; recomeçando.")
+
+    os.makedirs(pasta, exist_ok=True)
+    n_vagas = len(ids_vagas)
+    ids = np.lib.format.open_memmap(caminhos[ARQUIVO_IDS], mode='w+', dtype=np.int32, shape=(n_vagas, top_n))
+    scores = np.lib.format.open_memmap(caminhos[ARQUIVO_SCORES], mode='w+', dtype=np.float32, shape=(n_vagas, top_n))
+    concluidas = np.lib.format.open_memmap(caminhos[ARQUIVO_CONCLUIDAS], mode='w+', dtype=np.uint8, shape=(n_vagas,))
+    ids[:] = ID_AUSENTE
+    scores[:] = np.nan
+    concluidas[:] = 0
+    # meta.json por último: só existe se os arrays foram criados por inteiro
+    with open(caminho_meta, 'w', encoding='utf-8') as f:
+        json.dump({'versao': versao, 'top_n': top_n, 'ids_vagas': ids_vagas}, f)
+    return ids, scores, concluidas
+
+
+def gerar_tabela_topk(path_data=PATH_DATA, path_artifacts=PATH_ARTIFACTS, pasta_saida=PASTA_TABELA_TOPK,
+                      top_n=TOP_N_PADRAO, lote_vagas=LOTE_VAGAS_PADRAO, recomecar=False, n_processos=1):
+    versao = versao_artefatos(arquivos_versao_scores(path_data, path_artifacts))
+    dados = carregar_tudo(path_data, path_artifacts)
+    df_vagas, df_candidatos = dados['df_vagas'], dados['df_candidatos']
+
+    armazem = construir_armazem_candidatos(df_candidatos, dados['colunas_modelo'], dados['mapas'])
+    ids_numericos = ids_candidatos_int32(armazem['ids'])
+    ids_vagas = df_vagas['id_vaga'].tolist()
+
+    ids, scores, concluidas = _abrir_tabela(pasta_saida, versao, top_n, ids_vagas, recomecar)
+    pendentes = np.flatnonzero(concluidas == 0)
+    print(f"{len(ids_vagas)} vagas x {len(df_candidatos)} candidatos; {len(ids_vagas) - len(pendentes)} vagas já concluídas, {len(pendentes)} pendentes.")
+
+    # Com mais de um processo, cada worker pontua vagas inteiras sobre o armazém em memória compartilhada
+    pool = criar_pool_scoring(armazem, dados['modelo'], dados['mapas'], n_processos) if n_processos > 1 and len(pendentes) else None
+    try:
+        pares_job, duracao_job = _processar_pendentes(
+            df_vagas, armazem, dados, pendentes, ids, scores, concluidas, ids_numericos, top_n, lote_vagas, pool
+        )
+    finally:
+        if pool is not None:
+            fechar_pool_scoring(pool)
+    print(f"Concluído: {pares_job:,} pares em {duracao_job:.1f}s ({pares_job / max(duracao_job, 1e-9):,.0f} pares/s).")
+    return pasta_saida
+
+
+def _processar_pendentes(df_vagas, armazem, dados, pendentes, ids, scores, concluidas, ids_numericos, top_n, lote_vagas, pool):
+    todas_linhas = np.arange(n_candidatos(armazem), dtype=np.int64)
+    inicio_job = time.perf_counter()
+    pares_job = 0
+    for inicio in range(0, len(pendentes), lote_vagas):
+        posicoes_lote = pendentes[inicio:inicio + lote_vagas]
+        inicio_lote = time.perf_counter()
+        vagas_lote = [df_vagas.iloc[pos] for pos in posicoes_lote]
+        if pool is not None:
+            resultados_lote = top_k_varias_vagas(pool, vagas_lote, k=top_n)
+        else:
+            resultados_lote = [
+                top_k_armazem(vaga, armazem, todas_linhas, dados['modelo'], dados['mapas'], k=top_n)
+                for vaga in vagas_lote
+            ]
+        for pos, (linhas_top, scores_top) in zip(posicoes_lote, resultados_lote):
+            ids[pos, :len(linhas_top)] = ids_numericos[linhas_top]
+            scores[pos, :len(scores_top)] = scores_top
+        ids.flush()
+        scores.flush()
+        # Marca o lote como concluído só depois que ids/scores estão em disco
+        concluidas[posicoes_lote] = 1
+        concluidas.flush()
+
+        duracao_lote = time.perf_counter() - inicio_lote
+        pares_lote = len(posicoes_lote) * len(todas_linhas)
+        pares_job += pares_lote
+        feitas = min(inicio + lote_vagas, len(pendentes))
+        print(f"  {feitas}/{len(pendentes)} vagas | {pares_lote / max(duracao_lote, 1e-9):,.0f} pares/s no lote")
+    return pares_job, time.perf_counter() - inicio_job
+
+
+def carregar_tabela_topk(pasta, versao):
+    """
+    Abre a tabela em modo somente leitura (mmap). Retorna None se ela não existir ou tiver sido
+    gerada com outra versão do modelo/dados.
+    """
+    caminho_meta = os.path.join(pasta, ARQUIVO_META)
+    if not os.path.exists(caminho_meta):
+        return None
+    with open(caminho_meta, encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('versao') != versao:
+        return None
+    posicao_por_vaga = {}
+    for pos, id_vaga in enumerate(meta['ids_vagas']):
+        posicao_por_vaga.setdefault(str(id_vaga), pos)
+    return {
+        'top_n': meta['top_n'],
+        'posicao_por_vaga': posicao_por_vaga,
+        'ids': np.load(os.path.join(pasta, ARQUIVO_IDS), mmap_mode='r'),
+        'scores': np.load(os.path.join(pasta, ARQUIVO_SCORES), mmap_mode='r'),
+        'concluidas': np.load(os.path.join(pasta, ARQUIVO_CONCLUIDAS), mmap_mode='r'),
+    }
+
+
+def top_k_da_tabela(tabela, armazem, vaga_id, linhas_filtradas, k):
+    """
+    Top-k entre as `linhas_filtradas` a partir da tabela pré-calculada, ou None se a vaga não
+    estiver na tabela ou se os top-N guardados não tiverem k candidatos que passem nos pré-filtros.
+    A tabela guarda o ranking global na mesma ordem de top_k_armazem, então os primeiros k
+    sobreviventes são exatamente o top-k da busca ao vivo.
+    """
+    pos = tabela['posicao_por_vaga'].get(str(vaga_id))
+    if pos is None or not tabela['concluidas'][pos]:
+        return None
+    ids_vaga = np.asarray(tabela['ids'][pos])
+    scores_vaga = np.asarray(tabela['scores'][pos])
+    preenchidos = ids_vaga != ID_AUSENTE
+    ids_vaga, scores_vaga = ids_vaga[preenchidos], scores_vaga[preenchidos]
+
+    indice_por_id = armazem['indice_por_id']
+    linhas_vaga = np.array([indice_por_id.get(str(id_cand), -1) for id_cand in ids_vaga.tolist()], dtype=np.int64)
+    if (linhas_vaga < 0).any():
+        return None
+
+    sobreviventes = np.isin(linhas_vaga, linhas_filtradas)
+    linhas_top, scores_top = linhas_vaga[sobreviventes][:k], scores_vaga[sobreviventes][:k]
+    # Com menos de top_n preenchidos a tabela já cobre todos os candidatos
+    if len(linhas_top) < k and len(linhas_vaga) == tabela['top_n']:
+        return None
+    return linhas_top, scores_top.astype(np.float64)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera a tabela top-N de candidatos por vaga (memmap).")
+    parser.add_argument('--dados', default=PATH_DATA, help="Pasta com vagas_processadas.csv e candidatos_processados.csv")
+    parser.add_argument('--artefatos', default=PATH_ARTIFACTS, help="Pasta com o modelo e os artefatos joblib")
+    parser.add_argument('--saida', default=None, help="Pasta de saída (padrão: <dados>/topk)")
+    parser.add_argument('--top-n', type=int, default=TOP_N_PADRAO)
+    parser.add_argument('--lote-vagas', type=int, default=LOTE_VAGAS_PADRAO, help="Vagas por lote entre gravações em disco")
+    parser.add_argument('--recomecar', action='store_true', help="Ignora o progresso salvo e recalcula tudo")
+    parser.add_argument('--processos', type=int, default=processos_configurados(), help="Processos de scoring (padrão: $RECRUTAMENTO_PROCESSOS_SCORING ou 1)")
+    args = parser.parse_args()
+    pasta_saida = args.saida or os.path.join(args.dados, 'topk')
+    gerar_tabela_topk(args.dados, args.artefatos, pasta_saida, args.top_n, args.lote_vagas, args.recomecar, args.processos)
+
+
+if __name__ == '__main__':
+    main()
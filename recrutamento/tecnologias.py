@@ -0,0 +1,263 @@
+"""
+Extração das flags tech_* (vagas) e skill_* (candidatos) a partir dos textos combinados, com as
+mesmas listas, nomes de coluna e padrões das seções 2.5.7 e 3.5.2 do notebook.
+
+Antes, cada tecnologia era uma passada .apply(re.search) sobre a coluna inteira. Agora cada texto
+é lido uma vez: as palavras (\\w+) viram um conjunto. Os padrões \\bpalavra\\b (a maioria) são
+decididos direto por esse conjunto, sem regex; os demais só rodam o regex original nos textos que
+têm uma das âncoras do padrão (palavra inteira ou símbolo que toda ocorrência do padrão contém).
+Textos repetidos são processados uma vez. A saída é uma matriz uint8 com os mesmos 0/1 do caminho
+antigo. O re do Python não tem alternância em autômato (uma regex com todas as tecnologias é mais
+lenta que os padrões separados), então o custo que sobra é a tokenização de cada texto e os regex
+das âncoras comuns ('c' em tech_c_lang/skill_c_lang).
+
+Comparação com o caminho antigo (tempo e igualdade) em textos sintéticos:
+    python -m recrutamento.tecnologias benchmark --documentos 20000
+"""
+import argparse
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+TECNOLOGIAS_LISTA_VAGAS = [
+    'python', 'java', 'javascript', 'c#', '.net', 'sql', 'nosql', 'aws', 'azure', 'gcp',
+    'docker', 'kubernetes', 'react', 'angular', 'vue', 'node.js', 'nodejs', 'php', 'ruby',
+    'swift', 'kotlin', 'scala', 'sap', 'oracle', 'power bi', 'powerbi', 'tableau', 'excel', 'git',
+    'typescript', 'api', 'rest', 'spring', 'django', 'flask', 'linux', 'html', 'css',
+    'salesforce', 'jira', 'trello', 'agile', 'scrum', 'c++', 'c',
+    'flutter', 'airflow', 'etl', 'hadoop', 'spark', 'machine learning', 'tensorflow',
+    'pytorch', 'devops', 'selenium', 'testing', ' segurança', 'security', 'bi'
+]
+
+TECNOLOGIAS_LISTA_CANDIDATOS = [
+    'python', 'java', 'javascript', 'c#', '.net', 'sql', 'nosql', 'aws', 'azure', 'gcp',
+    'docker', 'kubernetes', 'react', 'angular', 'vue', 'node.js', 'nodejs', 'php', 'ruby',
+    'swift', 'kotlin', 'scala', 'sap', 'oracle', 'power bi', 'powerbi', 'tableau', 'excel', 'git',
+    'typescript', 'api', 'rest', 'spring', 'django', 'flask', 'linux', 'html', 'css',
+    'salesforce', 'jira', 'trello', 'agile', 'scrum',
+    'c++', 'c', 'flutter', 'airflow', 'etl', 'hadoop', 'spark', 'machine learning', 'tensorflow',
+    'pytorch', 'devops', 'selenium', 'testing', ' segurança', 'security', 'bi',
+    'erp', 'crm', 'office', 'project management', 'gestão de projetos'
+]
+
+# Siglas curtas que usam \b em vez dos separadores explícitos
+SIGLAS_COM_BORDA_VAGAS = ['sap', 'aws', 'gcp', 'api', 'sql', 'css', 'git', 'etl', 'bi']
+SIGLAS_COM_BORDA_CANDIDATOS = ['sap', 'aws', 'gcp', 'api', 'sql', 'css', 'git', 'etl', 'bi', 'erp', 'crm']
+
+_PALAVRA = re.compile(r'\w+')
+# Símbolos usados como âncora (c#, c++): entram no conjunto de palavras quando aparecem no texto
+SIMBOLOS_ANCORA = ('#', '+')
+
+
+#  Padrões (mesmas regras do notebook) e palavras-âncora
+def _padrao_separadores(tech):
+    return r'(?:^|\s|,|\(|\)|-|/)' + re.escape(tech) + r'(?:$|\s|,|\.|\(|\)|-|/)'
+
+
+def _primeira_palavra(tech):
+    # Toda ocorrência contém tech literal: o símbolo dela, se houver, ou (com \b ou separadores nas
+    # pontas) a primeira sequência \w de tech como palavra inteira
+    simbolos = {simbolo for simbolo in SIMBOLOS_ANCORA if simbolo in tech}
+    if simbolos:
+        return simbolos
+    palavra = _PALAVRA.search(tech)
+    return {palavra.group().casefold()} if palavra else set()
+
+
+def padroes_tecnologias_vagas(tecnologias=TECNOLOGIAS_LISTA_VAGAS):
+    """[{'coluna', 'padrao', 'ancoras'}] na ordem das colunas tech_* criadas pela seção 2.5.7."""
+    padroes, nomes_processados = [], set()
+    for tech in tecnologias:
+        if tech == 'c++': nome = 'cpp'
+        elif tech == 'c': nome = 'c_lang'
+        elif tech == 'c#': nome = 'csharp'
+        elif tech == '.net': nome = 'dotnet'
+        elif tech == 'node.js' or tech == 'nodejs': nome = 'nodejs'
+        elif tech == 'power bi' or tech == 'powerbi': nome = 'powerbi'
+        else: nome = tech.replace(' ', '_').replace('.', 'dot').replace('+', 'plus')
+        if nome in nomes_processados: continue
+        nomes_processados.add(nome)
+
+        if tech == '.net': padrao, ancoras = r'\b\.net\b', {'net'}
+        elif tech == 'c#': padrao, ancoras = r'\bc#\b|\bc\s*sharp\b', {'#', 'sharp', 'csharp'}
+        elif tech == 'c++': padrao, ancoras = r'\bc\+\+\b|\bc\s*plus\s*plus\b', {'+', 'plus', 'plusplus', 'cplus', 'cplusplus'}
+        elif tech == 'c': padrao, ancoras = r'\b(linguagem\s+c|c(?!(?:\+\+|#|-|s|r|u|l|i|p|a|o|e|m|t|v|b|d|k|g|h|f)))\b', {'c'}
+        elif tech == 'node.js' or tech == 'nodejs': padrao, ancoras = r'\bnode\.js\b|\bnodejs\b', {'node', 'nodejs'}
+        elif tech == 'power bi' or tech == 'powerbi': padrao, ancoras = r'\bpower\s*bi\b|\bpowerbi\b', {'power', 'powerbi'}
+        elif len(tech) <= 3 and not tech in SIGLAS_COM_BORDA_VAGAS:
+            padrao, ancoras = _padrao_separadores(tech), _primeira_palavra(tech)
+        else:
+            padrao, ancoras = r'\b' + re.escape(tech) + r'\b', _primeira_palavra(tech)
+        padroes.append({'coluna': f"tech_{nome}", 'padrao': padrao, 'ancoras': ancoras})
+    return padroes
+
+
+def padroes_tecnologias_candidatos(tecnologias=TECNOLOGIAS_LISTA_CANDIDATOS):
+    """[{'coluna', 'padrao', 'ancoras'}] na ordem das colunas skill_* criadas pela seção 3.5.2."""
+    padroes, nomes_processados = [], set()
+    for tech in tecnologias:
+        if tech == 'c++': nome = 'cpp'
+        elif tech == 'c': nome = 'c_lang'
+        elif tech == 'gestão de projetos': nome = 'gestao_de_projetos'
+        else: nome = re.sub(r'[^a-zA-Z0-9_]', '', tech.replace(' ', '_').replace('.', 'dot').replace('+', 'plus').replace('#', 'sharp'))
+        if not nome or nome in nomes_processados: continue
+        nomes_processados.add(nome)
+
+        if tech == '.net': padrao, ancoras = r'\b\.net\b', {'net'}
+        elif tech == 'gestão de projetos':
+            padrao = r'\bgest(?:ão|ao)\s*de\s*projetos\b|\bgerenciamento\s*de\s*projetos\b'
+            # 'projetos' é palavra inteira, salvo quando \s* não casa nada e ela cola nas anteriores
+            ancoras = {'projetos', 'deprojetos', 'gestãodeprojetos', 'gestaodeprojetos', 'gerenciamentodeprojetos'}
+        elif len(tech) <= 3 and not tech in SIGLAS_COM_BORDA_CANDIDATOS:
+            padrao, ancoras = _padrao_separadores(tech), _primeira_palavra(tech)
+        else:
+            padrao, ancoras = r'\b' + re.escape(tech) + r'\b', _primeira_palavra(tech)
+        padroes.append({'coluna': f"skill_{nome}", 'padrao': padrao, 'ancoras': ancoras})
+    return padroes
+
+
+#  Extração
+def palavras_do_texto(texto_doc):
+    """
+    (palavras \\w+ só ASCII em minúsculas, demais palavras normalizadas como o re.IGNORECASE as
+    compara). Os símbolos de SIMBOLOS_ANCORA presentes no texto entram no primeiro conjunto.
+    """
+    palavras_ascii, outras = set(), set()
+    for palavra in set(_PALAVRA.findall(texto_doc)):
+        if palavra.isascii():
+            palavras_ascii.add(palavra.lower())
+        else:
+            outras.add(palavra.casefold())
+    if 'ı' in texto_doc or 'İ' in texto_doc:
+        # No IGNORECASE do re, 'ı' e 'İ' também casam com 'i' (casefold não os leva a 'i')
+        outras |= {palavra.replace('ı', 'i').replace('̇', '') for palavra in outras}
+    palavras_ascii.update(simbolo for simbolo in SIMBOLOS_ANCORA if simbolo in texto_doc)
+    return palavras_ascii, outras
+
+
+def _palavra_do_padrao(padrao):
+    # \bpalavra\b com palavra só ASCII: casa exatamente quando ela é uma das palavras \w+ do texto
+    literal = re.fullmatch(r'\\b(\w+)\\b', padrao['padrao'])
+    return literal.group(1).lower() if literal and literal.group(1).isascii() else None
+
+
+def compilar_extrator(padroes):
+    padroes_por_palavra, padroes_por_ancora = {}, {}
+    for j, padrao in enumerate(padroes):
+        palavra = _palavra_do_padrao(padrao)
+        if palavra is not None:
+            padroes_por_palavra.setdefault(palavra, []).append(j)
+            continue
+        for ancora in padrao['ancoras']:
+            padroes_por_ancora.setdefault(ancora, []).append(j)
+    return {
+        'colunas': [padrao['coluna'] for padrao in padroes],
+        'regex': [re.compile(padrao['padrao'], re.IGNORECASE) for padrao in padroes],
+        'padroes_por_palavra': padroes_por_palavra,
+        'palavras': frozenset(padroes_por_palavra),
+        'padroes_por_ancora': padroes_por_ancora,
+        'ancoras': frozenset(padroes_por_ancora),
+        'sem_ancora': [j for j, padrao in enumerate(padroes) if not padrao['ancoras'] and _palavra_do_padrao(padrao) is None],
+    }
+
+
+def flags_do_texto(extrator, texto_doc, saida):
+    palavras_ascii, outras = palavras_do_texto(texto_doc)
+    for palavra in palavras_ascii & extrator['palavras']:
+        saida[extrator['padroes_por_palavra'][palavra]] = 1
+    testar = set(extrator['sem_ancora'])
+    for ancora in (palavras_ascii | outras) & extrator['ancoras']:
+        testar.update(extrator['padroes_por_ancora'][ancora])
+    # Palavra não ASCII que o IGNORECASE pode igualar à do padrão ('ſql', 'K'): decide o regex
+    for palavra in outras & extrator['palavras']:
+        testar.update(extrator['padroes_por_palavra'][palavra])
+    regex = extrator['regex']
+    for j in testar:
+        if not saida[j] and regex[j].search(texto_doc):
+            saida[j] = 1
+
+
+def extrair_tecnologias(textos, padroes):
+    """
+    DataFrame uint8 (mesmo índice de textos) com uma coluna por padrão; valores que não são str
+    ficam com 0, como no isinstance do caminho de candidatos.
+    """
+    extrator = compilar_extrator(padroes)
+    codigos, unicos = pd.factorize(textos, use_na_sentinel=True)
+    # Última linha: a dos ausentes (código -1), sempre zerada
+    matriz_unicos = np.zeros((len(unicos) + 1, len(padroes)), dtype=np.uint8)
+    for u, texto_doc in enumerate(unicos):
+        if isinstance(texto_doc, str):
+            flags_do_texto(extrator, texto_doc, matriz_unicos[u])
+    return pd.DataFrame(matriz_unicos[codigos], index=textos.index, columns=extrator['colunas'])
+
+
+def extrair_tecnologias_por_padrao(textos, padroes):
+    # Caminho anterior (uma passada por tecnologia), mantido como referência para o benchmark
+    colunas = {}
+    for padrao in padroes:
+        colunas[padrao['coluna']] = textos.apply(lambda x: 1 if isinstance(x, str) and re.search(padrao['padrao'], x, re.IGNORECASE) else 0)
+    return pd.DataFrame(colunas, index=textos.index)
+
+
+#  Benchmark em textos sintéticos
+PALAVRAS_COMUNS = (
+    'experiência em desenvolvimento de sistemas com foco em qualidade e entrega para clientes do setor '
+    'financeiro atuação com equipes multidisciplinares análise de requisitos documentação suporte '
+    'melhoria contínua de processos responsável pela sustentação e evolução das aplicações corporativas'
+).split()
+TRECHOS_TECNOLOGIAS = [
+    'python', 'java', 'javascript', 'c#', 'c sharp', 'asp.net', '.net core', 'sql server', 'nosql', 'aws', 'azure',
+    'gcp', 'docker', 'kubernetes', 'react', 'angular', 'vue', 'vue.js', 'node.js', 'nodejs', 'php', 'ruby', 'swift',
+    'kotlin', 'scala', 'sap', 'sap fi', 'oracle', 'power bi', 'powerbi', 'tableau', 'excel', 'git', 'github',
+    'typescript', 'api', 'apis rest', 'rest', 'spring boot', 'django', 'flask', 'linux', 'html', 'css', 'salesforce',
+    'jira', 'trello', 'agile', 'scrum', 'c++', 'c/c++', 'c', 'linguagem c', 'c-level', '(c)', 'c.', 'flutter',
+    'airflow', 'etl', 'hadoop', 'spark', 'machine learning', 'tensorflow', 'pytorch', 'devops', 'selenium',
+    'testing', 'segurança', 'da segurança', 'security', 'bi', 'bi,', 'erp', 'crm', 'office', 'project management',
+    'gestão de projetos', 'gerenciamento de projetos', 'gestao deprojetos', 'c plus plus', 'cplusplus',
+]
+
+
+def textos_sinteticos(total, palavras_por_texto=250, semente=0):
+    gerador = np.random.default_rng(semente)
+    vocabulario = np.array(PALAVRAS_COMUNS + TRECHOS_TECNOLOGIAS, dtype=object)
+    pesos = np.array([8.0] * len(PALAVRAS_COMUNS) + [0.15] * len(TRECHOS_TECNOLOGIAS))
+    pesos /= pesos.sum()
+    textos = []
+    for _ in range(total):
+        n = int(gerador.integers(palavras_por_texto // 4, palavras_por_texto * 2))
+        textos.append(' '.join(gerador.choice(vocabulario, size=n, p=pesos)))
+    # Textos vazios/repetidos, como nos candidatos sem campos preenchidos
+    for i in gerador.choice(total, size=total // 20, replace=False):
+        textos[i] = ''
+    return pd.Series(textos, dtype=object)
+
+
+def benchmark_extracao(total, palavras_por_texto, semente=0):
+    textos = textos_sinteticos(total, palavras_por_texto, semente)
+    for nome, padroes in (('vagas (tech_*)', padroes_tecnologias_vagas()), ('candidatos (skill_*)', padroes_tecnologias_candidatos())):
+        inicio = time.perf_counter()
+        antes = extrair_tecnologias_por_padrao(textos, padroes)
+        tempo_antes = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        depois = extrair_tecnologias(textos, padroes)
+        tempo_depois = time.perf_counter() - inicio
+        iguais = list(antes.columns) == list(depois.columns) and (antes.to_numpy() == depois.to_numpy()).all()
+        print(f"{nome}: {total:,} textos, {len(padroes)} padrões | por padrão {tempo_antes:.2f}s | passada única {tempo_depois:.2f}s | {tempo_antes / tempo_depois:.1f}x | saída idêntica: {'sim' if iguais else 'NÃO'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extração das flags tech_*/skill_* em uma passada por texto.")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+    bench = subcomandos.add_parser('benchmark', help="Compara com a extração por padrão em textos sintéticos")
+    bench.add_argument('--documentos', type=int, default=20000)
+    bench.add_argument('--palavras', type=int, default=250, help="Palavras por texto (média aproximada)")
+    bench.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+    benchmark_extracao(args.documentos, args.palavras, args.semente)
+
+
+if __name__ == '__main__':
+    main()
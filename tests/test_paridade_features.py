@@ -0,0 +1,39 @@
+"""
+Paridade bit a bit entre as features de treino (recrutamento/modelagem.py) e os três caminhos de
+scoring do app, em tabelas sintéticas com categóricas ausentes e vazias.
+
+    python -m pytest -q tests/test_paridade_features.py
+"""
+import os
+
+import joblib
+import pytest
+
+from recrutamento.carregamento import PATH_ARTIFACTS
+from recrutamento.features import MAPA_NIVEL_ACADEMICO_CANDIDATO, MAPA_NIVEL_IDIOMA, MAPA_NIVEL_PROFISSIONAL_CANDIDATO
+from recrutamento.paridade_features import verificar_paridade
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CAMINHO_COLUNAS_MODELO = os.path.join(RAIZ, PATH_ARTIFACTS, 'colunas_modelo.joblib')
+
+MAPAS = {
+    'mapa_nivel_idioma': MAPA_NIVEL_IDIOMA,
+    'mapa_nivel_academico_candidato': MAPA_NIVEL_ACADEMICO_CANDIDATO,
+    'mapa_nivel_profissional_candidato': MAPA_NIVEL_PROFISSIONAL_CANDIDATO,
+}
+
+
+@pytest.fixture(scope='module')
+def colunas_modelo():
+    if not os.path.exists(CAMINHO_COLUNAS_MODELO):
+        pytest.skip("artifacts/colunas_modelo.joblib não encontrado")
+    return joblib.load(CAMINHO_COLUNAS_MODELO)
+
+
+@pytest.mark.parametrize('semente', [0, 1])
+def test_features_do_app_iguais_as_do_treino(colunas_modelo, semente):
+    resultado = verificar_paridade(colunas_modelo, MAPAS, total_vagas=20, total_candidatos=120, semente=semente, pares_linha=40)
+    assert set(resultado) == {'busca por vaga', 'busca reversa', 'linha a linha'}
+    for caminho, info in resultado.items():
+        assert info['pares'] > 0, caminho
+        assert info['divergencias'] == {}, caminho